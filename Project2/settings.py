@@ -42,24 +42,48 @@ INSTALLED_APPS = [
     'humanresource',
     'timekeeper',
     'accounting',
+    'api',
 
 ]
 
 MIDDLEWARE = [
+    'navigation_app.middleware.RequestMetricsMiddleware', # Outermost so session queries are counted too
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'navigation_app.middleware.AccountMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'navigation_app.middleware.ProfilerMiddleware', # Last: wraps only the view, after the role rules
 ]
 
+# Role rules enforced by navigation_app.middleware.AccountMiddleware.
+# Keys are URL namespaces or 'namespace:url_name' (the most specific key wins).
+# Values list the UsersAccount roles allowed, '*' for any logged-in account,
+# or None for public pages. URLs matching no key are not checked.
+ROLE_ACCESS_RULES = {
+    'navigation_app:login': None,
+    'navigation_app:logout': None,
+    'navigation_app:base': None,
+    'navigation_app:user_home': '*',
+    'navigation_app': ['admin'],
+    'humanresource': ['hr'],
+    'timekeeper': ['timekeeper'],
+    'accounting': ['Accounting'],
+    'api': ['hr', 'admin'],
+}
+
+# Seconds a loaded UsersAccount is reused across requests before re-reading the database
+ACCOUNT_CACHE_SECONDS = 30
+
 ROOT_URLCONF = 'Project2.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates plus render timing for RequestMetricsMiddleware
+        'BACKEND': 'navigation_app.metrics.InstrumentedDjangoTemplates',
         'DIRS': [os.path.join(BASE_DIR, 'templates')],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -130,6 +154,125 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Caches
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# Local memory by default. For a cache shared by all worker processes switch the
+# backend to 'django.core.cache.backends.filebased.FileBasedCache' with
+# 'LOCATION': BASE_DIR / 'cache' / <alias>.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'payroll-default',
+    },
+    # Per-employee attendance summaries (humanresource.attendance_cache)
+    'attendance': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'payroll-attendance',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+    # Session store for the 'cached_db' and 'cache' session profiles (shared across processes)
+    'sessions': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'sessions',
+    },
+    # {% cache %} fragments (e.g. the employee roster table)
+    'template_fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'payroll-fragments',
+        'OPTIONS': {'MAX_ENTRIES': 2000},
+    },
+}
+HR_ATTENDANCE_CACHE = 'attendance'
+
+# Sessions and messages
+# https://docs.djangoproject.com/en/5.0/topics/http/sessions/#configuring-the-session-engine
+# Pick a profile with the PAYROLL_SESSION_PROFILE environment variable:
+#   'db'             - database sessions (Django default): a django_session read on
+#                      every request and a write whenever the session changes.
+#   'cached_db'      - reads served from the 'sessions' cache, writes go through to the DB.
+#   'cache'          - sessions only in the 'sessions' cache (no DB at all); the cache
+#                      must be shared by every worker process, hence the file backend.
+#   'signed_cookies' - session data lives in a signed cookie; no server-side storage.
+# Every profile except 'db' also keeps flash messages in a cookie instead of the session.
+# Compare them with `python -m benchmarks.session_backends`.
+
+SESSION_PROFILES = {
+    'db': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+        'MESSAGE_STORAGE': 'django.contrib.messages.storage.fallback.FallbackStorage',
+    },
+    'cached_db': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.cached_db',
+        'MESSAGE_STORAGE': 'django.contrib.messages.storage.cookie.CookieStorage',
+    },
+    'cache': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.cache',
+        'MESSAGE_STORAGE': 'django.contrib.messages.storage.cookie.CookieStorage',
+    },
+    'signed_cookies': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.signed_cookies',
+        'MESSAGE_STORAGE': 'django.contrib.messages.storage.cookie.CookieStorage',
+    },
+}
+SESSION_PROFILE = os.environ.get('PAYROLL_SESSION_PROFILE', 'db')
+SESSION_ENGINE = SESSION_PROFILES[SESSION_PROFILE]['SESSION_ENGINE']
+MESSAGE_STORAGE = SESSION_PROFILES[SESSION_PROFILE]['MESSAGE_STORAGE']
+SESSION_CACHE_ALIAS = 'sessions'
+
+# Background work (chunked upload deletion): 'thread' runs jobs on an in-process
+# worker thread, 'inline' runs them during the request, 'command' leaves them
+# queued for `python manage.py run_deletion_jobs`.
+HR_BACKGROUND_WORKER = 'thread'
+
+# Request metrics (navigation_app.middleware.RequestMetricsMiddleware), shown at
+# Admin Dashboard -> Performance. Off unless PAYROLL_PERF_METRICS=1.
+PERF_METRICS_ENABLED = os.environ.get('PAYROLL_PERF_METRICS') == '1'
+PERF_METRICS_SAMPLES = 200 # Requests kept per view (per worker process)
+# Queries allowed per request, by 'namespace:url_name' or namespace; going over logs a warning
+PERF_QUERY_BUDGETS = {
+    'humanresource:employee_list': 5,
+    'humanresource:search_employee': 5,
+    'humanresource:view_employee_details': 6,
+    'humanresource:employee_suggest': 3,
+    'humanresource:payroll_upload': 12,
+}
+PERF_DEFAULT_QUERY_BUDGET = None
+
+# Per-request profiler for admins (?profile=1, ?profile=mem, or per session from
+# Admin Dashboard -> Profiler). Captures are saved under PERF_PROFILE_DIR, which
+# must stay outside MEDIA_ROOT: they are only served through the admin Profiler page.
+PERF_PROFILER_ENABLED = True
+PERF_PROFILE_DIR = BASE_DIR / 'profiles'
+PERF_PROFILE_KEEP = 50 # Older captures are deleted
+
+# Labor cost estimates for the accounting rollups (accounting.rollups)
+ACCOUNTING_OT_MULTIPLIER = '1.25' # Overtime premium
+ACCOUNTING_NIGHT_DIFFERENTIAL = '0.10' # Extra share of the rate for night-shift hours
+ACCOUNTING_HOURS_PER_DAY = 8
+ACCOUNTING_WORK_DAYS_PER_YEAR = 313 # Converts a monthly rate to a daily rate
+ACCOUNTING_MONTHLY_RATE_MIN = 3000 # Employee.monthly_daily_rate values from here up are monthly rates
+# Employee share of gross pay withheld per pay run (placeholders for the statutory tables)
+ACCOUNTING_DEDUCTION_RATES = {'sss': '0.045', 'philhealth': '0.025', 'pagibig': '0.02', 'withholding_tax': '0'}
+# General ledger accounts used by the payroll journal: key -> (code, name)
+ACCOUNTING_GL_ACCOUNTS = {
+    'salary_expense': ('5100', 'Salaries and Wages'),
+    'overtime_expense': ('5110', 'Overtime Pay'),
+    'night_diff_expense': ('5120', 'Night Shift Differential'),
+    'sss_payable': ('2110', 'SSS Contributions Payable'),
+    'philhealth_payable': ('2120', 'PhilHealth Contributions Payable'),
+    'pagibig_payable': ('2130', 'Pag-IBIG Contributions Payable'),
+    'withholding_tax_payable': ('2140', 'Withholding Tax Payable'),
+    'salaries_payable': ('2100', 'Salaries Payable'),
+}
+
+# Timekeeper on-site board
+TIMEKEEPER_ON_SITE_HOURS = 16 # An IN punch older than this is taken as a forgotten OUT
+TIMEKEEPER_POLL_SECONDS = 30
+# Attendance exception scanner (timekeeper.scanner)
+TIMEKEEPER_DUPLICATE_MINUTES = 5 # Same code again within this is a duplicate punch
+TIMEKEEPER_MAX_SHIFT_HOURS = 16 # Longer IN -> OUT pairs are flagged
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
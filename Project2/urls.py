@@ -27,5 +27,6 @@ urlpatterns = [
     path('humanresource/', include('humanresource.urls')),
     path('timekeeper/', include('timekeeper.urls')),
     path('accounting/', include('accounting.urls')),
+    path('api/v1/', include('api.urls')),
 ]+ static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
  
\ No newline at end of file
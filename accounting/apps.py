@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class AccountingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accounting'
+
+    def ready(self):
+        from humanresource import signals
+        from . import receivers
+
+        signals.payroll_ingested.connect(receivers.payroll_changed, dispatch_uid='accounting_labor_ingested')
+        signals.payroll_deleted.connect(receivers.payroll_changed, dispatch_uid='accounting_labor_deleted')
+        signals.employee_profile_changed.connect(receivers.employee_profile_changed, dispatch_uid='accounting_labor_profile')
+        signals.employee_profiles_changed.connect(receivers.employee_profiles_changed, dispatch_uid='accounting_labor_profiles')
+        signals.attendance_corrected.connect(receivers.attendance_corrected, dispatch_uid='accounting_labor_corrected')
+        signals.roster_changed.connect(receivers.roster_changed, dispatch_uid='accounting_labor_roster')
@@ -0,0 +1,144 @@
+"""General ledger journal for a pay run.
+
+All amounts come from a single GROUP BY department over PayRunLine. A run's
+posting therefore costs the same few queries whether it has 100 or 5,000
+lines. Debits go to the expense accounts per department; credits go to the
+withholding payables and to salaries payable (net pay) in total. Account
+codes are configured in ACCOUNTING_GL_ACCOUNTS.
+"""
+import csv
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from .models import JournalEntry, JournalLine, PayRun, PayRunLine
+from .rollups import PESOS
+
+DEFAULT_GL_ACCOUNTS = {
+    'salary_expense': ('5100', 'Salaries and Wages'),
+    'overtime_expense': ('5110', 'Overtime Pay'),
+    'night_diff_expense': ('5120', 'Night Shift Differential'),
+    'sss_payable': ('2110', 'SSS Contributions Payable'),
+    'philhealth_payable': ('2120', 'PhilHealth Contributions Payable'),
+    'pagibig_payable': ('2130', 'Pag-IBIG Contributions Payable'),
+    'withholding_tax_payable': ('2140', 'Withholding Tax Payable'),
+    'salaries_payable': ('2100', 'Salaries Payable'),
+}
+
+# PayRunLine column -> GL account key
+DEBIT_COLUMNS = (
+    ('regular_pay', 'salary_expense'),
+    ('overtime_pay', 'overtime_expense'),
+    ('night_diff_pay', 'night_diff_expense'),
+)
+CREDIT_COLUMNS = (
+    ('sss', 'sss_payable'),
+    ('philhealth', 'philhealth_payable'),
+    ('pagibig', 'pagibig_payable'),
+    ('withholding_tax', 'withholding_tax_payable'),
+    ('net_pay', 'salaries_payable'),
+)
+
+CSV_HEADER = ['entry_date', 'reference', 'line_no', 'account_code', 'account_name', 'department', 'debit', 'credit', 'memo']
+
+
+class JournalError(Exception):
+    """The pay run cannot be posted (already posted, empty, or out of balance)."""
+
+
+def gl_account(key):
+    accounts = getattr(settings, 'ACCOUNTING_GL_ACCOUNTS', DEFAULT_GL_ACCOUNTS)
+    return accounts.get(key, DEFAULT_GL_ACCOUNTS[key])
+
+
+def department_totals(pay_run):
+    """One row per department with the sum of every posted column (one GROUP BY query)."""
+    columns = [column for column, _ in DEBIT_COLUMNS + CREDIT_COLUMNS]
+    rows = list(
+        PayRunLine.objects.filter(pay_run=pay_run)
+        .values('department')
+        .annotate(**{f"total_{column}": Sum(column) for column in columns})
+        .order_by('department')
+    )
+    # Some backends (sqlite) sum decimals in floating point
+    for row in rows:
+        for column in columns:
+            row[f"total_{column}"] = Decimal(str(row[f"total_{column}"] or 0)).quantize(PESOS)
+    return rows
+
+
+def build_journal_lines(totals):
+    """Debit lines per department and account, then one credit line per payable account."""
+    lines = []
+    for row in totals:
+        for column, account_key in DEBIT_COLUMNS:
+            amount = row[f"total_{column}"]
+            if amount:
+                code, name = gl_account(account_key)
+                lines.append(JournalLine(account_code=code, account_name=name, department=row['department'], debit=amount))
+
+    for column, account_key in CREDIT_COLUMNS:
+        amount = sum(row[f"total_{column}"] for row in totals)
+        if amount:
+            code, name = gl_account(account_key)
+            lines.append(JournalLine(account_code=code, account_name=name, credit=amount))
+
+    for line_no, line in enumerate(lines, start=1):
+        line.line_no = line_no
+    return lines
+
+
+def generate_journal(pay_run_id, created_by='Accounting'):
+    """Post a draft pay run: create its balanced JournalEntry and mark it posted."""
+    with transaction.atomic():
+        pay_run = PayRun.objects.select_for_update().get(pk=pay_run_id)
+        if pay_run.status == 'posted' or JournalEntry.objects.filter(pay_run=pay_run).exists():
+            raise JournalError("This pay run has already been posted.")
+
+        lines = build_journal_lines(department_totals(pay_run))
+        if not lines:
+            raise JournalError("This pay run has no lines to post.")
+
+        debit_total = sum(line.debit for line in lines)
+        credit_total = sum(line.credit for line in lines)
+        if debit_total != credit_total:
+            raise JournalError(f"Journal is out of balance: debits {debit_total} vs credits {credit_total}.")
+
+        entry = JournalEntry.objects.create(
+            pay_run=pay_run,
+            entry_date=pay_run.period_end,
+            memo=f"Payroll {pay_run.period_start:%Y-%m-%d} to {pay_run.period_end:%Y-%m-%d}",
+            debit_total=debit_total,
+            credit_total=credit_total,
+            created_by=created_by,
+        )
+        for line in lines:
+            line.entry = entry
+        JournalLine.objects.bulk_create(lines)
+
+        pay_run.status = 'posted'
+        pay_run.posted_at = timezone.now()
+        pay_run.save(update_fields=['status', 'posted_at'])
+    return entry
+
+
+class _Echo:
+    """File-like object whose write() hands the formatted CSV line back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def journal_csv_lines(entry):
+    """Yield the CSV text of a journal entry line by line (for StreamingHttpResponse)."""
+    writer = csv.writer(_Echo())
+    reference = f"PR{entry.pay_run_id}"
+    yield writer.writerow(CSV_HEADER)
+    for line in entry.lines.order_by('line_no').iterator(chunk_size=1000):
+        yield writer.writerow([
+            entry.entry_date.isoformat(), reference, line.line_no, line.account_code, line.account_name,
+            line.department, line.debit, line.credit, entry.memo,
+        ])
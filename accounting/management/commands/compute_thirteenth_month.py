@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from accounting.thirteenth import compute_thirteenth_month, rebuild_year_to_date
+
+
+class Command(BaseCommand):
+    help = "Compute the year's 13th month pay from the year-to-date accumulators (EmployeeYearToDate)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int, default=timezone.localdate().year)
+        parser.add_argument(
+            '--rebuild-ytd', action='store_true',
+            help="Recompute the year's accumulators from its finalized pay runs first.",
+        )
+
+    def handle(self, *args, **options):
+        year = options['year']
+        if options['rebuild_ytd']:
+            rows = rebuild_year_to_date(year)
+            self.stdout.write(f"Rebuilt year-to-date totals for {rows} employee(s).")
+
+        rows, total, left_out = compute_thirteenth_month(year)
+        self.stdout.write(self.style.SUCCESS(f"{year} 13th month pay: {rows} employee(s), {total:,.2f} in total."))
+        if left_out:
+            self.stderr.write(self.style.ERROR(
+                f"Left out {len(left_out)} payroll ID(s) paid in {year} whose hire/separation dates are outside it: "
+                f"{', '.join(left_out)}"
+            ))
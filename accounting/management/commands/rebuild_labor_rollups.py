@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from accounting.rollups import rebuild_all
+
+
+class Command(BaseCommand):
+    help = 'Recompute the monthly labor cost rollups (EmployeeMonthlyLabor, DepartmentMonthlyLabor) from all payroll records.'
+
+    def handle(self, *args, **options):
+        def progress(done, total):
+            self.stdout.write(f"  {done}/{total} employees")
+
+        rows = rebuild_all(progress=progress)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} employee-month row(s)."))
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('humanresource', '0016_dataversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DepartmentMonthlyLabor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('department', models.CharField(max_length=100)),
+                ('section', models.CharField(blank=True, default='', max_length=100)),
+                ('employee_count', models.PositiveIntegerField(default=0)),
+                ('days_worked', models.PositiveIntegerField(default=0)),
+                ('regular_hours', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('ot_hours', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('night_hours', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('minutes_late', models.PositiveIntegerField(default=0)),
+                ('labor_cost', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'DepartmentMonthlyLabor',
+                'ordering': ['month', 'department', 'section'],
+                'constraints': [models.UniqueConstraint(fields=('month', 'department', 'section'), name='department_month_labor_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='EmployeeMonthlyLabor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payroll_employee_id', models.CharField(max_length=50)),
+                ('month', models.DateField()),
+                ('department', models.CharField(default='Unclassified', max_length=100)),
+                ('section', models.CharField(blank=True, default='', max_length=100)),
+                ('days_worked', models.PositiveIntegerField(default=0)),
+                ('regular_hours', models.DecimalField(decimal_places=2, default=0, max_digits=9)),
+                ('ot_hours', models.DecimalField(decimal_places=2, default=0, max_digits=9)),
+                ('night_hours', models.DecimalField(decimal_places=2, default=0, max_digits=9)),
+                ('minutes_late', models.PositiveIntegerField(default=0)),
+                ('hourly_rate', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('labor_cost', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('employee', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='monthly_labor', to='humanresource.employee')),
+            ],
+            options={
+                'db_table': 'EmployeeMonthlyLabor',
+                'indexes': [models.Index(fields=['month', 'department', 'section'], name='employee_labor_month_dept_idx')],
+                'constraints': [models.UniqueConstraint(fields=('payroll_employee_id', 'month'), name='employee_month_labor_unique')],
+            },
+        ),
+    ]
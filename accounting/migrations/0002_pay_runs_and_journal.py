@@ -0,0 +1,101 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0001_labor_rollups'),
+        ('humanresource', '0016_dataversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JournalEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entry_date', models.DateField()),
+                ('memo', models.CharField(max_length=255)),
+                ('debit_total', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('credit_total', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('created_by', models.CharField(default='Accounting', max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'JournalEntry',
+            },
+        ),
+        migrations.CreateModel(
+            name='PayRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period_start', models.DateField()),
+                ('period_end', models.DateField()),
+                ('status', models.CharField(choices=[('draft', 'Draft'), ('posted', 'Posted')], default='draft', max_length=10)),
+                ('created_by', models.CharField(default='Accounting', max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('posted_at', models.DateTimeField(blank=True, null=True)),
+                ('employee_count', models.PositiveIntegerField(default=0)),
+                ('skipped_count', models.PositiveIntegerField(default=0)),
+                ('gross_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('net_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+            options={
+                'db_table': 'PayRun',
+                'ordering': ['-period_end', '-id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='JournalLine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('line_no', models.PositiveIntegerField()),
+                ('account_code', models.CharField(max_length=20)),
+                ('account_name', models.CharField(max_length=100)),
+                ('department', models.CharField(blank=True, default='', max_length=100)),
+                ('debit', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('credit', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('entry', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lines', to='accounting.journalentry')),
+            ],
+            options={
+                'db_table': 'JournalLine',
+                'ordering': ['entry', 'line_no'],
+            },
+        ),
+        migrations.AddField(
+            model_name='journalentry',
+            name='pay_run',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='journal', to='accounting.payrun'),
+        ),
+        migrations.CreateModel(
+            name='PayRunLine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payroll_employee_id', models.CharField(max_length=50)),
+                ('department', models.CharField(max_length=100)),
+                ('section', models.CharField(blank=True, default='', max_length=100)),
+                ('regular_hours', models.DecimalField(decimal_places=2, default=0, max_digits=7)),
+                ('ot_hours', models.DecimalField(decimal_places=2, default=0, max_digits=7)),
+                ('night_hours', models.DecimalField(decimal_places=2, default=0, max_digits=7)),
+                ('hourly_rate', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('regular_pay', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('overtime_pay', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('night_diff_pay', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('gross_pay', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('sss', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('philhealth', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('pagibig', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('withholding_tax', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('net_pay', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('employee', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='pay_run_lines', to='humanresource.employee')),
+                ('pay_run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lines', to='accounting.payrun')),
+            ],
+            options={
+                'db_table': 'PayRunLine',
+                'indexes': [models.Index(fields=['pay_run', 'department'], name='pay_run_line_dept_idx')],
+                'constraints': [models.UniqueConstraint(fields=('pay_run', 'payroll_employee_id'), name='pay_run_line_employee_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0002_pay_runs_and_journal'),
+        ('humanresource', '0016_dataversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payrun',
+            name='finalized_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='payrun',
+            name='status',
+            field=models.CharField(choices=[('draft', 'Draft'), ('posted', 'Posted'), ('finalized', 'Finalized')], default='draft', max_length=10),
+        ),
+        migrations.CreateModel(
+            name='EmployeeYearToDate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payroll_employee_id', models.CharField(max_length=50)),
+                ('year', models.PositiveSmallIntegerField()),
+                ('basic_pay', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('gross_pay', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('pay_run_count', models.PositiveSmallIntegerField(default=0)),
+                ('last_period_end', models.DateField(blank=True, null=True)),
+                ('employee', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='year_to_date', to='humanresource.employee')),
+            ],
+            options={
+                'db_table': 'EmployeeYearToDate',
+                'indexes': [models.Index(fields=['year', 'payroll_employee_id'], name='employee_ytd_year_idx')],
+                'constraints': [models.UniqueConstraint(fields=('payroll_employee_id', 'year'), name='employee_ytd_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ThirteenthMonthPay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('payroll_employee_id', models.CharField(max_length=50)),
+                ('department', models.CharField(max_length=100)),
+                ('service_start', models.DateField()),
+                ('service_end', models.DateField()),
+                ('months_of_service', models.DecimalField(decimal_places=2, max_digits=4)),
+                ('basic_pay', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('eligible', models.BooleanField(default=True)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('employee', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='thirteenth_month_pay', to='humanresource.employee')),
+            ],
+            options={
+                'db_table': 'ThirteenthMonthPay',
+                'ordering': ['department', 'payroll_employee_id'],
+                'constraints': [models.UniqueConstraint(fields=('year', 'payroll_employee_id'), name='thirteenth_month_unique')],
+            },
+        ),
+    ]
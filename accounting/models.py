@@ -1,3 +1,227 @@
 from django.db import models
 
 # Create your models here.
+
+
+# ----------------------------------------------------------------------
+# LABOR COST ROLLUPS (maintained by accounting.rollups, never edited by hand)
+# ----------------------------------------------------------------------
+
+class EmployeeMonthlyLabor(models.Model):
+    """Hours and estimated labor cost of one payroll ID in one calendar month.
+
+    Recomputed from PayrollRecord only for the employees and months an upload or
+    delete touched; department, section and cost follow the mapped HR profile.
+    """
+    payroll_employee_id = models.CharField(max_length=50)
+    month = models.DateField() # First day of the month
+    employee = models.ForeignKey('humanresource.Employee', null=True, blank=True, on_delete=models.SET_NULL, related_name='monthly_labor')
+    department = models.CharField(max_length=100, default='Unclassified')
+    section = models.CharField(max_length=100, blank=True, default='')
+
+    days_worked = models.PositiveIntegerField(default=0)
+    regular_hours = models.DecimalField(max_digits=9, decimal_places=2, default=0) # Day + night + graveyard shifts
+    ot_hours = models.DecimalField(max_digits=9, decimal_places=2, default=0)
+    night_hours = models.DecimalField(max_digits=9, decimal_places=2, default=0) # Part of regular_hours, for the night differential
+    minutes_late = models.PositiveIntegerField(default=0)
+    hourly_rate = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True) # Rate used for labor_cost
+    labor_cost = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'EmployeeMonthlyLabor'
+        constraints = [
+            models.UniqueConstraint(fields=['payroll_employee_id', 'month'], name='employee_month_labor_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['month', 'department', 'section'], name='employee_labor_month_dept_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.payroll_employee_id} {self.month:%Y-%m}"
+
+
+class DepartmentMonthlyLabor(models.Model):
+    """Per department/section/month totals of EmployeeMonthlyLabor (what the reports read)."""
+    month = models.DateField() # First day of the month
+    department = models.CharField(max_length=100)
+    section = models.CharField(max_length=100, blank=True, default='')
+
+    employee_count = models.PositiveIntegerField(default=0)
+    days_worked = models.PositiveIntegerField(default=0)
+    regular_hours = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    ot_hours = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    night_hours = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    minutes_late = models.PositiveIntegerField(default=0)
+    labor_cost = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'DepartmentMonthlyLabor'
+        constraints = [
+            models.UniqueConstraint(fields=['month', 'department', 'section'], name='department_month_labor_unique'),
+        ]
+        ordering = ['month', 'department', 'section']
+
+    def __str__(self):
+        return f"{self.department} / {self.section or '-'} {self.month:%Y-%m}"
+
+
+# ----------------------------------------------------------------------
+# PAY RUNS & GENERAL LEDGER JOURNAL
+# ----------------------------------------------------------------------
+
+class PayRun(models.Model):
+    """One payroll run (usually a semi-monthly cut-off) and its per-employee lines."""
+    STATUS_CHOICES = [
+        ('draft', 'Draft'),
+        ('posted', 'Posted'), # Journal entry generated
+        ('finalized', 'Finalized'), # Added to the year-to-date accumulators; locked
+    ]
+
+    period_start = models.DateField()
+    period_end = models.DateField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='draft')
+    created_by = models.CharField(max_length=100, default='Accounting')
+    created_at = models.DateTimeField(auto_now_add=True)
+    posted_at = models.DateTimeField(null=True, blank=True)
+    finalized_at = models.DateTimeField(null=True, blank=True)
+
+    # Totals written when the lines are generated (list pages never aggregate the lines)
+    employee_count = models.PositiveIntegerField(default=0)
+    skipped_count = models.PositiveIntegerField(default=0) # Payroll IDs with logs but no pay rate
+    gross_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    net_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        db_table = 'PayRun'
+        ordering = ['-period_end', '-id']
+
+    def __str__(self):
+        return f"Pay run {self.period_start} to {self.period_end}"
+
+
+class PayRunLine(models.Model):
+    pay_run = models.ForeignKey(PayRun, on_delete=models.CASCADE, related_name='lines')
+    payroll_employee_id = models.CharField(max_length=50)
+    employee = models.ForeignKey('humanresource.Employee', null=True, blank=True, on_delete=models.SET_NULL, related_name='pay_run_lines')
+    department = models.CharField(max_length=100)
+    section = models.CharField(max_length=100, blank=True, default='')
+
+    regular_hours = models.DecimalField(max_digits=7, decimal_places=2, default=0)
+    ot_hours = models.DecimalField(max_digits=7, decimal_places=2, default=0)
+    night_hours = models.DecimalField(max_digits=7, decimal_places=2, default=0)
+    hourly_rate = models.DecimalField(max_digits=10, decimal_places=2)
+
+    regular_pay = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    overtime_pay = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    night_diff_pay = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    gross_pay = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    sss = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    philhealth = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    pagibig = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    withholding_tax = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    net_pay = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        db_table = 'PayRunLine'
+        constraints = [
+            models.UniqueConstraint(fields=['pay_run', 'payroll_employee_id'], name='pay_run_line_employee_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['pay_run', 'department'], name='pay_run_line_dept_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.payroll_employee_id} ({self.pay_run_id})"
+
+
+class JournalEntry(models.Model):
+    """General ledger entry posting one pay run: expenses by department, payables in total."""
+    pay_run = models.OneToOneField(PayRun, on_delete=models.CASCADE, related_name='journal')
+    entry_date = models.DateField()
+    memo = models.CharField(max_length=255)
+    debit_total = models.DecimalField(max_digits=14, decimal_places=2)
+    credit_total = models.DecimalField(max_digits=14, decimal_places=2)
+    created_by = models.CharField(max_length=100, default='Accounting')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'JournalEntry'
+
+    def __str__(self):
+        return f"JE {self.entry_date} {self.memo}"
+
+
+class JournalLine(models.Model):
+    entry = models.ForeignKey(JournalEntry, on_delete=models.CASCADE, related_name='lines')
+    line_no = models.PositiveIntegerField()
+    account_code = models.CharField(max_length=20)
+    account_name = models.CharField(max_length=100)
+    department = models.CharField(max_length=100, blank=True, default='') # Blank on payable (credit) lines
+    debit = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    credit = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        db_table = 'JournalLine'
+        ordering = ['entry', 'line_no']
+
+    def __str__(self):
+        return f"{self.account_code} {self.department} Dr {self.debit} Cr {self.credit}"
+
+
+# ----------------------------------------------------------------------
+# YEAR-TO-DATE PAY & 13TH MONTH
+# ----------------------------------------------------------------------
+
+class EmployeeYearToDate(models.Model):
+    """Running pay totals per payroll ID and calendar year, added to as each pay run is finalized.
+
+    A pay run counts toward the year its period ends in.
+    """
+    payroll_employee_id = models.CharField(max_length=50)
+    year = models.PositiveSmallIntegerField()
+    employee = models.ForeignKey('humanresource.Employee', null=True, blank=True, on_delete=models.SET_NULL, related_name='year_to_date')
+
+    basic_pay = models.DecimalField(max_digits=14, decimal_places=2, default=0) # Regular pay only (13th month base)
+    gross_pay = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    pay_run_count = models.PositiveSmallIntegerField(default=0)
+    last_period_end = models.DateField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'EmployeeYearToDate'
+        constraints = [
+            models.UniqueConstraint(fields=['payroll_employee_id', 'year'], name='employee_ytd_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['year', 'payroll_employee_id'], name='employee_ytd_year_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.payroll_employee_id} {self.year}: {self.basic_pay}"
+
+
+class ThirteenthMonthPay(models.Model):
+    """Result of the 13th-month batch for a year (recomputed as a whole each time it runs)."""
+    year = models.PositiveSmallIntegerField()
+    payroll_employee_id = models.CharField(max_length=50)
+    employee = models.ForeignKey('humanresource.Employee', null=True, blank=True, on_delete=models.SET_NULL, related_name='thirteenth_month_pay')
+    department = models.CharField(max_length=100)
+
+    service_start = models.DateField()
+    service_end = models.DateField()
+    months_of_service = models.DecimalField(max_digits=4, decimal_places=2)
+    basic_pay = models.DecimalField(max_digits=14, decimal_places=2)
+    amount = models.DecimalField(max_digits=12, decimal_places=2) # basic_pay / 12
+    eligible = models.BooleanField(default=True) # At least one month of service in the year
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'ThirteenthMonthPay'
+        ordering = ['department', 'payroll_employee_id']
+        constraints = [
+            models.UniqueConstraint(fields=['year', 'payroll_employee_id'], name='thirteenth_month_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.payroll_employee_id} {self.year}: {self.amount}"
@@ -0,0 +1,118 @@
+"""Pay run generation: one PayRunLine per payroll ID with a pay rate and logs in the period.
+
+Hours come from the same per-day attendance summary as the HR pages, and pay
+uses the rate rules in accounting.rollups. Statutory deductions are flat shares
+of gross pay (ACCOUNTING_DEDUCTION_RATES). They stand in for the SSS,
+PhilHealth, Pag-IBIG and BIR tables, so adjust the settings to company policy.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+
+from humanresource.models import DataVersion, PayrollEmployeeSummary
+
+from .models import PayRun, PayRunLine
+from .rollups import PESOS, UNCLASSIFIED, _hours, _setting, hourly_rate, iter_employee_days
+
+DEDUCTION_FIELDS = ('sss', 'philhealth', 'pagibig', 'withholding_tax')
+DEFAULT_DEDUCTION_RATES = {'sss': '0.045', 'philhealth': '0.025', 'pagibig': '0.02', 'withholding_tax': '0'}
+PAY_RUN_LOCK = 'pay_runs' # DataVersion row used only as a lock
+
+
+class PayRunError(Exception):
+    """The pay run cannot be created (its period overlaps an existing run)."""
+
+
+def overlapping_runs(period_start, period_end):
+    """Pay runs sharing at least one day with [period_start, period_end]."""
+    return PayRun.objects.filter(period_start__lte=period_end, period_end__gte=period_start)
+
+
+def lock_pay_runs():
+    """Serialize overlap checks until the surrounding transaction ends.
+
+    Locking the overlapping runs alone is not enough: when none exist there is
+    nothing to lock, and two requests could both create a run. Everyone who
+    checks for overlaps first locks this one row instead.
+    """
+    DataVersion.objects.get_or_create(name=PAY_RUN_LOCK)
+    DataVersion.objects.select_for_update().get(name=PAY_RUN_LOCK)
+
+
+def deduction_rates():
+    configured = getattr(settings, 'ACCOUNTING_DEDUCTION_RATES', DEFAULT_DEDUCTION_RATES)
+    return {field: Decimal(str(configured.get(field, 0))) for field in DEDUCTION_FIELDS}
+
+
+def build_line(pay_run, payroll_employee_id, employee, days, rate, deductions):
+    regular = night = ot = timedelta(0)
+    for day in days:
+        regular += day['day_shift_hours'] + day['night_shift_hours'] + day['graveyard_shift_hours']
+        night += day['night_shift_hours'] + day['graveyard_shift_hours']
+        ot += day['ot_hours']
+
+    line = PayRunLine(
+        pay_run=pay_run,
+        payroll_employee_id=payroll_employee_id,
+        employee=employee,
+        department=employee.department or UNCLASSIFIED,
+        section=employee.section or '',
+        regular_hours=_hours(regular),
+        ot_hours=_hours(ot),
+        night_hours=_hours(night),
+        hourly_rate=rate,
+    )
+    line.regular_pay = (rate * line.regular_hours).quantize(PESOS)
+    line.overtime_pay = (rate * line.ot_hours * _setting('ACCOUNTING_OT_MULTIPLIER', '1.25')).quantize(PESOS)
+    line.night_diff_pay = (rate * line.night_hours * _setting('ACCOUNTING_NIGHT_DIFFERENTIAL', '0.10')).quantize(PESOS)
+    line.gross_pay = line.regular_pay + line.overtime_pay + line.night_diff_pay
+    for field, share in deductions.items():
+        setattr(line, field, (line.gross_pay * share).quantize(PESOS))
+    # Net is derived from the rounded parts, so every pay run balances to the centavo
+    line.net_pay = line.gross_pay - sum(getattr(line, field) for field in DEDUCTION_FIELDS)
+    return line
+
+
+def create_pay_run(period_start, period_end, created_by='Accounting'):
+    """Compute and store a draft PayRun for [period_start, period_end].
+
+    Periods may not overlap: the same days would be paid (and added to the
+    year-to-date totals) twice. Delete an unwanted draft to free its period.
+    """
+    employee_ids = PayrollEmployeeSummary.objects.filter(
+        first_log_date__lte=period_end, last_log_date__gte=period_start,
+    ).values_list('payroll_employee_id', flat=True)
+    deductions = deduction_rates()
+
+    with transaction.atomic():
+        lock_pay_runs()
+        # A locking read also sees runs committed after this transaction's snapshot
+        clash = overlapping_runs(period_start, period_end).select_for_update().first()
+        if clash is not None:
+            raise PayRunError(
+                f"The period overlaps the {clash.get_status_display().lower()} pay run for "
+                f"{clash.period_start} to {clash.period_end}."
+            )
+        pay_run = PayRun.objects.create(period_start=period_start, period_end=period_end, created_by=created_by)
+        lines = []
+        for batch, profiles, days_by_id in iter_employee_days(list(employee_ids), period_start, period_end):
+            for emp_id, days in days_by_id.items():
+                if not days:
+                    continue
+                employee = profiles.get(emp_id)
+                rate = hourly_rate(employee)
+                if rate is None:
+                    pay_run.skipped_count += 1
+                    continue
+                lines.append(build_line(pay_run, emp_id, employee, days, rate, deductions))
+            PayRunLine.objects.bulk_create(lines, batch_size=500)
+
+            pay_run.employee_count += len(lines)
+            pay_run.gross_total += sum(line.gross_pay for line in lines)
+            pay_run.net_total += sum(line.net_pay for line in lines)
+            lines = []
+
+        pay_run.save(update_fields=['employee_count', 'skipped_count', 'gross_total', 'net_total'])
+    return pay_run
@@ -0,0 +1,32 @@
+"""Keeps the labor cost rollups in step with HR data (connected in AccountingConfig.ready).
+
+The work runs on the HR background worker, so uploads and deletes return as
+soon as their own work is done. With HR_BACKGROUND_WORKER = 'command' nothing
+runs in the web process; schedule `manage.py rebuild_labor_rollups` instead.
+"""
+from humanresource import jobs
+
+from . import rollups
+
+
+def payroll_changed(sender, employee_ids, start_date, end_date, **kwargs):
+    if employee_ids is None:
+        jobs.submit(rollups.clear_rollups) # Full clear
+    else:
+        jobs.submit(rollups.refresh_employee_months, set(employee_ids), start_date, end_date)
+
+
+def employee_profile_changed(sender, payroll_employee_id, **kwargs):
+    jobs.submit(rollups.relabel_employees, [payroll_employee_id])
+
+
+def employee_profiles_changed(sender, payroll_employee_ids, **kwargs):
+    jobs.submit(rollups.relabel_employees, sorted(payroll_employee_ids))
+
+
+def attendance_corrected(sender, payroll_employee_id, start_date, end_date, **kwargs):
+    jobs.submit(rollups.refresh_employee_months, {payroll_employee_id}, start_date, end_date)
+
+
+def roster_changed(sender, employee_ids, start_date, end_date, **kwargs):
+    jobs.submit(rollups.refresh_employee_months, set(employee_ids), start_date, end_date)
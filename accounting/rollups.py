@@ -0,0 +1,301 @@
+"""Incremental maintenance of the monthly labor cost aggregates.
+
+EmployeeMonthlyLabor holds one row per payroll ID and month, computed from the
+raw logs with humanresource.attendance.build_daily_summary. DepartmentMonthlyLabor
+is re-summed from those rows for each touched month only. After an upload, only
+the uploaded employees are recomputed, and only for the months the upload covers
+(plus the month before, whose last night shift the upload may close). The reports
+never read PayrollRecord.
+
+Labor cost is an estimate for management reporting, not payroll:
+    rate x (regular hours + OT hours x ACCOUNTING_OT_MULTIPLIER + night hours x ACCOUNTING_NIGHT_DIFFERENTIAL)
+"""
+import calendar
+from datetime import timedelta
+from decimal import Decimal
+from itertools import groupby
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from humanresource.attendance import build_daily_summary, log_window
+from humanresource.corrections import apply_corrections, load_corrections
+from humanresource.deletion import truncate_models
+from humanresource.models import EmployeeMapping, PayrollEmployeeSummary, PayrollRecord
+from humanresource.roster import RosterIndex
+
+from .models import DepartmentMonthlyLabor, EmployeeMonthlyLabor
+
+# Payroll IDs whose logs are loaded into memory at once
+ROLLUP_BATCH_SIZE = 200
+UNCLASSIFIED = 'Unclassified'
+
+HOURS = Decimal('0.01')
+PESOS = Decimal('0.01')
+
+
+def _setting(name, default):
+    return Decimal(str(getattr(settings, name, default)))
+
+
+# ----------------------------------------------------------------------
+# RATES
+# ----------------------------------------------------------------------
+
+def hourly_rate(employee):
+    """Hourly rate of an HR profile, or None when it has no rate.
+
+    Employee.monthly_daily_rate holds either a daily or a monthly rate; amounts of
+    ACCOUNTING_MONTHLY_RATE_MIN or more are taken as monthly
+    (x 12 / ACCOUNTING_WORK_DAYS_PER_YEAR working days).
+    """
+    if employee is None:
+        return None
+    if employee.hourly_rate:
+        return Decimal(employee.hourly_rate)
+    if not employee.monthly_daily_rate:
+        return None
+
+    rate = Decimal(employee.monthly_daily_rate)
+    hours_per_day = _setting('ACCOUNTING_HOURS_PER_DAY', 8)
+    if rate >= _setting('ACCOUNTING_MONTHLY_RATE_MIN', 3000):
+        rate = rate * 12 / _setting('ACCOUNTING_WORK_DAYS_PER_YEAR', 313)
+    return (rate / hours_per_day).quantize(PESOS)
+
+
+def labor_cost(rate, regular_hours, ot_hours, night_hours):
+    if rate is None:
+        return Decimal('0.00')
+    weighted = (
+        regular_hours
+        + ot_hours * _setting('ACCOUNTING_OT_MULTIPLIER', '1.25')
+        + night_hours * _setting('ACCOUNTING_NIGHT_DIFFERENTIAL', '0.10')
+    )
+    return (rate * weighted).quantize(PESOS)
+
+
+def _apply_profile(row, employee):
+    row.employee = employee
+    row.department = (employee.department or UNCLASSIFIED) if employee else UNCLASSIFIED
+    row.section = (employee.section or '') if employee else ''
+    row.hourly_rate = hourly_rate(employee)
+    row.labor_cost = labor_cost(row.hourly_rate, row.regular_hours, row.ot_hours, row.night_hours)
+
+
+# ----------------------------------------------------------------------
+# MONTHS
+# ----------------------------------------------------------------------
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def month_end(day):
+    return day.replace(day=calendar.monthrange(day.year, day.month)[1])
+
+
+def months_between(start_date, end_date):
+    months = []
+    month = month_start(start_date)
+    while month <= end_date:
+        months.append(month)
+        month = month_end(month) + timedelta(days=1)
+    return months
+
+
+def _hours(delta):
+    return (Decimal(delta.total_seconds()) / 3600).quantize(HOURS)
+
+
+def _monthly_totals(days):
+    """build_daily_summary days -> {month: totals}."""
+    totals = {}
+    for day in days:
+        month = totals.setdefault(month_start(day['date']), {
+            'days_worked': 0, 'regular': timedelta(0), 'ot': timedelta(0), 'night': timedelta(0), 'late': 0,
+        })
+        regular = day['day_shift_hours'] + day['night_shift_hours'] + day['graveyard_shift_hours']
+        if regular or day['ot_hours']:
+            month['days_worked'] += 1
+        month['regular'] += regular
+        month['ot'] += day['ot_hours']
+        month['night'] += day['night_shift_hours'] + day['graveyard_shift_hours']
+        month['late'] += day['total_minutes_late']
+    return totals
+
+
+# ----------------------------------------------------------------------
+# REFRESH
+# ----------------------------------------------------------------------
+
+def employee_days(batch, start_date, end_date):
+    """{payroll ID: build_daily_summary days in [start_date, end_date]} for the IDs of batch that have logs.
+
+    Punch corrections are applied and lateness is measured against the shift
+    roster; one query each for the logs, the corrections and the roster.
+    """
+    fetch_start, fetch_end = log_window(start_date, end_date)
+    logs = (
+        PayrollRecord.objects.filter(employee_id__in=batch, log_date__range=(fetch_start, fetch_end))
+        .order_by('employee_id', 'log_date', 'log_time')
+        .values_list('employee_id', 'log_code', 'log_date', 'log_time')
+    )
+    logs_by_id = {
+        emp_id: [row[1:] for row in rows]
+        for emp_id, rows in groupby(logs.iterator(chunk_size=5000), key=lambda row: row[0])
+    }
+    for emp_id, employee_corrections in load_corrections(batch, fetch_start, fetch_end).items():
+        logs_by_id[emp_id] = apply_corrections(logs_by_id.get(emp_id, []), employee_corrections)
+    roster = RosterIndex.for_employees(batch, fetch_start, fetch_end)
+    return {
+        emp_id: build_daily_summary(rows, start_date, end_date, schedule_for=roster.schedule_for(emp_id))
+        for emp_id, rows in logs_by_id.items()
+    }
+
+
+def iter_employee_days(employee_ids, start_date, end_date):
+    """Yield (batch, profiles, days_by_id) for ROLLUP_BATCH_SIZE payroll IDs at a time.
+
+    days_by_id is employee_days for the batch; profiles maps payroll IDs to
+    their mapped Employee.
+    """
+    employee_ids = sorted({emp_id for emp_id in employee_ids if emp_id})
+
+    for offset in range(0, len(employee_ids), ROLLUP_BATCH_SIZE):
+        batch = employee_ids[offset:offset + ROLLUP_BATCH_SIZE]
+        profiles = {
+            mapping.payroll_employee_id: mapping.employee
+            for mapping in EmployeeMapping.objects.filter(payroll_employee_id__in=batch).select_related('employee')
+        }
+        yield batch, profiles, employee_days(batch, start_date, end_date)
+
+
+def refresh_employee_months(employee_ids, start_date, end_date, rebuild_departments=True):
+    """Recompute the given payroll IDs for every month overlapping [start_date, end_date].
+
+    The month before start_date is included because logs on start_date can close
+    a night shift that began on the last day of that month. Returns the months
+    that were refreshed.
+    """
+    if not employee_ids or start_date is None or end_date is None:
+        return []
+
+    months = months_between(start_date - timedelta(days=1), end_date)
+
+    for batch, profiles, days_by_id in iter_employee_days(employee_ids, months[0], month_end(months[-1])):
+        computed = {}
+        for emp_id, days in days_by_id.items():
+            for month, totals in _monthly_totals(days).items():
+                computed[(emp_id, month)] = totals
+
+        existing = {
+            (row.payroll_employee_id, row.month): row
+            for row in EmployeeMonthlyLabor.objects.filter(payroll_employee_id__in=batch, month__in=months)
+        }
+
+        to_create, to_update = [], []
+        for key, totals in computed.items():
+            row = existing.pop(key, None)
+            if row is None:
+                row = EmployeeMonthlyLabor(payroll_employee_id=key[0], month=key[1])
+                to_create.append(row)
+            else:
+                to_update.append(row)
+            row.days_worked = totals['days_worked']
+            row.regular_hours = _hours(totals['regular'])
+            row.ot_hours = _hours(totals['ot'])
+            row.night_hours = _hours(totals['night'])
+            row.minutes_late = totals['late']
+            _apply_profile(row, profiles.get(key[0]))
+
+        with transaction.atomic():
+            EmployeeMonthlyLabor.objects.bulk_create(to_create)
+            EmployeeMonthlyLabor.objects.bulk_update(to_update, batch_size=500, fields=[
+                'employee', 'department', 'section', 'days_worked', 'regular_hours', 'ot_hours',
+                'night_hours', 'minutes_late', 'hourly_rate', 'labor_cost',
+            ])
+            if existing:
+                # No logs left in those months (upload deleted)
+                EmployeeMonthlyLabor.objects.filter(pk__in=[row.pk for row in existing.values()]).delete()
+
+    if rebuild_departments:
+        rebuild_department_months(months)
+    return months
+
+
+def relabel_employees(payroll_employee_ids):
+    """Re-apply department, section and rate after HR profiles change (hours are unchanged)."""
+    rows = list(EmployeeMonthlyLabor.objects.filter(payroll_employee_id__in=payroll_employee_ids))
+    if not rows:
+        return []
+    profiles = {
+        mapping.payroll_employee_id: mapping.employee
+        for mapping in EmployeeMapping.objects.filter(payroll_employee_id__in=payroll_employee_ids).select_related('employee')
+    }
+
+    months = set()
+    for row in rows:
+        months.add(row.month)
+        _apply_profile(row, profiles.get(row.payroll_employee_id))
+    EmployeeMonthlyLabor.objects.bulk_update(rows, ['employee', 'department', 'section', 'hourly_rate', 'labor_cost'], batch_size=500)
+
+    rebuild_department_months(sorted(months))
+    return sorted(months)
+
+
+def rebuild_department_months(months):
+    """Re-sum DepartmentMonthlyLabor for the given months from EmployeeMonthlyLabor."""
+    if not months:
+        return 0
+    totals = (
+        EmployeeMonthlyLabor.objects.filter(month__in=months)
+        .order_by()
+        .values('month', 'department', 'section')
+        .annotate(
+            employee_count=Count('id'),
+            total_days=Sum('days_worked'),
+            total_regular=Sum('regular_hours'),
+            total_ot=Sum('ot_hours'),
+            total_night=Sum('night_hours'),
+            total_late=Sum('minutes_late'),
+            total_cost=Sum('labor_cost'),
+        )
+    )
+    rows = [
+        DepartmentMonthlyLabor(
+            month=row['month'], department=row['department'], section=row['section'],
+            employee_count=row['employee_count'], days_worked=row['total_days'],
+            regular_hours=row['total_regular'], ot_hours=row['total_ot'], night_hours=row['total_night'],
+            minutes_late=row['total_late'], labor_cost=row['total_cost'],
+        )
+        for row in totals
+    ]
+    with transaction.atomic():
+        DepartmentMonthlyLabor.objects.filter(month__in=months).delete()
+        DepartmentMonthlyLabor.objects.bulk_create(rows)
+    return len(rows)
+
+
+def clear_rollups():
+    truncate_models(EmployeeMonthlyLabor, DepartmentMonthlyLabor)
+
+
+def rebuild_all(progress=None):
+    """Recompute everything from PayrollRecord (backfill, or after changing the rate settings)."""
+    clear_rollups()
+    summaries = PayrollEmployeeSummary.objects.filter(record_count__gt=0).order_by('payroll_employee_id')
+    rows = list(summaries.values_list('payroll_employee_id', 'first_log_date', 'last_log_date'))
+    months = set()
+    for offset in range(0, len(rows), ROLLUP_BATCH_SIZE):
+        batch = rows[offset:offset + ROLLUP_BATCH_SIZE]
+        months.update(refresh_employee_months(
+            [emp_id for emp_id, _, _ in batch],
+            min(first for _, first, _ in batch),
+            max(last for _, _, last in batch),
+            rebuild_departments=False,
+        ))
+        if progress:
+            progress(offset + len(batch), len(rows))
+    rebuild_department_months(sorted(months))
+    return EmployeeMonthlyLabor.objects.count()
@@ -1,3 +1,231 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db.models import Sum
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from humanresource.models import CSVUploadHistory, Employee
+from humanresource.synthetic import Workforce, generate_biolog
+from navigation_app.models import UsersAccount
+
+from .journal import generate_journal
+from .models import (
+    DepartmentMonthlyLabor, EmployeeMonthlyLabor, EmployeeYearToDate, JournalLine, PayRun, PayRunLine, ThirteenthMonthPay,
+)
+from .payruns import PayRunError, build_line, create_pay_run, deduction_rates
+from .thirteenth import FinalizeError, compute_thirteenth_month, finalize_pay_run, rebuild_year_to_date
 
 # Create your tests here.
+
+
+@override_settings(HR_BACKGROUND_WORKER='inline')
+class LaborRollupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        UsersAccount.objects.create(username='hr_rollup', password='secret', role='hr')
+        UsersAccount.objects.create(username='acct_rollup', password='secret', role='Accounting')
+
+    def login(self, username, role):
+        self.client.post('/', {'username': username, 'password': 'secret', 'role': role})
+
+    def upload(self, workforce, start_date, end_date):
+        content = '\n'.join(generate_biolog(workforce, start_date, end_date)) + '\n'
+        self.client.post('/humanresource/payroll-upload/', {
+            'payroll_file': SimpleUploadedFile(f"{start_date:%Y_%m}.txt", content.encode()),
+        })
+
+    def test_upload_edit_and_delete_keep_aggregates_in_step(self):
+        self.login('hr_rollup', 'hr')
+        workforce = Workforce(12, seed=4)
+        self.upload(workforce, date(2025, 1, 1), date(2025, 1, 31))
+        self.upload(workforce, date(2025, 2, 1), date(2025, 2, 28))
+
+        self.assertEqual(set(DepartmentMonthlyLabor.objects.values_list('month', flat=True)), {date(2025, 1, 1), date(2025, 2, 1)})
+        self.assertEqual(EmployeeMonthlyLabor.objects.filter(month=date(2025, 2, 1)).count(), 12)
+        self.assertEqual(
+            DepartmentMonthlyLabor.objects.aggregate(total=Sum('regular_hours'))['total'],
+            EmployeeMonthlyLabor.objects.aggregate(total=Sum('regular_hours'))['total'],
+        )
+
+        # Mapping a profile moves that employee's hours to its department and prices them
+        self.client.post('/humanresource/edit/000000001/', {
+            'first_name': 'Juan', 'last_name': 'Cruz', 'department': 'Milling', 'section': 'Boiler',
+            'status': 'Active', 'hourly_rate': '100.00',
+        })
+        milling = DepartmentMonthlyLabor.objects.get(month=date(2025, 1, 1), department='Milling')
+        employee_month = EmployeeMonthlyLabor.objects.get(payroll_employee_id='000000001', month=date(2025, 1, 1))
+        self.assertEqual(milling.section, 'Boiler')
+        self.assertEqual(milling.employee_count, 1)
+        self.assertEqual(milling.labor_cost, employee_month.labor_cost)
+        self.assertGreater(employee_month.labor_cost, Decimal('0'))
+
+        # Deleting February leaves only what the January file logged on Feb 1
+        # (overtime after the last night shift of January)
+        january_hours = EmployeeMonthlyLabor.objects.filter(month=date(2025, 1, 1)).aggregate(total=Sum('regular_hours'))['total']
+        february = CSVUploadHistory.objects.get(file_name='2025_02.txt')
+        self.client.post(f'/humanresource/payroll-upload/delete/{february.pk}/')
+        self.assertFalse(EmployeeMonthlyLabor.objects.filter(month=date(2025, 2, 1), days_worked__gt=1).exists())
+        self.assertEqual(
+            DepartmentMonthlyLabor.objects.filter(month=date(2025, 1, 1)).aggregate(total=Sum('regular_hours'))['total'],
+            january_hours,
+        )
+
+    def test_report_reads_only_the_aggregates(self):
+        DepartmentMonthlyLabor.objects.bulk_create([
+            DepartmentMonthlyLabor(month=date(year, month, 1), department=department, section='A',
+                                   employee_count=5, regular_hours=Decimal('800'), labor_cost=Decimal('80000'))
+            for year in (2024, 2025) for month in range(1, 13) for department in ('Milling', 'Boiler', 'Office')
+        ])
+        self.login('acct_rollup', 'Accounting')
+
+        with self.assertNumQueries(4): # Session, years, totals, department list (account is cached)
+            response = self.client.get('/accounting/labor-cost/?year=2025')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['grand_total']['total'], Decimal('2880000'))
+        self.assertEqual(response.context['rows'][0]['change'], 0)
+
+
+class PayRunJournalTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        UsersAccount.objects.create(username='acct_journal', password='secret', role='Accounting')
+
+    def make_pay_run(self, employees):
+        pay_run = PayRun.objects.create(period_start=date(2025, 3, 1), period_end=date(2025, 3, 15))
+        departments = ('Milling', 'Boiler', 'Office')
+        days = [{
+            'day_shift_hours': timedelta(hours=8), 'night_shift_hours': timedelta(hours=index % 3),
+            'graveyard_shift_hours': timedelta(0), 'ot_hours': timedelta(minutes=37 * (index % 4)),
+        } for index in range(12)]
+        lines = []
+        for index in range(employees):
+            profile = Employee(department=departments[index % 3], section='A') # Unsaved: labels only
+            line = build_line(pay_run, f"{index:09d}", profile, days, Decimal('71.37') + index % 7, deduction_rates())
+            line.employee = None
+            lines.append(line)
+        PayRunLine.objects.bulk_create(lines)
+        return pay_run
+
+    def test_posting_is_balanced_and_costs_the_same_at_any_size(self):
+        query_counts = []
+        for employees in (10, 300):
+            pay_run = self.make_pay_run(employees)
+            with CaptureQueriesContext(connection) as queries:
+                entry = generate_journal(pay_run.id)
+            query_counts.append(len(queries))
+
+            self.assertEqual(entry.debit_total, entry.credit_total)
+            self.assertEqual(entry.debit_total, PayRunLine.objects.filter(pay_run=pay_run).aggregate(total=Sum('gross_pay'))['total'])
+            # 3 departments x 3 expense accounts, then 4 payables (withholding tax is 0%)
+            self.assertEqual(entry.lines.filter(debit__gt=0).count(), 9)
+            self.assertEqual(entry.lines.filter(credit__gt=0).count(), 4)
+            pay_run.refresh_from_db()
+            self.assertEqual(pay_run.status, 'posted')
+
+        self.assertEqual(query_counts[0], query_counts[1])
+
+    def test_post_and_stream_journal_from_the_views(self):
+        pay_run = self.make_pay_run(6)
+        self.client.post('/', {'username': 'acct_journal', 'password': 'secret', 'role': 'Accounting'})
+
+        self.client.post(f'/accounting/pay-runs/{pay_run.id}/', {'action': 'post'})
+        response = self.client.get(f'/accounting/pay-runs/{pay_run.id}/journal.csv')
+
+        self.assertTrue(response.streaming)
+        rows = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(rows[0].split(',')[:4], ['entry_date', 'reference', 'line_no', 'account_code'])
+        self.assertEqual(len(rows) - 1, JournalLine.objects.filter(entry__pay_run=pay_run).count())
+
+        # A posted run cannot be posted twice or deleted
+        response = self.client.post(f'/accounting/pay-runs/{pay_run.id}/', {'action': 'post'}, follow=True)
+        self.assertContains(response, 'already been posted')
+        self.client.post(f'/accounting/pay-runs/{pay_run.id}/', {'action': 'delete'})
+        self.assertTrue(PayRun.objects.filter(id=pay_run.id).exists())
+
+
+class ThirteenthMonthTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employees = {
+            'full': Employee.objects.create(first_name='Ana', last_name='Reyes', department='Milling', date_hired=date(2019, 3, 1)),
+            'hired': Employee.objects.create(first_name='Jose', last_name='Santos', department='Boiler', date_hired=date(2025, 7, 1)),
+            'left': Employee.objects.create(first_name='Rosa', last_name='Cruz', department='Office', date_separated=date(2025, 1, 20)),
+        }
+
+    def posted_run(self, period_start, period_end, regular_pay):
+        pay_run = PayRun.objects.create(period_start=period_start, period_end=period_end, status='posted')
+        PayRunLine.objects.bulk_create([
+            PayRunLine(pay_run=pay_run, payroll_employee_id=key, employee=employee, department=employee.department,
+                       hourly_rate=Decimal('60'), regular_pay=regular_pay, gross_pay=regular_pay + Decimal('100'))
+            for key, employee in self.employees.items()
+        ])
+        return pay_run
+
+    def test_finalized_runs_accumulate_and_drive_the_batch(self):
+        first = self.posted_run(date(2025, 1, 1), date(2025, 1, 15), Decimal('6000.00'))
+        second = self.posted_run(date(2025, 1, 16), date(2025, 1, 31), Decimal('6500.50'))
+        finalize_pay_run(first.id)
+        finalize_pay_run(second.id) # Existing rows: UPDATE path
+        with self.assertRaises(FinalizeError):
+            finalize_pay_run(second.id)
+
+        ytd = EmployeeYearToDate.objects.get(payroll_employee_id='full', year=2025)
+        self.assertEqual(ytd.basic_pay, Decimal('12500.50'))
+        self.assertEqual(ytd.gross_pay, Decimal('12700.50'))
+        self.assertEqual((ytd.pay_run_count, ytd.last_period_end), (2, date(2025, 1, 31)))
+
+        # Rebuilding from the finalized runs gives the same totals
+        rebuild_year_to_date(2025)
+        self.assertEqual(EmployeeYearToDate.objects.get(payroll_employee_id='full', year=2025).basic_pay, Decimal('12500.50'))
+
+        with self.assertNumQueries(5): # Accumulators, then savepoint, delete, insert, release
+            rows, total, left_out = compute_thirteenth_month(2025)
+        results = {row.payroll_employee_id: row for row in ThirteenthMonthPay.objects.filter(year=2025)}
+
+        self.assertEqual(rows, 3)
+        self.assertEqual(results['full'].amount, Decimal('1041.71'))
+        self.assertEqual(results['full'].months_of_service, Decimal('12.00'))
+        self.assertEqual(results['hired'].service_start, date(2025, 7, 1))
+        self.assertEqual(results['hired'].months_of_service, Decimal('6.05'))
+        self.assertFalse(results['left'].eligible) # 20 days of service
+        self.assertEqual(results['left'].amount, Decimal('0.00'))
+        self.assertEqual(total, Decimal('2083.42'))
+        self.assertEqual(left_out, [])
+
+    def test_pay_outside_the_service_dates_is_reported(self):
+        finalize_pay_run(self.posted_run(date(2025, 3, 1), date(2025, 3, 15), Decimal('5000.00')).id)
+        rehired = Employee.objects.create(first_name='Lito', last_name='Lim', department='Boiler', date_hired=date(2026, 1, 5))
+        EmployeeYearToDate.objects.create(
+            payroll_employee_id='rehired', year=2025, employee=rehired, basic_pay=Decimal('4000.00'),
+            gross_pay=Decimal('4000.00'), pay_run_count=1, last_period_end=date(2025, 3, 15),
+        )
+
+        rows, total, left_out = compute_thirteenth_month(2025)
+        self.assertEqual((rows, left_out), (3, ['rehired']))
+        self.assertFalse(ThirteenthMonthPay.objects.filter(payroll_employee_id='rehired').exists())
+
+        UsersAccount.objects.create(username='acct_13th', password='secret', role='Accounting')
+        self.client.post('/', {'username': 'acct_13th', 'password': 'secret', 'role': 'Accounting'})
+        response = self.client.post('/accounting/13th-month/', {'year': 2025}, follow=True)
+        self.assertContains(response, 'were left out: rehired')
+
+    def test_overlapping_periods_are_rejected(self):
+        first = self.posted_run(date(2025, 2, 1), date(2025, 2, 15), Decimal('6000.00'))
+        with self.assertRaisesMessage(PayRunError, 'overlaps the posted pay run for 2025-02-01 to 2025-02-15'):
+            create_pay_run(date(2025, 2, 15), date(2025, 2, 28))
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(create_pay_run(date(2025, 2, 16), date(2025, 2, 28)).status, 'draft')
+        # The lock row is taken before the overlap check, so concurrent requests check one at a time
+        tables = [query['sql'].split(' FROM ')[1].split()[0] for query in queries.captured_queries if query['sql'].startswith('SELECT')]
+        self.assertLess(tables.index('"DataVersion"'), tables.index('"PayRun"'))
+
+        # Overlaps that already exist never reach the year-to-date totals twice
+        second = self.posted_run(date(2025, 2, 10), date(2025, 2, 20), Decimal('3000.00'))
+        finalize_pay_run(first.id)
+        with self.assertRaisesMessage(FinalizeError, 'already covers part of this period'):
+            finalize_pay_run(second.id)
+        self.assertEqual(EmployeeYearToDate.objects.get(payroll_employee_id='full', year=2025).basic_pay, Decimal('6000.00'))
@@ -0,0 +1,170 @@
+"""Year-to-date pay accumulators and the 13th-month pay batch.
+
+Finalizing a posted pay run adds its lines to EmployeeYearToDate with a
+fixed number of queries: one UPDATE ... SET basic_pay = basic_pay + (subquery)
+for employees that already have a row for the year, and a bulk insert for the
+rest. The 13th-month batch then reads one accumulator row per employee and
+never reads PayRunLine or the attendance logs.
+
+13th-month pay (PD 851) is total basic pay earned in the calendar year / 12.
+Employees hired or separated mid-year have proportionally less basic pay. The
+service window from Employee.date_hired / date_separated gives the months of
+service, and anyone under one month is not eligible.
+"""
+from datetime import date
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, DateField, F, Max, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import EmployeeYearToDate, PayRun, PayRunLine, ThirteenthMonthPay
+from .payruns import lock_pay_runs, overlapping_runs
+from .rollups import PESOS, UNCLASSIFIED
+
+MONTHS_PRECISION = Decimal('0.01')
+MIN_MONTHS_OF_SERVICE = Decimal('1')
+
+
+class FinalizeError(Exception):
+    """The pay run cannot be finalized (not posted yet, already finalized, or overlapping a finalized run)."""
+
+
+# ----------------------------------------------------------------------
+# YEAR-TO-DATE ACCUMULATORS
+# ----------------------------------------------------------------------
+
+def accumulate_pay_run(pay_run):
+    """Add a pay run's lines to the accumulators of the year its period ends in."""
+    year = pay_run.period_end.year
+    lines = PayRunLine.objects.filter(pay_run=pay_run)
+    line_of = lambda column: Subquery(lines.filter(payroll_employee_id=OuterRef('payroll_employee_id')).values(column)[:1])
+
+    # Employees that already have a row this year: one UPDATE with correlated subqueries
+    EmployeeYearToDate.objects.filter(
+        year=year, payroll_employee_id__in=lines.values('payroll_employee_id'),
+    ).update(
+        basic_pay=F('basic_pay') + line_of('regular_pay'),
+        gross_pay=F('gross_pay') + line_of('gross_pay'),
+        pay_run_count=F('pay_run_count') + 1,
+        last_period_end=Greatest('last_period_end', Value(pay_run.period_end, output_field=DateField())),
+        employee=line_of('employee_id'),
+    )
+
+    # First finalized run of the year for everyone else
+    new_rows = lines.exclude(
+        payroll_employee_id__in=EmployeeYearToDate.objects.filter(year=year).values('payroll_employee_id'),
+    ).values_list('payroll_employee_id', 'employee_id', 'regular_pay', 'gross_pay')
+    EmployeeYearToDate.objects.bulk_create([
+        EmployeeYearToDate(
+            payroll_employee_id=emp_id, year=year, employee_id=employee_id,
+            basic_pay=regular_pay, gross_pay=gross_pay, pay_run_count=1, last_period_end=pay_run.period_end,
+        )
+        for emp_id, employee_id, regular_pay, gross_pay in new_rows.iterator(chunk_size=2000)
+    ], batch_size=500)
+
+
+def finalize_pay_run(pay_run_id):
+    """Lock a posted pay run and add it to the year-to-date accumulators (exactly once)."""
+    with transaction.atomic():
+        lock_pay_runs()
+        pay_run = PayRun.objects.select_for_update().get(pk=pay_run_id)
+        if pay_run.status == 'finalized':
+            raise FinalizeError("This pay run has already been finalized.")
+        if pay_run.status != 'posted':
+            raise FinalizeError("Post the pay run to the general ledger before finalizing it.")
+        # Never add the same days to the year-to-date totals twice
+        if overlapping_runs(pay_run.period_start, pay_run.period_end).filter(status='finalized').select_for_update().exists():
+            raise FinalizeError("A finalized pay run already covers part of this period.")
+
+        accumulate_pay_run(pay_run)
+
+        pay_run.status = 'finalized'
+        pay_run.finalized_at = timezone.now()
+        pay_run.save(update_fields=['status', 'finalized_at'])
+    return pay_run
+
+
+def rebuild_year_to_date(year):
+    """Recompute a year's accumulators from its finalized pay runs (one GROUP BY query)."""
+    totals = (
+        PayRunLine.objects.filter(pay_run__status='finalized', pay_run__period_end__year=year)
+        .values('payroll_employee_id')
+        .annotate(
+            total_basic=Sum('regular_pay'),
+            total_gross=Sum('gross_pay'),
+            runs=Count('pay_run', distinct=True),
+            last_end=Max('pay_run__period_end'),
+            last_employee=Max('employee_id'),
+        )
+        .order_by()
+    )
+    rows = [
+        EmployeeYearToDate(
+            payroll_employee_id=row['payroll_employee_id'], year=year, employee_id=row['last_employee'],
+            basic_pay=Decimal(str(row['total_basic'])).quantize(PESOS),
+            gross_pay=Decimal(str(row['total_gross'])).quantize(PESOS),
+            pay_run_count=row['runs'], last_period_end=row['last_end'],
+        )
+        for row in totals
+    ]
+    with transaction.atomic():
+        EmployeeYearToDate.objects.filter(year=year).delete()
+        EmployeeYearToDate.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+# ----------------------------------------------------------------------
+# 13TH MONTH
+# ----------------------------------------------------------------------
+
+def service_window(employee, year):
+    """(first, last) day employed within the year, or None when not employed at all that year."""
+    first, last = date(year, 1, 1), date(year, 12, 31)
+    if employee is not None:
+        if employee.date_hired and employee.date_hired > first:
+            first = employee.date_hired
+        if employee.date_separated and employee.date_separated < last:
+            last = employee.date_separated
+    return (first, last) if first <= last else None
+
+
+def months_of_service(first, last):
+    days_in_year = (date(first.year, 12, 31) - date(first.year, 1, 1)).days + 1
+    return (Decimal((last - first).days + 1) * 12 / days_in_year).quantize(MONTHS_PRECISION)
+
+
+def compute_thirteenth_month(year):
+    """Replace the year's ThirteenthMonthPay rows from EmployeeYearToDate.
+
+    Returns (rows, total amount, left out). left out lists the payroll IDs that
+    were paid in the year although their profile's hire/separation dates say
+    they were not employed in it; they get no row until those dates are fixed.
+    """
+    results, left_out = [], []
+    for ytd in EmployeeYearToDate.objects.filter(year=year).select_related('employee').iterator(chunk_size=2000):
+        window = service_window(ytd.employee, year)
+        if window is None:
+            left_out.append(ytd.payroll_employee_id)
+            continue
+
+        months = months_of_service(*window)
+        eligible = months >= MIN_MONTHS_OF_SERVICE and ytd.basic_pay > 0
+        results.append(ThirteenthMonthPay(
+            year=year,
+            payroll_employee_id=ytd.payroll_employee_id,
+            employee=ytd.employee,
+            department=(ytd.employee.department or UNCLASSIFIED) if ytd.employee else UNCLASSIFIED,
+            service_start=window[0],
+            service_end=window[1],
+            months_of_service=months,
+            basic_pay=ytd.basic_pay,
+            amount=(ytd.basic_pay / 12).quantize(PESOS) if eligible else Decimal('0.00'),
+            eligible=eligible,
+        ))
+
+    with transaction.atomic():
+        ThirteenthMonthPay.objects.filter(year=year).delete()
+        ThirteenthMonthPay.objects.bulk_create(results, batch_size=500)
+    return len(results), sum((row.amount for row in results), Decimal('0.00')), left_out
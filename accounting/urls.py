@@ -5,4 +5,9 @@ app_name = 'accounting'
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-]
\ No newline at end of file
+    path('labor-cost/', views.labor_cost_report, name='labor_cost_report'),
+    path('pay-runs/', views.pay_runs, name='pay_runs'),
+    path('pay-runs/<int:pay_run_id>/', views.pay_run_detail, name='pay_run_detail'),
+    path('pay-runs/<int:pay_run_id>/journal.csv', views.journal_export, name='journal_export'),
+    path('13th-month/', views.thirteenth_month, name='thirteenth_month'),
+]
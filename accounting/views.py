@@ -1,3 +1,223 @@
-from django.shortcuts import render
+from datetime import datetime
+from decimal import Decimal
+
+from django.contrib import messages
+from django.core.paginator import Paginator
+from django.db.models import Count, Max, Sum
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
+
+from humanresource.attendance import cutoff_period
+
+from .journal import JournalError, department_totals, generate_journal, journal_csv_lines
+from .models import DepartmentMonthlyLabor, EmployeeYearToDate, JournalEntry, PayRun, ThirteenthMonthPay
+from .payruns import PayRunError, create_pay_run
+from .thirteenth import FinalizeError, compute_thirteenth_month, finalize_pay_run
 
 # Create your views here.
+
+# Every view in this module requires the 'Accounting' role (see ROLE_ACCESS_RULES).
+
+# ?metric= choices for the labor cost report
+LABOR_METRICS = {
+    'labor_cost': 'Labor Cost',
+    'regular_hours': 'Regular Hours',
+    'ot_hours': 'OT Hours',
+    'night_hours': 'Night Hours',
+    'days_worked': 'Days Worked',
+}
+
+
+def _year_param(request, default):
+    try:
+        return int(request.GET.get('year', default))
+    except ValueError:
+        return default
+
+
+def labor_cost_report(request):
+    """Department (or, for one department, section) x month totals for a year against the year before.
+
+    Reads only DepartmentMonthlyLabor, which holds a few rows per department and
+    month, so the page never scans payroll logs.
+    """
+    years = [day.year for day in DepartmentMonthlyLabor.objects.dates('month', 'year', order='DESC')]
+    year = _year_param(request, years[0] if years else timezone.localdate().year)
+    metric = request.GET.get('metric', 'labor_cost')
+    if metric not in LABOR_METRICS:
+        metric = 'labor_cost'
+    department = request.GET.get('department', '').strip()
+
+    aggregates = DepartmentMonthlyLabor.objects.filter(month__year__in=[year, year - 1])
+    group_by = 'department'
+    if department:
+        aggregates = aggregates.filter(department=department)
+        group_by = 'section'
+
+    # One grouped query: (group, month) -> total of the chosen metric
+    totals = aggregates.values(group_by, 'month').annotate(total=Sum(metric)).order_by()
+
+    rows = {}
+    for total in totals:
+        label = total[group_by] or '(No Section)'
+        row = rows.setdefault(label, {'label': label, 'months': [Decimal(0)] * 12, 'total': Decimal(0), 'previous_total': Decimal(0)})
+        if total['month'].year == year:
+            row['months'][total['month'].month - 1] += total['total']
+            row['total'] += total['total']
+        else:
+            row['previous_total'] += total['total']
+
+    rows = sorted(rows.values(), key=lambda row: row['total'], reverse=True)
+    for row in rows:
+        row['change'] = (
+            round((row['total'] - row['previous_total']) * 100 / row['previous_total'], 1)
+            if row['previous_total'] else None
+        )
+
+    grand_total = {
+        'months': [sum(row['months'][index] for row in rows) for index in range(12)],
+        'total': sum(row['total'] for row in rows),
+        'previous_total': sum(row['previous_total'] for row in rows),
+    }
+
+    context = {
+        'year': year,
+        'years': years,
+        'metric': metric,
+        'metric_label': LABOR_METRICS[metric],
+        'metrics': LABOR_METRICS,
+        'department': department,
+        'departments': DepartmentMonthlyLabor.objects.order_by('department').values_list('department', flat=True).distinct(),
+        'group_label': 'Section' if department else 'Department',
+        'month_names': ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'],
+        'rows': rows,
+        'grand_total': grand_total,
+    }
+    return render(request, 'labor_cost_report.html', context)
+
+
+# ----------------------------------------------------------------------
+# PAY RUNS & JOURNAL
+# ----------------------------------------------------------------------
+
+def _parse_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+    except ValueError:
+        return None
+
+
+def pay_runs(request):
+    """List pay runs (stored totals only) and create a new draft for a period."""
+    username = request.session.get('username', 'Accounting')
+
+    if request.method == 'POST':
+        period_start = _parse_date(request.POST.get('period_start'))
+        period_end = _parse_date(request.POST.get('period_end'))
+        if period_start is None or period_end is None or period_start > period_end:
+            messages.error(request, "Enter a valid pay period.")
+            return redirect('accounting:pay_runs')
+
+        try:
+            pay_run = create_pay_run(period_start, period_end, created_by=username)
+        except PayRunError as e:
+            messages.error(request, str(e))
+            return redirect('accounting:pay_runs')
+        messages.success(request, f"Draft pay run created for {pay_run.employee_count} employee(s).")
+        if pay_run.skipped_count:
+            messages.warning(request, f"{pay_run.skipped_count} payroll ID(s) with logs have no pay rate and were left out.")
+        return redirect('accounting:pay_run_detail', pay_run_id=pay_run.id)
+
+    default_start, default_end = cutoff_period(timezone.localdate())
+    context = {
+        'pay_runs': PayRun.objects.all()[:50],
+        'default_start': default_start,
+        'default_end': default_end,
+    }
+    return render(request, 'pay_runs.html', context)
+
+
+def pay_run_detail(request, pay_run_id):
+    pay_run = get_object_or_404(PayRun, id=pay_run_id)
+
+    if request.method == 'POST':
+        action = request.POST.get('action')
+        if action == 'post':
+            try:
+                entry = generate_journal(pay_run.id, created_by=request.session.get('username', 'Accounting'))
+                messages.success(request, f"Posted: debits and credits of {entry.debit_total:,.2f}.")
+            except JournalError as e:
+                messages.error(request, str(e))
+        elif action == 'finalize':
+            try:
+                finalize_pay_run(pay_run.id)
+                messages.success(request, "Pay run finalized and added to the year-to-date totals.")
+            except FinalizeError as e:
+                messages.error(request, str(e))
+        elif action == 'delete' and pay_run.status == 'draft':
+            pay_run.delete()
+            messages.success(request, "Draft pay run deleted.")
+            return redirect('accounting:pay_runs')
+        return redirect('accounting:pay_run_detail', pay_run_id=pay_run.id)
+
+    journal = JournalEntry.objects.filter(pay_run=pay_run).first()
+    context = {
+        'pay_run': pay_run,
+        'departments': department_totals(pay_run),
+        'journal': journal,
+        'journal_lines': journal.lines.all() if journal else [],
+    }
+    return render(request, 'pay_run_detail.html', context)
+
+
+def journal_export(request, pay_run_id):
+    """Stream the pay run's journal entry as CSV for import into the general ledger."""
+    entry = JournalEntry.objects.filter(pay_run_id=pay_run_id).first()
+    if entry is None:
+        raise Http404("This pay run has not been posted.")
+
+    response = StreamingHttpResponse(journal_csv_lines(entry), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="journal_PR{pay_run_id}_{entry.entry_date:%Y%m%d}.csv"'
+    return response
+
+
+# ----------------------------------------------------------------------
+# 13TH MONTH PAY
+# ----------------------------------------------------------------------
+
+THIRTEENTH_MONTH_PAGE_SIZE = 100
+
+
+def thirteenth_month(request):
+    """Run the 13th-month batch for a year and page through its results."""
+    year = _year_param(request, timezone.localdate().year)
+
+    if request.method == 'POST':
+        try:
+            year = int(request.POST.get('year', year))
+        except ValueError:
+            pass
+        rows, total, left_out = compute_thirteenth_month(year)
+        messages.success(request, f"13th month pay computed for {rows} employee(s): {total:,.2f} in total.")
+        if left_out:
+            messages.error(
+                request,
+                f"{len(left_out)} payroll ID(s) were paid in {year} but their hire/separation dates are outside it, "
+                f"so they were left out: {', '.join(left_out)}. Correct their profiles and compute again.",
+            )
+        return redirect(f"{request.path}?year={year}")
+
+    results = ThirteenthMonthPay.objects.filter(year=year).select_related('employee')
+    summary = results.aggregate(employees=Count('id'), total=Sum('amount'), basic=Sum('basic_pay'))
+    accumulated = EmployeeYearToDate.objects.filter(year=year).aggregate(
+        employees=Count('id'), basic=Sum('basic_pay'), through=Max('last_period_end'),
+    )
+    context = {
+        'year': year,
+        'page_obj': Paginator(results, THIRTEENTH_MONTH_PAGE_SIZE).get_page(request.GET.get('page')),
+        'summary': summary,
+        'accumulated': accumulated,
+        'not_eligible': results.filter(eligible=False).count(),
+    }
+    return render(request, 'thirteenth_month.html', context)
@@ -0,0 +1,157 @@
+"""Cursor pagination, ?fields= projection and ETags for the JSON API.
+
+Pages are keyset pages: rows are ordered by a unique key and the opaque
+?cursor= holds the last key of the previous page. Each page is one indexed
+range query, however deep the client has read, and rows inserted while it
+pages never shift it. One extra row is fetched to know whether a next page
+exists, so there is no COUNT(*).
+
+?fields=a,b,c picks the columns. They are read with .values(), so only those
+columns (plus the cursor key) are selected and no model instances are built.
+
+ETags come from the 'attendance' DataVersion, which every upload, delete and
+profile edit bumps. A client revalidating an unchanged page costs one
+DataVersion read and gets a 304.
+"""
+import base64
+import binascii
+import hashlib
+import json
+from datetime import date
+
+from django.db.models import CharField, F
+from django.http import JsonResponse
+
+from humanresource import attendance_cache
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 500
+
+
+class ApiError(Exception):
+    """A query parameter is not valid; answered with 400 and the message."""
+
+
+def error_response(error):
+    return JsonResponse({'error': str(error)}, status=400)
+
+
+# ----------------------------------------------------------------------
+# PARAMETERS
+# ----------------------------------------------------------------------
+
+def parse_limit(request, default=DEFAULT_LIMIT, maximum=MAX_LIMIT):
+    value = request.GET.get('limit', '').strip()
+    if not value:
+        return default
+    if not value.isdigit() or not 1 <= int(value) <= maximum:
+        raise ApiError(f"limit must be a number from 1 to {maximum}.")
+    return int(value)
+
+
+def parse_fields(request, allowed, default):
+    """The requested field names, in request order; allowed lists every name a client may ask for."""
+    value = request.GET.get('fields', '').strip()
+    if not value:
+        return list(default)
+    fields = list(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+    unknown = [name for name in fields if name not in allowed]
+    if unknown:
+        raise ApiError(f"Unknown field(s) {', '.join(unknown)}; use any of {', '.join(allowed)}.")
+    return fields
+
+
+def parse_date(request, name, required=False):
+    value = request.GET.get(name, '').strip()
+    if not value:
+        if required:
+            raise ApiError(f"{name} is required (YYYY-MM-DD).")
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ApiError(f"{name} must be a date (YYYY-MM-DD).")
+
+
+def parse_date_range(request, start_name, end_name, required=False):
+    start_date = parse_date(request, start_name, required)
+    end_date = parse_date(request, end_name, required)
+    if start_date and end_date and end_date < start_date:
+        raise ApiError(f"{end_name} is before {start_name}.")
+    return start_date, end_date
+
+
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(json.dumps([key]).encode()).decode().rstrip('=')
+
+
+def decode_cursor(request, key_type=int):
+    """The key after which the page starts, or None for the first page.
+
+    key_type is the Python type of the key field's values (int for id, str for
+    payroll_employee_id); a cursor holding anything else is rejected.
+    """
+    value = request.GET.get('cursor', '').strip()
+    if not value:
+        return None
+    try:
+        key, = json.loads(base64.urlsafe_b64decode(value + '=' * (-len(value) % 4)))
+    except (binascii.Error, ValueError, TypeError):
+        key = None
+    # bool is an int subclass, but never a key
+    if type(key) is not key_type:
+        raise ApiError("cursor is not valid; use the next_cursor of the previous page.")
+    return key
+
+
+# ----------------------------------------------------------------------
+# PAGES
+# ----------------------------------------------------------------------
+
+def project(queryset, fields, columns):
+    """queryset.values() for the given field names; columns maps a name to its lookup when they differ."""
+    plain = [name for name in fields if columns.get(name, name) == name]
+    aliased = {name: F(columns[name]) for name in fields if columns.get(name, name) != name}
+    return queryset.values(*plain, **aliased)
+
+
+def paginate(request, queryset, fields, columns=None, key='id', descending=False, limit=None):
+    """(rows, next cursor or None) for one page of queryset, ordered by the unique field key."""
+    limit = limit or parse_limit(request)
+    after = decode_cursor(request, str if isinstance(queryset.model._meta.get_field(key), CharField) else int)
+    if after is not None:
+        queryset = queryset.filter(**{f"{key}__{'lt' if descending else 'gt'}": after})
+
+    selected = fields if key in fields else fields + [key]
+    rows = list(project(queryset.order_by(f'-{key}' if descending else key), selected, columns or {})[:limit + 1])
+    next_cursor = encode_cursor(rows[limit - 1][key]) if len(rows) > limit else None
+    rows = rows[:limit]
+    if key not in fields:
+        for row in rows:
+            del row[key]
+    return rows, next_cursor
+
+
+def page_response(request, rows, next_cursor):
+    next_url = None
+    if next_cursor:
+        query = request.GET.copy()
+        query['cursor'] = next_cursor
+        next_url = f'{request.path}?{query.urlencode()}'
+    return JsonResponse({'results': rows, 'next_cursor': next_cursor, 'next': next_url})
+
+
+# ----------------------------------------------------------------------
+# ETAGS
+# ----------------------------------------------------------------------
+
+def data_version(request):
+    # One DataVersion read per request, shared by the ETag callbacks
+    if not hasattr(request, '_api_data_version'):
+        request._api_data_version = attendance_cache.get_data_version()
+    return request._api_data_version
+
+
+def api_etag(request, *args, **kwargs):
+    """Data version plus the full query, so each page and projection has its own tag."""
+    return hashlib.md5(f'{data_version(request)}:{request.get_full_path()}'.encode()).hexdigest()
@@ -0,0 +1,125 @@
+import base64
+import json
+from datetime import date, datetime, time
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from humanresource import attendance_cache
+from humanresource.models import Employee, EmployeeMapping, PayrollEmployeeSummary
+from humanresource.synthetic import HEADER, format_row
+from navigation_app.models import UsersAccount
+
+
+@override_settings(HR_BACKGROUND_WORKER='inline')
+class ApiTests(TestCase):
+    DAY = date(2025, 3, 10)
+
+    @classmethod
+    def setUpTestData(cls):
+        UsersAccount.objects.create(username='hr_test', password='secret', role='hr')
+        UsersAccount.objects.create(username='tk_test', password='secret', role='timekeeper')
+        attendance_cache.bump_data_version()
+        for number in range(1, 8):
+            employee = Employee.objects.create(
+                first_name=f'Worker{number}', last_name='Santos', department='Mill' if number % 2 else 'Office',
+                address='Somewhere', date_hired=date(2020, 1, number),
+            )
+            EmployeeMapping.objects.create(payroll_employee_id=f'{number:09d}', employee=employee)
+
+    def setUp(self):
+        self.client.post('/', {'username': 'hr_test', 'password': 'secret', 'role': 'hr'})
+
+    def upload_day(self):
+        punches = [
+            ('000000001', '0', '07:55:00'), ('000000001', '3', '17:00:00'),
+            ('000000002', '0', '08:00:00'), ('000000002', '3', '16:30:00'),
+            ('000000003', '0', '08:10:00'), ('000000003', '3', '17:10:00'),
+        ]
+        content = '\n'.join([HEADER] + [
+            format_row(sequence, emp_id, f"WORKER {emp_id[-1]}", code, datetime.combine(self.DAY, time.fromisoformat(log_time)))
+            for sequence, (emp_id, code, log_time) in enumerate(punches, start=1)
+        ]) + '\n'
+        self.client.post('/humanresource/payroll-upload/', {'payroll_file': SimpleUploadedFile('day.txt', content.encode())})
+
+    def test_cursor_pages_cover_every_row_once(self):
+        ids, url = [], '/api/v1/employees/?limit=3&department=Mill'
+        while url:
+            body = self.client.get(url).json()
+            self.assertLessEqual(len(body['results']), 3)
+            ids += [row['id'] for row in body['results']]
+            url = body['next']
+        self.assertEqual(ids, list(Employee.objects.filter(department='Mill').order_by('id').values_list('id', flat=True)))
+
+        response = self.client.get('/api/v1/employees/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 400)
+        # Forged cursors: wrong key types for id, then for payroll_employee_id
+        for url, key in (
+            ('/api/v1/employees/', 'not-json'), ('/api/v1/employees/', ['abc']), ('/api/v1/employees/', [{'a': 1}]),
+            ('/api/v1/employees/', [True]), ('/api/v1/employees/', [1.5]),
+            ('/api/v1/attendance/?start=2025-03-10&end=2025-03-10', [7]),
+            ('/api/v1/attendance/?start=2025-03-10&end=2025-03-10', [['000000001']]),
+        ):
+            with self.subTest(url=url, key=key):
+                cursor = base64.urlsafe_b64encode(json.dumps(key).encode() if key != 'not-json' else b'{').decode()
+                response = self.client.get(f"{url}{'&' if '?' in url else '?'}cursor={cursor}")
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('cursor is not valid', response.json()['error'])
+
+    def test_fields_select_only_those_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            body = self.client.get('/api/v1/employees/?fields=payroll_employee_id,last_name&hired_from=2020-01-06').json()
+        self.assertEqual(body['results'], [
+            {'payroll_employee_id': '000000006', 'last_name': 'Santos'},
+            {'payroll_employee_id': '000000007', 'last_name': 'Santos'},
+        ])
+        select = next(query['sql'] for query in queries.captured_queries if 'FROM "Employee"' in query['sql'])
+        self.assertNotIn('address', select)
+        self.assertNotIn('first_name', select)
+
+        response = self.client.get('/api/v1/employees/?fields=last_name,salary')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('salary', response.json()['error'])
+
+    def test_etag_answers_304_until_the_data_changes(self):
+        url = '/api/v1/mappings/?fields=payroll_employee_id'
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse([query for query in queries.captured_queries if 'EmployeeMapping' in query['sql']])
+
+        attendance_cache.bump_data_version()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_attendance_days_and_uploads(self):
+        self.upload_day()
+        body = self.client.get('/api/v1/attendance/?start=2025-03-10&end=2025-03-10&limit=2&fields=date,day_shift_hours').json()
+        self.assertEqual([row['payroll_employee_id'] for row in body['results']], ['000000001', '000000002'])
+        self.assertEqual(body['results'][0]['days'], [{'date': '2025-03-10', 'day_shift_hours': 9.08}])
+        body = self.client.get(body['next']).json()
+        self.assertEqual([row['payroll_employee_id'] for row in body['results']], ['000000003'])
+        self.assertIsNone(body['next'])
+
+        # A correction bumps only the employee's revision, which the attendance ETag includes
+        url = '/api/v1/attendance/?start=2025-03-10&end=2025-03-10&payroll_employee_id=1'
+        etag = self.client.get(url)['ETag']
+        PayrollEmployeeSummary.objects.filter(payroll_employee_id='000000001').update(revision=1)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        self.assertEqual(self.client.get('/api/v1/attendance/?start=2025-03-10').status_code, 400)
+        uploads = self.client.get('/api/v1/uploads/?logs_from=2025-03-01&fields=file_name,row_count').json()['results']
+        self.assertEqual(uploads, [{'file_name': 'day.txt', 'row_count': 6}])
+
+    def test_json_errors_instead_of_redirects(self):
+        self.client.logout()
+        response = self.client.get('/api/v1/employees/')
+        self.assertEqual((response.status_code, response.json()), (401, {'error': 'Login required.'}))
+
+        self.client.post('/', {'username': 'tk_test', 'password': 'secret', 'role': 'timekeeper'})
+        self.assertEqual(self.client.get('/api/v1/employees/').status_code, 403)
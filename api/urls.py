@@ -0,0 +1,11 @@
+from django.urls import path
+from api import views
+app_name = 'api'
+
+urlpatterns = [
+    path('', views.index, name='index'),
+    path('employees/', views.employees, name='employees'),
+    path('mappings/', views.mappings, name='mappings'),
+    path('uploads/', views.uploads, name='uploads'),
+    path('attendance/', views.attendance, name='attendance'),
+]
@@ -0,0 +1,239 @@
+import hashlib
+import re
+from functools import wraps
+
+from django.http import JsonResponse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_safe
+
+from accounting.rollups import ROLLUP_BATCH_SIZE, employee_days
+from humanresource.attendance import log_window
+from humanresource.imports import normalize_payroll_id
+from humanresource.models import CSVUploadHistory, Employee, EmployeeMapping, PayrollEmployeeSummary
+
+from .pagination import (
+    ApiError, api_etag, data_version, error_response, page_response, paginate, parse_date_range, parse_fields,
+    parse_limit,
+)
+
+# Clients must revalidate (If-None-Match) before reusing a page
+api_revalidate = cache_control(private=True, no_cache=True)
+
+
+def json_errors(view_func):
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view_func(request, *args, **kwargs)
+        except ApiError as e:
+            return error_response(e)
+    return wrapper
+
+
+def _payroll_ids(request):
+    value = request.GET.get('payroll_employee_id', '')
+    return sorted({normalize_payroll_id(part) for part in re.split(r'[\s,]+', value) if part})
+
+
+def _exact_filters(request, queryset, filters):
+    """filters maps a query parameter to the lookup it filters on."""
+    for name, lookup in filters.items():
+        value = request.GET.get(name, '').strip()
+        if value:
+            queryset = queryset.filter(**{lookup: value})
+    return queryset
+
+
+def _logs_overlap(request, queryset, first_lookup, last_lookup):
+    """Rows whose [first, last] log dates overlap ?logs_from= .. ?logs_to=."""
+    logs_from, logs_to = parse_date_range(request, 'logs_from', 'logs_to')
+    if logs_from:
+        queryset = queryset.filter(**{f'{last_lookup}__gte': logs_from})
+    if logs_to:
+        queryset = queryset.filter(**{f'{first_lookup}__lte': logs_to})
+    return queryset
+
+
+# ----------------------------------------------------------------------
+# EMPLOYEES
+# ----------------------------------------------------------------------
+
+EMPLOYEE_COLUMNS = {'payroll_employee_id': 'mapping__payroll_employee_id'}
+EMPLOYEE_FIELDS = [model_field.attname for model_field in Employee._meta.concrete_fields] + list(EMPLOYEE_COLUMNS)
+EMPLOYEE_DEFAULT_FIELDS = [
+    'id', 'payroll_employee_id', 'first_name', 'middle_name', 'last_name', 'department', 'section', 'position', 'status',
+]
+EMPLOYEE_FILTERS = {name: name for name in ('department', 'section', 'position', 'status')}
+
+
+@require_safe
+@api_revalidate
+@condition(etag_func=api_etag)
+@json_errors
+def employees(request):
+    """Employee profiles by id. Filters: department, section, position, status, payroll_employee_id, hired_from/hired_to."""
+    fields = parse_fields(request, EMPLOYEE_FIELDS, EMPLOYEE_DEFAULT_FIELDS)
+    queryset = _exact_filters(request, Employee.objects.all(), EMPLOYEE_FILTERS)
+    payroll_ids = _payroll_ids(request)
+    if payroll_ids:
+        queryset = queryset.filter(mapping__payroll_employee_id__in=payroll_ids)
+    hired_from, hired_to = parse_date_range(request, 'hired_from', 'hired_to')
+    if hired_from:
+        queryset = queryset.filter(date_hired__gte=hired_from)
+    if hired_to:
+        queryset = queryset.filter(date_hired__lte=hired_to)
+
+    rows, next_cursor = paginate(request, queryset, fields, EMPLOYEE_COLUMNS)
+    return page_response(request, rows, next_cursor)
+
+
+# ----------------------------------------------------------------------
+# MAPPINGS
+# ----------------------------------------------------------------------
+
+MAPPING_COLUMNS = {
+    'first_name': 'employee__first_name',
+    'last_name': 'employee__last_name',
+    'department': 'employee__department',
+    'bio_name': 'employee__payroll_summary__bio_name',
+    'first_log_date': 'employee__payroll_summary__first_log_date',
+    'last_log_date': 'employee__payroll_summary__last_log_date',
+    'record_count': 'employee__payroll_summary__record_count',
+}
+MAPPING_FIELDS = ['id', 'payroll_employee_id', 'employee_id'] + list(MAPPING_COLUMNS)
+MAPPING_DEFAULT_FIELDS = ['id', 'payroll_employee_id', 'employee_id', 'first_name', 'last_name', 'department']
+
+
+@require_safe
+@api_revalidate
+@condition(etag_func=api_etag)
+@json_errors
+def mappings(request):
+    """Payroll ID -> Employee links by id. Filters: department, payroll_employee_id, logs_from/logs_to."""
+    fields = parse_fields(request, MAPPING_FIELDS, MAPPING_DEFAULT_FIELDS)
+    queryset = _exact_filters(request, EmployeeMapping.objects.all(), {'department': 'employee__department'})
+    payroll_ids = _payroll_ids(request)
+    if payroll_ids:
+        queryset = queryset.filter(payroll_employee_id__in=payroll_ids)
+    queryset = _logs_overlap(request, queryset, 'employee__payroll_summary__first_log_date', 'employee__payroll_summary__last_log_date')
+
+    rows, next_cursor = paginate(request, queryset, fields, MAPPING_COLUMNS)
+    return page_response(request, rows, next_cursor)
+
+
+# ----------------------------------------------------------------------
+# UPLOADS
+# ----------------------------------------------------------------------
+
+UPLOAD_FIELDS = [model_field.attname for model_field in CSVUploadHistory._meta.concrete_fields]
+UPLOAD_DEFAULT_FIELDS = [
+    'id', 'file_name', 'uploaded_by', 'upload_time', 'row_count', 'employee_count', 'min_log_date', 'max_log_date',
+]
+
+
+@require_safe
+@api_revalidate
+@condition(etag_func=api_etag)
+@json_errors
+def uploads(request):
+    """Upload history, newest first. Filters: uploaded_from/uploaded_to, logs_from/logs_to."""
+    fields = parse_fields(request, UPLOAD_FIELDS, UPLOAD_DEFAULT_FIELDS)
+    queryset = CSVUploadHistory.objects.all()
+    uploaded_from, uploaded_to = parse_date_range(request, 'uploaded_from', 'uploaded_to')
+    if uploaded_from:
+        queryset = queryset.filter(upload_time__date__gte=uploaded_from)
+    if uploaded_to:
+        queryset = queryset.filter(upload_time__date__lte=uploaded_to)
+    queryset = _logs_overlap(request, queryset, 'min_log_date', 'max_log_date')
+
+    rows, next_cursor = paginate(request, queryset, fields, descending=True)
+    return page_response(request, rows, next_cursor)
+
+
+# ----------------------------------------------------------------------
+# DAILY ATTENDANCE
+# ----------------------------------------------------------------------
+
+HOUR_FIELDS = ('total_hours', 'day_shift_hours', 'night_shift_hours', 'graveyard_shift_hours', 'ot_hours')
+DAY_FIELDS = [
+    'date', 'AM_IN', 'AM_OUT', 'PM_IN', 'PM_OUT', 'OT_IN', 'OT_OUT',
+    *HOUR_FIELDS, 'total_minutes_late', 'undertime_minutes', 'schedule',
+]
+ATTENDANCE_MAX_DAYS = 92
+ATTENDANCE_LIMIT = 50
+
+
+def _attendance_page(request):
+    """(start, end, day fields, summary rows, next cursor), read once per request for the ETag and the view."""
+    if not hasattr(request, '_api_attendance_page'):
+        start_date, end_date = parse_date_range(request, 'start', 'end', required=True)
+        if (end_date - start_date).days >= ATTENDANCE_MAX_DAYS:
+            raise ApiError(f"Ask for at most {ATTENDANCE_MAX_DAYS} days at a time.")
+        fields = parse_fields(request, DAY_FIELDS, DAY_FIELDS)
+
+        # Payroll IDs with logs in the window build_daily_summary reads (night shifts cross midnight)
+        fetch_start, fetch_end = log_window(start_date, end_date)
+        summaries = PayrollEmployeeSummary.objects.filter(
+            record_count__gt=0, first_log_date__lte=fetch_end, last_log_date__gte=fetch_start,
+        )
+        payroll_ids = _payroll_ids(request)
+        if payroll_ids:
+            summaries = summaries.filter(payroll_employee_id__in=payroll_ids)
+        summaries = _exact_filters(request, summaries, {'department': 'employee__department'})
+
+        rows, next_cursor = paginate(
+            request, summaries, ['payroll_employee_id', 'employee_id', 'revision'], key='payroll_employee_id',
+            limit=parse_limit(request, ATTENDANCE_LIMIT, ROLLUP_BATCH_SIZE),
+        )
+        request._api_attendance_page = (start_date, end_date, fields, rows, next_cursor)
+    return request._api_attendance_page
+
+
+def attendance_etag(request, *args, **kwargs):
+    """api_etag plus the correction revisions of the page's employees, which corrections bump instead of the version."""
+    try:
+        rows = _attendance_page(request)[3]
+    except ApiError:
+        return None # The view answers 400
+    revisions = ','.join(f"{row['payroll_employee_id']}:{row['revision']}" for row in rows)
+    return hashlib.md5(f'{data_version(request)}:{request.get_full_path()}:{revisions}'.encode()).hexdigest()
+
+
+def _day(day, fields):
+    return {
+        name: round(day[name].total_seconds() / 3600, 2) if name in HOUR_FIELDS else day[name]
+        for name in fields
+    }
+
+
+@require_safe
+@api_revalidate
+@condition(etag_func=attendance_etag)
+@json_errors
+def attendance(request):
+    """Daily attendance for start..end (required), per payroll ID. Filters: payroll_employee_id, department.
+
+    Hours are decimal hours; days are oldest first and only days with logs are listed.
+    """
+    start_date, end_date, fields, rows, next_cursor = _attendance_page(request)
+    days_by_id = employee_days([row['payroll_employee_id'] for row in rows], start_date, end_date) if rows else {}
+    results = [
+        {
+            'payroll_employee_id': row['payroll_employee_id'],
+            'employee_id': row['employee_id'],
+            'days': [_day(day, fields) for day in reversed(days_by_id.get(row['payroll_employee_id'], []))],
+        }
+        for row in rows
+    ]
+    return page_response(request, results, next_cursor)
+
+
+@require_safe
+def index(request):
+    """The endpoints of this API version."""
+    return JsonResponse({
+        'employees': {'fields': EMPLOYEE_FIELDS, 'default_fields': EMPLOYEE_DEFAULT_FIELDS},
+        'mappings': {'fields': MAPPING_FIELDS, 'default_fields': MAPPING_DEFAULT_FIELDS},
+        'uploads': {'fields': UPLOAD_FIELDS, 'default_fields': UPLOAD_DEFAULT_FIELDS},
+        'attendance': {'fields': DAY_FIELDS, 'default_fields': DAY_FIELDS},
+    })
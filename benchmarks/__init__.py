@@ -0,0 +1,7 @@
+"""Performance benchmarks for the payroll system.
+
+Each module is runnable with ``python -m benchmarks.<name>`` from the project
+root. They build a throwaway test database (never the configured one), drive
+the real views through Django's test client, and write machine-readable JSON
+results that can be compared between versions.
+"""
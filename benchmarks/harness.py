@@ -0,0 +1,116 @@
+"""Shared plumbing for the benchmark scripts."""
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django():
+    """Configure Django for a standalone script (honours DJANGO_SETTINGS_MODULE)."""
+    if str(BASE_DIR) not in sys.path:
+        sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Project2.settings')
+    import django
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """Create the test database for the run and destroy it afterwards."""
+    from django.test.runner import DiscoverRunner
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    runner = DiscoverRunner(verbosity=0, interactive=False)
+    old_config = runner.setup_databases()
+    try:
+        yield
+    finally:
+        runner.teardown_databases(old_config)
+        teardown_test_environment()
+
+
+def timed_request(client, method, url, **kwargs):
+    """Issue one request; return (response, elapsed_ms, query_count)."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        response = getattr(client, method)(url, **kwargs)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+    return response, elapsed_ms, len(queries)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile (pct in 0-100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def summarize(latencies_ms, query_counts=None):
+    summary = {
+        'samples': len(latencies_ms),
+        'mean_ms': round(statistics.fmean(latencies_ms), 3) if latencies_ms else 0.0,
+        'p50_ms': round(percentile(latencies_ms, 50), 3),
+        'p95_ms': round(percentile(latencies_ms, 95), 3),
+        'max_ms': round(max(latencies_ms), 3) if latencies_ms else 0.0,
+    }
+    if query_counts is not None:
+        summary['queries_mean'] = round(statistics.fmean(query_counts), 2) if query_counts else 0.0
+        summary['queries_max'] = max(query_counts) if query_counts else 0
+    return summary
+
+
+def environment_info():
+    import django
+    from django.db import connection
+    return {
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database_vendor': connection.vendor,
+        'platform': platform.platform(),
+    }
+
+
+def write_results(path, benchmark, params, results):
+    """Write one JSON document per run (stdout when path is '-')."""
+    from django.utils import timezone
+
+    payload = {
+        'benchmark': benchmark,
+        'created_at': timezone.now().isoformat(),
+        'environment': environment_info(),
+        'params': params,
+        'results': results,
+    }
+    text = json.dumps(payload, indent=2, sort_keys=True, default=str)
+    if path == '-':
+        print(text)
+    else:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(text + '\n')
+    return payload
+
+
+def sample_biolog(employee_count=20, days=3, start=date(2025, 1, 6)):
+    """A small, regular day-shift export in the device's fixed-width layout."""
+    lines = ['No.     EnNo       Name           Mode DateTime']
+    for number in range(1, employee_count + 1):
+        for offset in range(days):
+            day = start + timedelta(days=offset)
+            for code, log_time in (('0', '07:55:00'), ('3', '17:02:00')):
+                lines.append(
+                    f"{number:<8}{number:09d}  {f'WORKER {number}'[:14]:<14}   {code} {day:%Y/%m/%d} {log_time}"
+                )
+    return '\n'.join(lines) + '\n'
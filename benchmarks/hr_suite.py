@@ -0,0 +1,143 @@
+"""End-to-end HR benchmark: upload throughput and page latency by data size.
+
+    python -m benchmarks.hr_suite --output results/hr_suite.json
+    python -m benchmarks.hr_suite --employees 100 1000 --months 1 6 --samples 5
+
+For every workforce size the synthetic device exports (humanresource.synthetic)
+are uploaded month by month through PayrollUploadView. When the loaded history
+reaches one of the --months checkpoints, the employee list, roster search and
+employee details pages are measured, both cold (attendance and fragment caches
+cleared before each request) and warm. Background jobs run inline, so upload
+timings include the follow-up work each upload queues and no worker thread
+runs while pages are measured.
+"""
+import argparse
+from datetime import date
+
+from benchmarks import harness
+
+DEFAULT_EMPLOYEES = (100, 1000, 5000)
+DEFAULT_MONTHS = (1, 6, 24)
+
+
+def upload_month(client, workforce, first_day, last_day):
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    from humanresource.synthetic import generate_biolog
+
+    content = '\n'.join(generate_biolog(workforce, first_day, last_day)) + '\n'
+    rows = content.count('\n') - 1
+    response, elapsed_ms, queries = harness.timed_request(
+        client, 'post', '/humanresource/payroll-upload/',
+        data={'payroll_file': SimpleUploadedFile(f"biolog_{first_day:%Y_%m}.txt", content.encode())},
+    )
+    if response.status_code != 302:
+        raise RuntimeError(f"Upload of {first_day:%Y-%m} returned HTTP {response.status_code}")
+    return {'month': f"{first_day:%Y-%m}", 'rows': rows, 'ms': round(elapsed_ms, 3), 'queries': queries}
+
+
+def page_requests(workforce, samples):
+    """(name, url) pairs measured at each checkpoint; IDs and queries spread over the roster."""
+    people = workforce.people
+    picks = [people[(index * len(people)) // samples] for index in range(samples)]
+    return {
+        'employee_list': ['/humanresource/employee-list/'] * samples,
+        'employee_list_last_page': ['/humanresource/employee-list/?page=last&sort=bio_name'] * samples,
+        'search_employee': [
+            f"/humanresource/search_employee/?query={person['name'].split(',')[0][:4]}" for person in picks
+        ],
+        'employee_details': [f"/humanresource/employee-details/{person['employee_id']}/" for person in picks],
+    }
+
+
+def clear_caches():
+    from django.conf import settings
+    from django.core.cache import caches
+
+    caches[settings.HR_ATTENDANCE_CACHE].clear()
+    caches['template_fragments'].clear()
+
+
+def measure_pages(client, workforce, samples):
+    results = {}
+    for name, urls in page_requests(workforce, samples).items():
+        for mode in ('cold', 'warm'):
+            latencies, queries = [], []
+            for url in urls:
+                if mode == 'cold':
+                    clear_caches()
+                response, elapsed_ms, query_count = harness.timed_request(client, 'get', url)
+                if response.status_code != 200:
+                    raise RuntimeError(f"GET {url} returned HTTP {response.status_code}")
+                latencies.append(elapsed_ms)
+                queries.append(query_count)
+            results[f"{name}_{mode}"] = harness.summarize(latencies, queries)
+    return results
+
+
+def benchmark_size(client, employees, checkpoints, samples, start, seed):
+    from humanresource.deletion import clear_payroll_data
+    from humanresource.models import PayrollRecord
+    from humanresource.synthetic import Workforce, month_ranges
+
+    clear_payroll_data(remove_employees=True)
+    workforce = Workforce(employees, seed=seed)
+    uploads, measurements = [], {}
+
+    for months_loaded, (first_day, last_day) in enumerate(month_ranges(start, max(checkpoints)), start=1):
+        uploads.append(upload_month(client, workforce, first_day, last_day))
+        if months_loaded in checkpoints:
+            measurements[str(months_loaded)] = {
+                'payroll_records': PayrollRecord.objects.count(),
+                'pages': measure_pages(client, workforce, samples),
+            }
+            print(f"  {employees} employees x {months_loaded} month(s): "
+                  f"{measurements[str(months_loaded)]['payroll_records']} records measured")
+
+    total_rows = sum(upload['rows'] for upload in uploads)
+    total_ms = sum(upload['ms'] for upload in uploads)
+    return {
+        'upload': {
+            'files': len(uploads),
+            'rows': total_rows,
+            'total_ms': round(total_ms, 3),
+            'rows_per_second': round(total_rows / (total_ms / 1000), 1) if total_ms else 0.0,
+            'per_file': harness.summarize([upload['ms'] for upload in uploads], [upload['queries'] for upload in uploads]),
+            'files_detail': uploads,
+        },
+        'checkpoints': measurements,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--employees', type=int, nargs='+', default=list(DEFAULT_EMPLOYEES))
+    parser.add_argument('--months', type=int, nargs='+', default=list(DEFAULT_MONTHS), help='History lengths to measure at')
+    parser.add_argument('--samples', type=int, default=10, help='Requests per page and mode')
+    parser.add_argument('--start', default='2024-01-01', help='First generated month (YYYY-MM-DD)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='-', help="JSON results path ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    harness.setup_django()
+    from django.test import Client
+    from django.test.utils import override_settings
+    from navigation_app.models import UsersAccount
+
+    start = date.fromisoformat(args.start)
+    checkpoints = sorted(set(args.months))
+
+    results = {}
+    with harness.test_database(), override_settings(HR_BACKGROUND_WORKER='inline'):
+        UsersAccount.objects.create(username='bench_hr', password='bench', role='hr')
+        client = Client()
+        client.post('/', {'username': 'bench_hr', 'password': 'bench', 'role': 'hr'})
+        for employees in args.employees:
+            results[str(employees)] = benchmark_size(client, employees, checkpoints, args.samples, start, args.seed)
+            upload = results[str(employees)]['upload']
+            print(f"{employees:>6} employees: {upload['rows']} rows uploaded at {upload['rows_per_second']} rows/s")
+
+    harness.write_results(args.output, 'hr_suite', vars(args), results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Compare session/message backends on the HR login -> upload -> list flow.
+
+    python -m benchmarks.session_backends --iterations 30 --output results/sessions.json
+
+For each profile in settings.SESSION_PROFILES the flow is replayed with a fresh
+client, recording DB queries and latency per step. Background jobs run inline,
+so the upload step includes its follow-up work and no worker thread writes to
+the database while later steps are timed.
+"""
+import argparse
+
+from benchmarks import harness
+
+STEPS = ('login', 'upload', 'upload_page', 'employee_list')
+
+
+def run_flow(client, upload_bytes, iteration):
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    samples = {}
+    samples['login'] = harness.timed_request(
+        client, 'post', '/', data={'username': 'bench_hr', 'password': 'bench', 'role': 'hr'}
+    )
+    samples['upload'] = harness.timed_request(
+        client, 'post', '/humanresource/payroll-upload/',
+        data={'payroll_file': SimpleUploadedFile(f'bench_{iteration}.txt', upload_bytes)},
+    )
+    samples['upload_page'] = harness.timed_request(client, 'get', '/humanresource/payroll-upload/')
+    samples['employee_list'] = harness.timed_request(client, 'get', '/humanresource/employee-list/')
+    client.get('/logout/')
+    return samples
+
+
+def benchmark_profile(profile, iterations, upload_bytes):
+    from django.conf import settings
+    from django.test import Client
+    from django.test.utils import override_settings
+
+    config = settings.SESSION_PROFILES[profile]
+    latencies = {step: [] for step in STEPS + ('flow',)}
+    queries = {step: [] for step in STEPS + ('flow',)}
+
+    # A worker thread would compete with the timed requests (and lock sqlite under them)
+    with override_settings(**config, HR_BACKGROUND_WORKER='inline'):
+        client = Client() # New client -> middleware rebuilt with this profile's SessionStore
+        for iteration in range(iterations):
+            samples = run_flow(client, upload_bytes, iteration)
+            for step, (response, elapsed_ms, query_count) in samples.items():
+                if response.status_code >= 400:
+                    raise RuntimeError(f"{profile}/{step} returned HTTP {response.status_code}")
+                latencies[step].append(elapsed_ms)
+                queries[step].append(query_count)
+            latencies['flow'].append(sum(elapsed for _, elapsed, _ in samples.values()))
+            queries['flow'].append(sum(count for _, _, count in samples.values()))
+
+    return {step: harness.summarize(latencies[step], queries[step]) for step in latencies}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--employees', type=int, default=20, help='Employees in the uploaded file')
+    parser.add_argument('--profiles', nargs='*', help='Profiles to run (default: all in SESSION_PROFILES)')
+    parser.add_argument('--output', default='-', help="JSON results path ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    harness.setup_django()
+    from django.conf import settings
+    from navigation_app.models import UsersAccount
+
+    profiles = args.profiles or list(settings.SESSION_PROFILES)
+    upload_bytes = harness.sample_biolog(args.employees).encode()
+
+    results = {}
+    with harness.test_database():
+        UsersAccount.objects.create(username='bench_hr', password='bench', role='hr')
+        for profile in profiles:
+            results[profile] = benchmark_profile(profile, args.iterations, upload_bytes)
+            flow = results[profile]['flow']
+            print(f"{profile:>15}: {flow['queries_mean']:6.1f} queries/flow  p95 {flow['p95_ms']:8.2f} ms/flow")
+
+    harness.write_results(args.output, 'session_backends', vars(args), results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+import calendar
+from datetime import datetime, time, timedelta
+
+# Biometric device log codes
+CODE_MAP = {
+    '0': 'AM_IN', '1': 'AM_OUT',
+    '2': 'PM_IN', '3': 'PM_OUT',
+    '5': 'OT_IN', '6': 'OT_OUT',
+}
+OUT_CODES = ('1', '3', '6')
+
+
+# ----------------------------------------------------------------------
+# CALCULATION HELPERS
+# ----------------------------------------------------------------------
+
+def calculate_hours(time_in_str, time_out_str):
+    """
+    Calculates the time difference (timedelta) between two time strings ('HH:MM:SS').
+    Handles shifts that cross over midnight (time_out < time_in).
+    """
+    if not time_in_str or not time_out_str:
+        return timedelta(0)
+
+    TIME_FORMAT = '%H:%M:%S'
+    try:
+        # Convert time strings to datetime objects (using a dummy date)
+        dt_in = datetime.strptime(time_in_str, TIME_FORMAT)
+        dt_out = datetime.strptime(time_out_str, TIME_FORMAT)
+
+        # Check for Midnight Crossover (Graveyard Shift)
+        if dt_out < dt_in:
+            dt_out += timedelta(days=1)   # Add 24 hours to the OUT time
+
+        return dt_out - dt_in
+    except ValueError:
+        # Handles malformed time strings
+        return timedelta(0)
+
+
+def calculate_minutes_late(log_time_str, log_type):
+    if not log_time_str:
+        return 0
+
+    TIME_FORMAT = '%H:%M:%S'
+    try:
+        logged_dt = datetime.strptime(log_time_str, TIME_FORMAT)
+
+        # Define the grace period cut-off time (15 mins past standard)
+        if log_type == 'AM_IN':
+            grace_cut_off = time(8, 15, 0)
+        elif log_type == 'PM_IN':
+            grace_cut_off = time(16, 15, 0)
+        elif log_type == 'OT_IN':
+            grace_cut_off = time(0, 15, 0)
+        else:
+            return 0 # Only check IN logs
+
+        # Compare the time part of the log with the cut-off time
+        if logged_dt.time() > grace_cut_off:
+            # For simplicity and robust time arithmetic, convert the logged time
+            # and the cut-off time into full datetime objects (using a dummy date).
+            dummy_date = datetime(2000, 1, 1)
+            cut_off_dt = datetime.combine(dummy_date, grace_cut_off)
+
+            # The logged time is already a datetime object from the strptime call above
+
+            # Calculate the difference and convert to total minutes
+            late_delta = logged_dt - cut_off_dt
+
+            if late_delta > timedelta(0):
+                return int(late_delta.total_seconds() / 60)
+
+        return 0 # Not late
+
+    except ValueError:
+        return 0
+
+
+def _minutes_after(log_time_str, reference):
+    """Signed minutes from `reference` (a time) to the log time, wrapped into (-720, 720].
+
+    Wrapping keeps shifts that cross midnight right: an IN at 23:50 for a 00:00
+    start is 10 minutes early, not 23 hours 50 minutes late.
+    """
+    try:
+        logged = datetime.strptime(log_time_str, '%H:%M:%S')
+    except (TypeError, ValueError):
+        return None
+    minutes = (logged.hour * 60 + logged.minute) - (reference.hour * 60 + reference.minute)
+    minutes %= 1440
+    return minutes - 1440 if minutes > 720 else minutes
+
+
+def scheduled_minutes_late(log_time_str, schedule):
+    """Minutes past the schedule's start plus grace (0 when on time or unreadable)."""
+    minutes = _minutes_after(log_time_str, schedule.start_time) if log_time_str else None
+    if minutes is None or minutes <= schedule.grace_minutes:
+        return 0
+    return minutes - schedule.grace_minutes
+
+
+def scheduled_minutes_undertime(log_time_str, schedule):
+    """Minutes the OUT falls before the schedule's end (0 when at or after it)."""
+    minutes = _minutes_after(log_time_str, schedule.end_time) if log_time_str else None
+    if minutes is None or minutes >= 0:
+        return 0
+    return -minutes
+
+
+# ----------------------------------------------------------------------
+# PAY PERIODS
+# ----------------------------------------------------------------------
+
+def cutoff_period(day):
+    """Semi-monthly cut-off (1st-15th or 16th-end of month) containing `day`."""
+    if day.day <= 15:
+        return day.replace(day=1), day.replace(day=15)
+    last_day = calendar.monthrange(day.year, day.month)[1]
+    return day.replace(day=16), day.replace(day=last_day)
+
+
+def log_window(start_date, end_date):
+    """Dates of raw logs needed to compute [start_date, end_date] exactly.
+
+    One day of look-back lets an OUT on start_date close a shift that began the
+    day before; one day of look-ahead lets a night shift on end_date close.
+    """
+    return start_date - timedelta(days=1), end_date + timedelta(days=1)
+
+
+# ----------------------------------------------------------------------
+# DAILY SUMMARY
+# ----------------------------------------------------------------------
+
+def build_daily_summary(logs, start_date=None, end_date=None, schedule_for=None):
+    """Group one employee's logs into per-day shift totals.
+
+    `logs` is an iterable of (log_code, log_date, log_time) tuples sorted by date
+    and time. When a date range is given, days outside it (the look-back and
+    look-ahead days) are dropped after attribution. Returns the days sorted
+    newest first.
+
+    schedule_for(day) returns the rostered ShiftSchedule for a day, or None (see
+    roster.RosterIndex.schedule_for). On rostered days lateness is measured from
+    the first regular IN against the schedule's start and undertime from the
+    last regular OUT against its end; other days keep the fixed 08:00 / 16:00 /
+    00:00 cut-offs and no undertime.
+    """
+    daily_summary = {}
+
+    # --- Step 1: Initialize, Group, and Handle Cross-Midnight Attribution ---
+    for log_code, log_date_obj, log_time in logs:
+        log_type = CODE_MAP.get(log_code)
+        current_date_key = log_date_obj
+
+        # --- A. Cross-Midnight Attribution Logic ---
+        if log_code in OUT_CODES:
+            previous_day_key = log_date_obj - timedelta(days=1)
+
+            if previous_day_key in daily_summary:
+                prev_data = daily_summary[previous_day_key]
+
+                # Check for open AM shift
+                if (log_code == '1' or log_code == '3') and prev_data.get('AM_IN') and not prev_data.get(CODE_MAP.get(log_code)):
+                    current_date_key = previous_day_key
+
+                # Check for open PM shift
+                elif (log_code == '3' or log_code == '1') and prev_data.get('PM_IN') and not prev_data.get(CODE_MAP.get(log_code)):
+                    current_date_key = previous_day_key
+
+                # Check for open OT shift
+                elif log_code == '6' and prev_data.get('OT_IN') and not prev_data.get('OT_OUT'):
+                    current_date_key = previous_day_key
+
+        # --- B. Initialize Daily Summary Entry ---
+        if current_date_key not in daily_summary:
+            daily_summary[current_date_key] = {
+                'date': current_date_key,
+                'AM_IN': None, 'AM_OUT': None,
+                'PM_IN': None, 'PM_OUT': None,
+                'OT_IN': None, 'OT_OUT': None,
+                'total_hours': timedelta(0),
+                'day_shift_hours': timedelta(0),
+                'night_shift_hours': timedelta(0),
+                'graveyard_shift_hours': timedelta(0),
+                'ot_hours': timedelta(0),
+                'total_minutes_late': 0,
+                'undertime_minutes': 0,
+                'schedule': None,
+            }
+
+        # --- C. Store Log Time ---
+        if log_type and not daily_summary[current_date_key][log_type]:
+            daily_summary[current_date_key][log_type] = log_time
+
+    # --- Step 2: Shift Totals ---
+    for data in daily_summary.values():
+        day_shift_delta = timedelta(0)
+        night_shift_delta = timedelta(0)
+        graveyard_shift_delta = timedelta(0)
+
+        # 1. Day Shift: AM_IN (0) to PM_OUT (3)
+        if data.get('AM_IN') and data.get('PM_OUT'):
+            day_shift_delta = calculate_hours(data.get('AM_IN'), data.get('PM_OUT'))
+
+        # 2. Night Shift: PM_IN (2) to PM_OUT (3)
+        elif data.get('PM_IN') and data.get('PM_OUT'):
+            night_shift_delta = calculate_hours(data.get('PM_IN'), data.get('PM_OUT'))
+
+        # 3. Graveyard Shift (AM portion): AM_IN (0) to AM_OUT (1)
+        elif data.get('AM_IN') and data.get('AM_OUT'):
+            graveyard_shift_delta = calculate_hours(data.get('AM_IN'), data.get('AM_OUT'))
+
+        # --- Overtime (5 -> 6) ---
+        ot_delta = calculate_hours(data.get('OT_IN'), data.get('OT_OUT'))
+
+        # Store the breakdown in the dictionary
+        data['day_shift_hours'] = day_shift_delta
+        data['night_shift_hours'] = night_shift_delta
+        data['graveyard_shift_hours'] = graveyard_shift_delta
+        data['ot_hours'] = ot_delta
+
+        # Calculate the GRAND TOTAL (Day + Night + Graveyard + OT)
+        data['total_hours'] = day_shift_delta + night_shift_delta + graveyard_shift_delta + ot_delta
+
+        # --- LATE CALCULATION ---
+        schedule = schedule_for(data['date']) if schedule_for else None
+        if schedule is not None:
+            data['schedule'] = schedule.name
+            data['total_minutes_late'] = scheduled_minutes_late(data.get('AM_IN') or data.get('PM_IN'), schedule)
+            data['undertime_minutes'] = scheduled_minutes_undertime(data.get('PM_OUT') or data.get('AM_OUT'), schedule)
+            continue
+
+        am_late = calculate_minutes_late(data.get('AM_IN'), 'AM_IN')
+        pm_late = calculate_minutes_late(data.get('PM_IN'), 'PM_IN')
+        ot_late = calculate_minutes_late(data.get('OT_IN'), 'OT_IN')
+
+        data['total_minutes_late'] = am_late + pm_late + ot_late
+
+    days = daily_summary.values()
+    if start_date is not None and end_date is not None:
+        days = [data for data in days if start_date <= data['date'] <= end_date]
+
+    # Sort by date descending for display
+    return sorted(days, key=lambda x: x['date'], reverse=True)
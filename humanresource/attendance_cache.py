@@ -0,0 +1,82 @@
+"""Versioned cache of per-employee, per-period attendance summaries.
+
+Keys embed the 'attendance' DataVersion, which uploads, deletions and profile
+edits bump, and the employee's summary revision, which punch corrections bump.
+A bump makes every older key unreachable, so invalidation is exact and entries
+never need a TTL; stale entries simply age out of the cache.
+
+The DataVersion helpers take a name, so other derived data (the typeahead
+index) can keep a version row of its own.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F
+from django.utils import timezone
+
+from .models import DataVersion
+
+ATTENDANCE_VERSION = 'attendance'
+HITS_KEY = 'hr:attendance:hits'
+MISSES_KEY = 'hr:attendance:misses'
+
+
+def _cache():
+    return caches[getattr(settings, 'HR_ATTENDANCE_CACHE', 'default')]
+
+
+def get_data_version(name=ATTENDANCE_VERSION):
+    return DataVersion.objects.filter(name=name).values_list('version', flat=True).first() or 0
+
+
+def get_data_stamp(name=ATTENDANCE_VERSION):
+    """(version, updated_at) in one query; updated_at is the time of the latest upload, delete or edit."""
+    return DataVersion.objects.filter(name=name).values_list('version', 'updated_at').first() or (0, None)
+
+
+def bump_data_version(name=ATTENDANCE_VERSION):
+    """Invalidate everything cached against the current version."""
+    updated = DataVersion.objects.filter(name=name).update(version=F('version') + 1, updated_at=timezone.now())
+    if not updated:
+        DataVersion.objects.get_or_create(name=name, defaults={'version': 1})
+
+
+def _count(key):
+    cache = _cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+def get_daily_summary(employee_id, start_date, end_date, compute, revision=0):
+    """Return compute() for this employee and period, cached until the next data change.
+
+    revision is the employee's PayrollEmployeeSummary.revision, so a punch
+    correction only invalidates that employee's entries.
+    """
+    key = f'hr:attendance:v{get_data_version()}:r{revision}:{employee_id}:{start_date:%Y%m%d}:{end_date:%Y%m%d}'
+    cache = _cache()
+    summary = cache.get(key)
+    if summary is not None:
+        _count(HITS_KEY)
+        return summary
+
+    _count(MISSES_KEY)
+    summary = compute()
+    cache.set(key, summary, timeout=None)
+    return summary
+
+
+def stats():
+    """Hit/miss counters for the admin dashboard (per cache, not per process, with a shared backend)."""
+    cache = _cache()
+    hits = cache.get(HITS_KEY) or 0
+    misses = cache.get(MISSES_KEY) or 0
+    total = hits + misses
+    return {
+        'version': get_data_version(),
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits * 100 / total, 1) if total else 0,
+    }
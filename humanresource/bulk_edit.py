@@ -0,0 +1,236 @@
+"""Bulk edits of department, section, position and rates across many Employee profiles.
+
+A change set is validated once and recorded as an EmployeeBulkEdit with its
+effective date. When that date has come, the edit is applied with at most two
+writes, whatever the number of employees:
+
+    same value for everyone (department, section, position, a new rate) -- one QuerySet.update
+    percentage rate changes (monthly_daily_rate, hourly_rate)            -- one bulk_update of the
+                                                                           rates computed per employee
+
+The values before and after are saved as EmployeeBulkEditChange rows (one
+bulk insert). Afterwards the search index for the edited employees is rebuilt
+in one batch, the data version is bumped, and employee_profiles_changed is
+sent once.
+"""
+import logging
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from . import attendance_cache, typeahead
+from .models import Employee, EmployeeBulkEdit, EmployeeBulkEditChange, EmployeeMapping
+from .search import SEARCH_FIELDS, index_employees
+from .signals import employee_profiles_changed
+
+ORGANIZATION_FIELDS = ('department', 'section', 'position')
+RATE_FIELDS = ('monthly_daily_rate', 'hourly_rate')
+BULK_EDIT_FIELDS = ORGANIZATION_FIELDS + RATE_FIELDS
+SELECTION_FILTERS = ('department', 'section', 'position', 'status')
+MAX_SELECTION = 5000
+CENTS = Decimal('0.01')
+
+logger = logging.getLogger(__name__)
+
+
+class BulkEditError(Exception):
+    """The change set or the selection is not valid, or the edit can no longer be changed."""
+
+
+# ----------------------------------------------------------------------
+# SELECTION & VALIDATION
+# ----------------------------------------------------------------------
+
+def select_employees(filters=None, payroll_employee_ids=None, employee_ids=None):
+    """Employees matching exact filters (SELECTION_FILTERS) and/or explicit payroll IDs or pks."""
+    employees = Employee.objects.all()
+    for name, value in (filters or {}).items():
+        if name in SELECTION_FILTERS and value:
+            employees = employees.filter(**{name: value})
+    if payroll_employee_ids:
+        employees = employees.filter(mapping__payroll_employee_id__in=list(payroll_employee_ids))
+    if employee_ids:
+        employees = employees.filter(pk__in=list(employee_ids))
+    return employees
+
+
+def describe_selection(filters=None, payroll_employee_ids=None, employee_ids=None):
+    parts = [f"{name}={value}" for name, value in (filters or {}).items() if name in SELECTION_FILTERS and value]
+    if payroll_employee_ids:
+        parts.append(f"{len(payroll_employee_ids)} payroll ID(s)")
+    if employee_ids:
+        parts.append(f"{len(employee_ids)} selected")
+    return ', '.join(parts) or 'all employees'
+
+
+def _check_rate(name, amount):
+    """Raise BulkEditError unless amount (rounded to cents) fits the rate column's max_digits."""
+    model_field = Employee._meta.get_field(name)
+    limit = Decimal(10) ** (model_field.max_digits - model_field.decimal_places)
+    # Compare before rounding too: quantize fails outright on huge values
+    if abs(amount) >= limit or abs(amount.quantize(CENTS)) >= limit:
+        raise BulkEditError(f"{model_field.verbose_name}: {amount} is too large (the most is {limit - CENTS}).")
+
+
+def parse_changes(data):
+    """Validate {field: value or {'op', 'value'}} into {field: {'op': ..., 'value': str}}.
+
+    Blank values are dropped. Rates accept a new amount or, with op 'percent',
+    a percentage change such as '5' or '-2.5'.
+    """
+    changes = {}
+    for name, spec in data.items():
+        if name not in BULK_EDIT_FIELDS:
+            raise BulkEditError(f"{name!r} cannot be bulk edited; use one of {', '.join(BULK_EDIT_FIELDS)}.")
+        op, value = (spec.get('op', 'set'), spec.get('value')) if isinstance(spec, dict) else ('set', spec)
+        value = str(value).strip() if value is not None else ''
+        if not value:
+            continue
+        label = Employee._meta.get_field(name).verbose_name
+
+        if name in ORGANIZATION_FIELDS:
+            if op != 'set':
+                raise BulkEditError(f"{label} can only be set to a new value.")
+            if len(value) > Employee._meta.get_field(name).max_length:
+                raise BulkEditError(f"{label} is too long.")
+        else:
+            if op not in ('set', 'percent'):
+                raise BulkEditError(f"Unknown change {op!r} for {label}.")
+            try:
+                amount = Decimal(value)
+            except InvalidOperation:
+                raise BulkEditError(f"{label}: {value!r} is not a number.")
+            if not amount.is_finite(): # NaN and Infinity
+                raise BulkEditError(f"{label}: {value!r} is not a number.")
+            if op == 'set' and amount < 0:
+                raise BulkEditError(f"{label} cannot be negative.")
+            if op == 'percent' and amount <= -100:
+                raise BulkEditError(f"{label} cannot drop by 100% or more.")
+            _check_rate(name, amount)
+            value = str(amount)
+        changes[name] = {'op': op, 'value': value}
+
+    if not changes:
+        raise BulkEditError("Enter at least one change.")
+    return changes
+
+
+# ----------------------------------------------------------------------
+# EDITS
+# ----------------------------------------------------------------------
+
+def create_bulk_edit(employees, changes, effective_date, created_by, description=''):
+    """Record a bulk edit for a queryset of employees and apply it when it is already effective."""
+    changes = parse_changes(changes)
+    employee_ids = list(employees.order_by('pk').values_list('pk', flat=True)[:MAX_SELECTION + 1])
+    if not employee_ids:
+        raise BulkEditError("No employees match the selection.")
+    if len(employee_ids) > MAX_SELECTION:
+        raise BulkEditError(f"Select at most {MAX_SELECTION} employees per bulk edit.")
+
+    # The highest current rate gives the highest result of a percentage change
+    adjusted = [name for name, spec in changes.items() if name in RATE_FIELDS and spec['op'] == 'percent']
+    if adjusted:
+        highest = Employee.objects.filter(pk__in=employee_ids).aggregate(**{name: Max(name) for name in adjusted})
+        for name in adjusted:
+            if highest[name] is not None:
+                _check_rate(name, _rate(highest[name], changes[name]))
+
+    edit = EmployeeBulkEdit.objects.create(
+        effective_date=effective_date or timezone.localdate(), changes=changes, employee_ids=employee_ids,
+        employee_count=len(employee_ids), description=description[:255], created_by=created_by,
+    )
+    if edit.effective_date <= timezone.localdate():
+        apply_bulk_edit(edit.pk)
+        edit.refresh_from_db()
+    return edit
+
+
+def _rate(current, spec):
+    if spec['op'] == 'set':
+        return Decimal(spec['value']).quantize(CENTS)
+    if current is None:
+        return None # No rate to adjust
+    return (Decimal(current) * (100 + Decimal(spec['value'])) / 100).quantize(CENTS)
+
+
+def _text(value):
+    return None if value is None else str(value)
+
+
+def apply_bulk_edit(edit_id):
+    """Apply a scheduled edit: one write per field group plus the audit rows; returns the edit."""
+    with transaction.atomic():
+        edit = EmployeeBulkEdit.objects.select_for_update().get(pk=edit_id)
+        if edit.status != 'scheduled':
+            raise BulkEditError(f"This bulk edit is {edit.get_status_display().lower()}.")
+
+        fields = list(edit.changes)
+        employees = list(Employee.objects.filter(pk__in=edit.employee_ids).only('pk', *fields))
+        selection = Employee.objects.filter(pk__in=[employee.pk for employee in employees])
+        audit = []
+
+        organization = {name: edit.changes[name]['value'] for name in fields if name in ORGANIZATION_FIELDS}
+        fixed_rates = {name: _rate(None, edit.changes[name]) for name in fields if name in RATE_FIELDS and edit.changes[name]['op'] == 'set'}
+        adjusted_rates = [name for name in fields if name in RATE_FIELDS and edit.changes[name]['op'] == 'percent']
+
+        for employee in employees:
+            for name in fields:
+                old = getattr(employee, name)
+                new = organization.get(name, fixed_rates.get(name)) if name not in adjusted_rates else _rate(old, edit.changes[name])
+                if new is not None and name in adjusted_rates:
+                    _check_rate(name, new) # Rates may have grown since the edit was scheduled
+                if _text(old) != _text(new):
+                    audit.append(EmployeeBulkEditChange(
+                        bulk_edit=edit, employee=employee, field=name, old_value=_text(old), new_value=_text(new),
+                    ))
+                setattr(employee, name, new)
+
+        if organization or fixed_rates:
+            selection.update(**organization, **fixed_rates)
+        if adjusted_rates:
+            Employee.objects.bulk_update(employees, adjusted_rates, batch_size=500)
+        EmployeeBulkEditChange.objects.bulk_create(audit, batch_size=1000)
+
+        edit.status = 'applied'
+        edit.applied_at = timezone.now()
+        edit.employee_count = len(employees)
+        edit.save(update_fields=['status', 'applied_at', 'employee_count'])
+
+        if any(name in SEARCH_FIELDS for name in fields):
+            index_employees(Employee.objects.filter(pk__in=[employee.pk for employee in employees]).only('pk', *SEARCH_FIELDS))
+
+    typeahead.invalidate_index()
+    attendance_cache.bump_data_version()
+    payroll_ids = set(
+        EmployeeMapping.objects.filter(employee_id__in=[employee.pk for employee in employees])
+        .values_list('payroll_employee_id', flat=True)
+    )
+    if payroll_ids:
+        employee_profiles_changed.send(sender=Employee, payroll_employee_ids=payroll_ids)
+    return edit
+
+
+def apply_due_bulk_edits(today=None):
+    """Apply every scheduled edit whose effective date has come, oldest first; returns how many.
+
+    An edit that can no longer be applied stays scheduled (and is logged) without holding up the rest.
+    """
+    due = EmployeeBulkEdit.objects.filter(status='scheduled', effective_date__lte=today or timezone.localdate())
+    applied = 0
+    for edit_id in due.order_by('effective_date', 'id').values_list('pk', flat=True):
+        try:
+            apply_bulk_edit(edit_id)
+        except BulkEditError as e:
+            logger.warning("Bulk edit %s was not applied: %s", edit_id, e)
+            continue
+        applied += 1
+    return applied
+
+
+def cancel_bulk_edit(edit_id):
+    cancelled = EmployeeBulkEdit.objects.filter(pk=edit_id, status='scheduled').update(status='cancelled')
+    if not cancelled:
+        raise BulkEditError("Only scheduled bulk edits can be cancelled.")
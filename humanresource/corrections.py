@@ -0,0 +1,155 @@
+"""Manual punch corrections (PunchCorrection) and their read-time overlay.
+
+Raw PayrollRecords are never changed. Every reader of the logs (the details
+page, the accounting rollups and pay runs, the timekeeper scanner and
+latest-punch index) passes an employee's (log_code, log_date, log_time) rows
+through apply_corrections. Adding or revoking a correction only bumps that
+employee's PayrollEmployeeSummary.revision and sends attendance_corrected
+with the affected dates. Receivers then recompute that employee and those
+days only; nothing is re-ingested.
+"""
+from collections import Counter
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .attendance import CODE_MAP
+from .models import PayrollEmployeeSummary, PayrollRecord, PunchCorrection
+from .signals import attendance_corrected
+
+
+class CorrectionError(Exception):
+    """The correction cannot be applied (unknown punch, bad values, already revoked)."""
+
+
+# ----------------------------------------------------------------------
+# OVERLAY
+# ----------------------------------------------------------------------
+
+def load_corrections(employee_ids, start_date, end_date):
+    """{payroll ID: [active PunchCorrection, ...]} touching [start_date, end_date] (one query).
+
+    employee_ids=None loads every employee's corrections for the window.
+    """
+    active = PunchCorrection.objects.filter(
+        Q(log_date__range=(start_date, end_date)) | Q(original_date__range=(start_date, end_date)),
+        revoked_at__isnull=True,
+    )
+    if employee_ids is not None:
+        active = active.filter(payroll_employee_id__in=list(employee_ids))
+    corrections = {}
+    for correction in active.order_by('created_at', 'id'):
+        corrections.setdefault(correction.payroll_employee_id, []).append(correction)
+    return corrections
+
+
+def apply_corrections(logs, corrections):
+    """Merge corrections into one employee's (log_code, log_date, log_time) rows; returns them sorted.
+
+    Each void/adjust hides one matching punch (raw or added); adds and
+    adjustments contribute their new punch.
+    """
+    if not corrections:
+        return logs
+    hidden = Counter()
+    added = []
+    for correction in corrections:
+        if correction.action in ('void', 'adjust'):
+            hidden[(correction.original_code, correction.original_date, correction.original_time)] += 1
+        if correction.action in ('add', 'adjust'):
+            added.append((correction.log_code, correction.log_date, correction.log_time))
+
+    merged = []
+    for row in list(logs) + added:
+        key = tuple(row)
+        if hidden[key]:
+            hidden[key] -= 1
+            continue
+        merged.append(row)
+    merged.sort(key=lambda row: (row[1], row[2]))
+    return merged
+
+
+def corrected_logs(employee_id, logs, start_date, end_date, revision):
+    """apply_corrections for one employee; skips the lookup when the employee was never corrected.
+
+    revision is never 0 for a corrected employee: refresh_payroll_summaries
+    restores it when a deleted summary row is recreated.
+    """
+    if not revision:
+        return logs
+    return apply_corrections(logs, load_corrections([employee_id], start_date, end_date).get(employee_id))
+
+
+# ----------------------------------------------------------------------
+# CHANGES
+# ----------------------------------------------------------------------
+
+def _punch_exists(employee_id, code, day, time):
+    if PayrollRecord.objects.filter(employee_id=employee_id, log_code=code, log_date=day, log_time=time).exists():
+        return True
+    return PunchCorrection.objects.filter(
+        payroll_employee_id=employee_id, revoked_at__isnull=True,
+        action__in=('add', 'adjust'), log_code=code, log_date=day, log_time=time,
+    ).exists()
+
+
+def _bump_revision(correction):
+    PayrollEmployeeSummary.objects.filter(payroll_employee_id=correction.payroll_employee_id).update(revision=F('revision') + 1)
+
+
+def _notify(correction):
+    """Tell subscribers which employee and days to recompute."""
+    dates = [day for day in (correction.log_date, correction.original_date) if day]
+    attendance_corrected.send(
+        sender=PunchCorrection, payroll_employee_id=correction.payroll_employee_id,
+        start_date=min(dates), end_date=max(dates),
+    )
+
+
+def add_correction(employee_id, action, reason, created_by, original=None, punch=None):
+    """Record a correction. original and punch are (log_code, log_date, 'HH:MM:SS') tuples."""
+    if action not in dict(PunchCorrection.ACTION_CHOICES):
+        raise CorrectionError(f"Unknown correction action {action!r}.")
+    if not reason:
+        raise CorrectionError("A reason is required for every correction.")
+    if action in ('void', 'adjust'):
+        if not original or not _punch_exists(employee_id, *original):
+            raise CorrectionError("The punch to correct was not found.")
+    if action in ('add', 'adjust'):
+        if not (punch and all(punch)):
+            raise CorrectionError("Enter the code, date and time of the corrected punch.")
+        if punch[0] not in CODE_MAP:
+            raise CorrectionError(f"Log code {punch[0]!r} is not one of {', '.join(sorted(CODE_MAP))}.")
+        try:
+            datetime.strptime(punch[2], '%H:%M:%S')
+        except ValueError:
+            raise CorrectionError("Enter the time as HH:MM:SS.")
+
+    correction = PunchCorrection(payroll_employee_id=employee_id, action=action, reason=reason, created_by=created_by)
+    if action in ('void', 'adjust'):
+        correction.original_code, correction.original_date, correction.original_time = original
+    if action in ('add', 'adjust'):
+        correction.log_code, correction.log_date, correction.log_time = punch
+
+    with transaction.atomic():
+        correction.save()
+        _bump_revision(correction)
+    _notify(correction)
+    return correction
+
+
+def revoke_correction(correction_id, revoked_by, reason=''):
+    with transaction.atomic():
+        correction = PunchCorrection.objects.select_for_update().get(pk=correction_id)
+        if correction.revoked_at is not None:
+            raise CorrectionError("This correction was already revoked.")
+        correction.revoked_by = revoked_by
+        correction.revoked_at = timezone.now()
+        correction.revoke_reason = reason
+        correction.save(update_fields=['revoked_by', 'revoked_at', 'revoke_reason'])
+        _bump_revision(correction)
+    _notify(correction)
+    return correction
@@ -0,0 +1,171 @@
+"""Chunked deletion of PayrollRecord rows.
+
+Deleting an upload used to let Django's cascade collect every PayrollRecord
+primary key and delete them in one long transaction. Here the rows are removed
+in bounded primary-key ranges, each in its own short transaction, so other users
+keep reading and writing between batches. Full clears TRUNCATE the tables that
+nothing else points at instead of deleting them row by row.
+"""
+from datetime import date
+
+from django.core.management.color import no_style
+from django.db import connection
+from django.db.models import Count, Max, Min
+from django.utils import timezone
+
+from . import attendance_cache, typeahead
+from .models import (
+    CSVUploadHistory, DeletionJob, Employee, EmployeeMapping, EmployeeSearchToken,
+    PayrollEmployeeSummary, PayrollRecord,
+)
+from .signals import payroll_deleted
+from .summaries import refresh_payroll_summaries
+
+DELETE_BATCH_SIZE = 5000
+
+
+def deletion_scope(history_id):
+    """What deleting an upload touches, read before its first DELETE.
+
+    {'employee_ids', 'first_log', 'last_log', 'total'} in JSON-ready form, so a
+    DeletionJob can keep it: once some batches are gone the remaining rows no
+    longer tell which payroll IDs and days the upload covered.
+    """
+    records = PayrollRecord.objects.filter(upload_history_id=history_id).order_by()
+    bounds = records.aggregate(first_log=Min('log_date'), last_log=Max('log_date'), total=Count('pk'))
+    return {
+        'employee_ids': sorted(set(records.values_list('employee_id', flat=True).distinct())),
+        'first_log': bounds['first_log'].isoformat() if bounds['first_log'] else None,
+        'last_log': bounds['last_log'].isoformat() if bounds['last_log'] else None,
+        'total': bounds['total'],
+    }
+
+
+def delete_upload_records(history_id, batch_size=DELETE_BATCH_SIZE, progress=None, scope=None):
+    """Delete one upload's PayrollRecords in PK-range batches, then the upload itself.
+
+    scope is the deletion_scope() taken before the first batch; pass the saved
+    one to resume an interrupted deletion (run_deletion_job does), otherwise
+    the summaries and receivers of IDs already deleted are never refreshed.
+    `progress(deleted, total)` is called after every batch, counting rows
+    deleted by earlier runs too. Returns the number of PayrollRecords deleted
+    in all runs.
+    """
+    scope = scope or deletion_scope(history_id)
+    records = PayrollRecord.objects.filter(upload_history_id=history_id)
+    bounds = records.order_by().aggregate(low=Min('pk'), high=Max('pk'), remaining=Count('pk'))
+    total = scope['total']
+    deleted = max(total - bounds['remaining'], 0) # By an earlier, interrupted run
+
+    if bounds['low'] is not None:
+        low = bounds['low']
+        while low <= bounds['high']:
+            high = low + batch_size
+            # No signals or dependents on PayrollRecord, so this is a single DELETE ... WHERE
+            count, _ = records.filter(pk__gte=low, pk__lt=high).delete()
+            deleted += count
+            low = high
+            if progress:
+                progress(deleted, total)
+
+    affected_ids = set(scope['employee_ids'])
+    CSVUploadHistory.objects.filter(pk=history_id).delete()
+    refresh_payroll_summaries(affected_ids)
+    typeahead.invalidate_index()
+    attendance_cache.bump_data_version()
+    if affected_ids:
+        payroll_deleted.send(
+            sender=CSVUploadHistory, history_id=history_id, employee_ids=affected_ids,
+            start_date=date.fromisoformat(scope['first_log']), end_date=date.fromisoformat(scope['last_log']),
+        )
+    return deleted
+
+
+def run_deletion_job(job_id, batch_size=DELETE_BATCH_SIZE, progress=None):
+    """Process (or resume) one DeletionJob, recording progress on the job row after each batch."""
+    job = DeletionJob.objects.get(pk=job_id)
+    if job.status == 'done':
+        return job
+
+    job.status = 'running'
+    if job.scope is None:
+        # Saved before anything is deleted, so a resumed run still sees the whole upload
+        job.scope = deletion_scope(job.upload_history_id)
+        job.total_records = job.scope['total']
+    job.save(update_fields=['status', 'scope', 'total_records'])
+
+    def record_progress(deleted, total):
+        DeletionJob.objects.filter(pk=job.pk).update(deleted_records=deleted)
+        if progress:
+            progress(deleted, total)
+
+    try:
+        job.deleted_records = delete_upload_records(job.upload_history_id, batch_size, record_progress, job.scope)
+        job.status = 'done'
+    except Exception as e:
+        job.status = 'failed'
+        job.error = str(e)
+        raise
+    finally:
+        if job.status != 'done':
+            # Failed or interrupted: keep the progress the batches recorded
+            job.deleted_records = DeletionJob.objects.values_list('deleted_records', flat=True).get(pk=job.pk)
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'deleted_records', 'error', 'finished_at'])
+    return job
+
+
+def pending_deletion_history_ids():
+    return set(
+        DeletionJob.objects.filter(status__in=['queued', 'running']).values_list('upload_history_id', flat=True)
+    )
+
+
+def _dependents(model):
+    """Models with a foreign key to model (the through tables of many-to-many relations)."""
+    return {rel.through if rel.many_to_many else rel.related_model for rel in model._meta.related_objects}
+
+
+def truncate_models(*models):
+    """Empty whole tables: TRUNCATE where that is safe, the ORM's cascading delete otherwise.
+
+    The flush statements switch foreign-key checks off on MySQL, so a table is
+    only truncated when every table pointing at it is emptied in the same call.
+    A table that other tables point at is emptied with QuerySet.delete() after
+    the truncates, so their on_delete rules (CASCADE, SET_NULL, PROTECT) apply.
+    """
+    emptied = set(models)
+    truncated = [model for model in models if _dependents(model) <= emptied]
+    if truncated:
+        tables = [model._meta.db_table for model in truncated]
+        # Without reset_sequences MySQL gets DELETE FROM, not TRUNCATE
+        connection.ops.execute_sql_flush(connection.ops.sql_flush(no_style(), tables, reset_sequences=True))
+    for model in models:
+        if model not in truncated:
+            model.objects.all().delete()
+
+
+def clear_payroll_data(remove_employees=False):
+    """Fast path for wiping all uploads (and optionally all HR profiles).
+
+    Employee is deleted through the ORM (see truncate_models): bulk edit audit
+    rows, mapping suggestions and accounting rows point at it.
+
+    Returns (payroll_count, history_count, employee_count) as they were before the flush.
+    """
+    counts = (PayrollRecord.objects.count(), CSVUploadHistory.objects.count())
+    truncate_models(PayrollRecord, CSVUploadHistory)
+
+    employee_count = 0
+    if remove_employees:
+        employee_count = Employee.objects.count()
+        truncate_models(EmployeeSearchToken, EmployeeMapping, PayrollEmployeeSummary, Employee)
+    else:
+        # Only summaries of still-mapped HR profiles survive a clear
+        refresh_payroll_summaries(PayrollEmployeeSummary.objects.values_list('payroll_employee_id', flat=True))
+
+    DeletionJob.objects.filter(status__in=['queued', 'running']).update(status='done', finished_at=timezone.now())
+    typeahead.invalidate_index()
+    attendance_cache.bump_data_version()
+    payroll_deleted.send(sender=CSVUploadHistory, history_id=None, employee_ids=None, start_date=None, end_date=None)
+    return counts + (employee_count,)
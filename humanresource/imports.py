@@ -0,0 +1,252 @@
+"""Bulk import of Employee master data from CSV or XLSX.
+
+One row per payroll ID. The payroll ID column is required, and every other
+column is an Employee field, named by field name or verbose name. A payroll
+ID that is already mapped updates its Employee; any other creates an Employee
+and its EmployeeMapping. Only the columns in the file are written, and a
+blank cell leaves the current value unchanged. Rows are validated with
+Model.clean_fields, which runs no queries. A row that fails is reported with
+its line number and skipped; the other rows are still imported.
+
+Rows are written IMPORT_BATCH_SIZE at a time, each batch in one transaction:
+one lookup of the existing mappings, bulk_create for new profiles and
+mappings, bulk_update for the changed columns of existing profiles, then the
+summary links and search index for the batch. On backends that cannot return
+primary keys from a bulk insert (MySQL), new profiles are inserted one by one
+inside the batch transaction so their mappings can point at them.
+
+XLSX needs openpyxl, which is imported only when an .xlsx file is read.
+"""
+import csv
+import io
+import re
+from dataclasses import dataclass, field
+
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+
+from . import attendance_cache, typeahead
+from .models import Employee, EmployeeMapping
+from .search import index_employees
+from .summaries import link_payroll_summaries
+from .signals import employee_profiles_changed
+
+IMPORT_BATCH_SIZE = 500
+PAYROLL_ID_COLUMNS = ('payroll_employee_id', 'payroll_id', 'employee_id', 'id_no')
+REQUIRED_FOR_NEW = ('first_name', 'last_name', 'department')
+MAX_REPORTED_ERRORS = 1000
+
+# Every Employee field a file may set
+IMPORT_FIELDS = [
+    model_field for model_field in Employee._meta.concrete_fields
+    if not model_field.primary_key and model_field.name != 'created_at'
+]
+
+
+class EmployeeImportError(Exception):
+    """The file as a whole cannot be imported (unreadable, no payroll ID column...)."""
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    created: int = 0
+    updated: int = 0
+    errors: list = field(default_factory=list) # (line, payroll ID, message)
+    error_count: int = 0
+
+    def add_error(self, line, payroll_id, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, payroll_id, message))
+
+
+def _header_key(text):
+    return re.sub(r'[^a-z0-9]+', '_', str(text or '').strip().lower()).strip('_')
+
+
+HEADER_ALIASES = {}
+for _field in IMPORT_FIELDS:
+    HEADER_ALIASES[_header_key(_field.name)] = _field.name
+    HEADER_ALIASES[_header_key(_field.verbose_name)] = _field.name
+
+
+def normalize_payroll_id(value):
+    """Payroll IDs are zero-padded to 9 digits in the device logs ('35' -> '000000035')."""
+    text = str(value if value is not None else '').strip()
+    if text.endswith('.0') and text[:-2].isdigit():
+        text = text[:-2] # Numeric XLSX cell
+    return text.zfill(9) if text.isdigit() else text
+
+
+# ----------------------------------------------------------------------
+# READING
+# ----------------------------------------------------------------------
+
+def read_rows(file, filename):
+    """Yield (line number, header, values) for each data row of a .csv or .xlsx file."""
+    if filename.lower().endswith('.xlsx'):
+        rows = _xlsx_rows(file)
+    else:
+        text = io.TextIOWrapper(file, encoding='utf-8-sig', newline='') if not isinstance(file, io.TextIOBase) else file
+        rows = csv.reader(text)
+
+    header = None
+    for line, values in enumerate(rows, start=1):
+        if header is None:
+            header = [_header_key(value) for value in values]
+            continue
+        if any(value not in (None, '') for value in values):
+            yield line, header, values
+
+
+def _xlsx_rows(file):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise EmployeeImportError("Reading .xlsx files needs the openpyxl package; save the sheet as CSV instead.")
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def _columns(header):
+    """(index of the payroll ID column, {index: Employee field name}) for a file header."""
+    id_index = next((index for index, key in enumerate(header) if key in PAYROLL_ID_COLUMNS), None)
+    if id_index is None:
+        raise EmployeeImportError(f"The file needs a payroll ID column ({', '.join(PAYROLL_ID_COLUMNS)}).")
+    columns = {}
+    for index, key in enumerate(header):
+        if index != id_index and key in HEADER_ALIASES:
+            columns[index] = HEADER_ALIASES[key]
+    if not columns:
+        raise EmployeeImportError("None of the columns match an Employee field.")
+    return id_index, columns
+
+
+# ----------------------------------------------------------------------
+# VALIDATION
+# ----------------------------------------------------------------------
+
+def _cell(value):
+    if isinstance(value, str):
+        value = value.strip()
+    return None if value in (None, '') else value
+
+
+def _apply_row(employee, values, columns, is_new):
+    """Set the row's non-blank cells on employee; returns the fields set or raises ValidationError."""
+    changed = []
+    for index, name in columns.items():
+        value = _cell(values[index]) if index < len(values) else None
+        if value is None:
+            continue
+        setattr(employee, name, value)
+        changed.append(name)
+
+    # Only the cells written are checked, plus the required fields of a new profile
+    exclude = [
+        model_field.name for model_field in IMPORT_FIELDS
+        if model_field.name not in changed and not (is_new and model_field.name in REQUIRED_FOR_NEW)
+    ]
+    employee.clean_fields(exclude=exclude + ['created_at'])
+    return changed
+
+
+def _error_text(error):
+    if hasattr(error, 'message_dict'):
+        return '; '.join(f"{name}: {' '.join(messages)}" for name, messages in error.message_dict.items())
+    return ' '.join(error.messages)
+
+
+# ----------------------------------------------------------------------
+# IMPORT
+# ----------------------------------------------------------------------
+
+def import_employees(file, filename, dry_run=False, batch_size=IMPORT_BATCH_SIZE):
+    """Validate and import a file; returns an ImportResult. dry_run validates without writing."""
+    result = ImportResult()
+    seen = set()
+    batch = []
+    touched = set()
+    columns = None
+
+    for line, header, values in read_rows(file, filename):
+        if columns is None:
+            id_index, columns = _columns(header)
+        result.rows += 1
+        payroll_id = normalize_payroll_id(values[id_index] if id_index < len(values) else '')
+        if not payroll_id:
+            result.add_error(line, '', "Missing payroll ID.")
+            continue
+        if payroll_id in seen:
+            result.add_error(line, payroll_id, "Payroll ID appears more than once in the file; only the first row was used.")
+            continue
+        seen.add(payroll_id)
+        batch.append((line, payroll_id, values))
+        if len(batch) >= batch_size:
+            touched.update(_import_batch(batch, columns, result, dry_run))
+            batch = []
+    if batch:
+        touched.update(_import_batch(batch, columns, result, dry_run))
+
+    result.errors.sort()
+    if touched and not dry_run:
+        typeahead.invalidate_index()
+        attendance_cache.bump_data_version()
+        employee_profiles_changed.send(sender=Employee, payroll_employee_ids=touched)
+    return result
+
+
+def _import_batch(batch, columns, result, dry_run):
+    """Validate and write one batch; returns the payroll IDs written."""
+    mapped = {
+        mapping.payroll_employee_id: mapping.employee
+        for mapping in EmployeeMapping.objects.filter(
+            payroll_employee_id__in=[payroll_id for _, payroll_id, _ in batch],
+        ).select_related('employee')
+    }
+
+    new, updated, update_fields = [], [], set()
+    for line, payroll_id, values in batch:
+        employee = mapped.get(payroll_id)
+        is_new = employee is None
+        if is_new:
+            employee = Employee()
+        try:
+            changed = _apply_row(employee, values, columns, is_new)
+        except ValidationError as e:
+            result.add_error(line, payroll_id, _error_text(e))
+            if not is_new:
+                employee.refresh_from_db() # Drop the half-applied values
+            continue
+        if is_new:
+            new.append((payroll_id, employee))
+        elif changed:
+            updated.append((payroll_id, employee))
+            update_fields.update(changed)
+
+    result.created += len(new)
+    result.updated += len(updated)
+    if dry_run:
+        return set()
+
+    with transaction.atomic():
+        employees = [employee for _, employee in new]
+        if connection.features.can_return_rows_from_bulk_insert:
+            Employee.objects.bulk_create(employees)
+        else:
+            for employee in employees:
+                employee.save()
+        EmployeeMapping.objects.bulk_create([
+            EmployeeMapping(payroll_employee_id=payroll_id, employee=employee) for payroll_id, employee in new
+        ])
+        if updated:
+            Employee.objects.bulk_update([employee for _, employee in updated], sorted(update_fields), batch_size=IMPORT_BATCH_SIZE)
+        link_payroll_summaries(new)
+        index_employees(employees + [employee for _, employee in updated])
+
+    return {payroll_id for payroll_id, _ in new + updated}
+
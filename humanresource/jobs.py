@@ -0,0 +1,44 @@
+"""Minimal in-process background worker.
+
+Work submitted here runs on a single daemon thread so long jobs (bulk deletes,
+rebuilds) never hold an HTTP request open. Set HR_BACKGROUND_WORKER = 'inline'
+to run jobs synchronously (tests, management commands) or 'command' to leave
+queued jobs for `manage.py run_deletion_jobs`.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def worker_mode():
+    return getattr(settings, 'HR_BACKGROUND_WORKER', 'thread')
+
+
+def _run(func, args, kwargs):
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception("Background job %s failed", getattr(func, '__name__', func))
+    finally:
+        # Each worker thread owns its own DB connection; don't leak it between jobs
+        connection.close()
+
+
+def submit(func, *args, **kwargs):
+    """Run func in the background worker (or inline, depending on settings)."""
+    global _executor
+    mode = worker_mode()
+    if mode == 'inline':
+        func(*args, **kwargs)
+        return
+    if mode == 'command':
+        return
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='hr-worker')
+    _executor.submit(_run, func, args, kwargs)
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from humanresource.bulk_edit import apply_due_bulk_edits
+
+
+class Command(BaseCommand):
+    help = 'Apply scheduled Employee bulk edits whose effective date has come (run daily).'
+
+    def handle(self, *args, **options):
+        applied = apply_due_bulk_edits()
+        self.stdout.write(self.style.SUCCESS(f"Applied {applied} scheduled bulk edit(s)."))
@@ -1,5 +1,5 @@
 from django.core.management.base import BaseCommand
-from humanresource.models import PayrollRecord, CSVUploadHistory, Employee
+from humanresource.deletion import clear_payroll_data
 
 
 class Command(BaseCommand):
@@ -23,17 +23,7 @@ class Command(BaseCommand):
                 self.stdout.write(self.style.WARNING('Aborted by user. No changes made.'))
                 return
 
-        pr_deleted = PayrollRecord.objects.all().delete()
-        hist_deleted = CSVUploadHistory.objects.all().delete()
-
-        # pr_deleted and hist_deleted are tuples (count, {model_label: count})
-        pr_count = pr_deleted[0]
-        hist_count = hist_deleted[0]
-
-        if remove_employees:
-            emp_deleted = Employee.objects.all().delete()
-            emp_count = emp_deleted[0]
-        else:
-            emp_count = 0
+        # Tables are flushed (TRUNCATE on MySQL) rather than deleted row by row
+        pr_count, hist_count, emp_count = clear_payroll_data(remove_employees=remove_employees)
 
         self.stdout.write(self.style.SUCCESS(f"Deleted {pr_count} PayrollRecord(s), {hist_count} CSVUploadHistory record(s), and {emp_count} Employee record(s)."))
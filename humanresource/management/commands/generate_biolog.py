@@ -0,0 +1,40 @@
+import os
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from humanresource.synthetic import Workforce, month_ranges, write_biolog
+
+
+class Command(BaseCommand):
+    help = 'Write synthetic biometric device exports (.txt) in the layout accepted by the payroll upload, one file per month.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('output_dir', help='Directory for the generated biolog_YYYY_MM.txt files')
+        parser.add_argument('--employees', type=int, default=100)
+        parser.add_argument('--months', type=int, default=1)
+        parser.add_argument('--start', default='2025-01-01', help='First month (YYYY-MM-DD, any day of the month)')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--first-id', type=int, default=1, help='Payroll ID of the first generated employee')
+        parser.add_argument('--missing-rate', type=float, default=0.02, help='Probability that a single punch is missing')
+        parser.add_argument('--absence-rate', type=float, default=0.03)
+        parser.add_argument('--ot-rate', type=float, default=0.15, help='Probability of overtime on a worked day')
+
+    def handle(self, *args, **options):
+        try:
+            start = datetime.strptime(options['start'], '%Y-%m-%d').date()
+        except ValueError:
+            raise CommandError('--start must be YYYY-MM-DD.')
+
+        os.makedirs(options['output_dir'], exist_ok=True)
+        workforce = Workforce(options['employees'], seed=options['seed'], first_id=options['first_id'])
+        rates = {key: options[key] for key in ('missing_rate', 'absence_rate', 'ot_rate')}
+
+        total = 0
+        for first_day, last_day in month_ranges(start, options['months']):
+            path = os.path.join(options['output_dir'], f"biolog_{first_day:%Y_%m}.txt")
+            with open(path, 'w', encoding='utf-8', newline='\n') as handle:
+                rows = write_biolog(handle, workforce, first_day, last_day, **rates)
+            total += rows
+            self.stdout.write(f"{path}: {rows} rows")
+
+        self.stdout.write(self.style.SUCCESS(f"Generated {total} log rows for {options['employees']} employee(s)."))
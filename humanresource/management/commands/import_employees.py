@@ -0,0 +1,34 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from humanresource.imports import IMPORT_BATCH_SIZE, EmployeeImportError, import_employees
+
+
+class Command(BaseCommand):
+    help = 'Create or update Employee profiles and their payroll ID mappings from a CSV or XLSX file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='.csv or .xlsx file with a payroll ID column and Employee field columns')
+        parser.add_argument('--dry-run', action='store_true', help='Validate every row without writing anything')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE, help='Rows written per transaction')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f"{path} does not exist.")
+
+        try:
+            with open(path, 'rb') as handle:
+                result = import_employees(handle, path, dry_run=options['dry_run'], batch_size=options['batch_size'])
+        except EmployeeImportError as e:
+            raise CommandError(str(e))
+
+        for line, payroll_id, message in result.errors:
+            self.stderr.write(f"Line {line} ({payroll_id or 'no ID'}): {message}")
+        if result.error_count > len(result.errors):
+            self.stderr.write(f"... and {result.error_count - len(result.errors)} more error(s).")
+
+        verb = ("would create", "would update") if options['dry_run'] else ("created", "updated")
+        self.stdout.write(self.style.SUCCESS(
+            f"{result.rows} row(s): {verb[0]} {result.created}, {verb[1]} {result.updated}, {result.error_count} skipped."
+        ))
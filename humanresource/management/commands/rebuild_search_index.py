@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from humanresource.search import rebuild_index, REBUILD_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the Employee profile search index (EmployeeSearchToken) from scratch.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=REBUILD_BATCH_SIZE, help='Employees indexed per transaction')
+
+    def handle(self, *args, **options):
+        def progress(indexed):
+            self.stdout.write(f"Indexed {indexed} employee(s)...")
+
+        employee_count, token_count = rebuild_index(batch_size=options['batch_size'], progress=progress)
+        self.stdout.write(self.style.SUCCESS(f"Indexed {employee_count} Employee record(s) into {token_count} search token(s)."))
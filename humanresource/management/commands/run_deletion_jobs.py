@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from humanresource.deletion import DELETE_BATCH_SIZE, run_deletion_job
+from humanresource.models import CSVUploadHistory, DeletionJob
+
+
+class Command(BaseCommand):
+    help = 'Process queued upload deletions in bounded batches. Also resumes jobs interrupted by a restart.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DELETE_BATCH_SIZE, help='PayrollRecord primary keys per DELETE batch')
+        parser.add_argument('--history-id', type=int, help='Delete this upload directly instead of processing the queue')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        def progress(deleted, total):
+            self.stdout.write(f"  {deleted}/{total} records deleted")
+
+        if options.get('history_id'):
+            history = CSVUploadHistory.objects.filter(pk=options['history_id']).first()
+            if history is None:
+                self.stdout.write(self.style.WARNING(f"Upload {options['history_id']} not found."))
+                return
+            self.stdout.write(f"Deleting {history.file_name}...")
+            # Through a job, so an interrupted run can be resumed like a queued one
+            job = DeletionJob.objects.filter(upload_history_id=history.pk).exclude(status='done').first()
+            if job is None:
+                job = DeletionJob.objects.create(upload_history_id=history.pk, file_name=history.file_name, requested_by='command')
+            job = run_deletion_job(job.pk, batch_size, progress)
+            self.stdout.write(self.style.SUCCESS(f"Deleted {job.deleted_records} PayrollRecord(s)."))
+            return
+
+        job_ids = list(DeletionJob.objects.filter(status__in=['queued', 'running']).order_by('created_at').values_list('pk', flat=True))
+        if not job_ids:
+            self.stdout.write('No deletion jobs queued.')
+            return
+
+        for job_id in job_ids:
+            job = run_deletion_job(job_id, batch_size)
+            self.stdout.write(self.style.SUCCESS(f"{job.file_name}: deleted {job.deleted_records} PayrollRecord(s)."))
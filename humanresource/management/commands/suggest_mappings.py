@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from humanresource.matching import approve_suggestions, suggest_mappings
+from humanresource.models import MappingSuggestion
+
+
+class Command(BaseCommand):
+    help = 'Propose EmployeeMapping links for unmapped payroll IDs by fuzzy name matching.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--min-score', type=float, default=None, help='Lowest score kept (default HR_MATCH_MIN_SCORE)')
+        parser.add_argument('--approve-above', type=float, default=None, help='Also approve suggestions scoring at least this')
+
+    def handle(self, *args, **options):
+        created, compared = suggest_mappings(options['min_score'])
+        self.stdout.write(f"{created} suggestion(s) from {compared} compared name pair(s).")
+
+        if options['approve_above'] is not None:
+            selected = MappingSuggestion.objects.filter(status='pending', score__gte=options['approve_above'])
+            approved = approve_suggestions(selected, decided_by='suggest_mappings')
+            self.stdout.write(f"Approved {approved} suggestion(s).")
+        self.stdout.write(self.style.SUCCESS("Done."))
@@ -0,0 +1,230 @@
+"""Suggest EmployeeMapping links for unmapped payroll IDs by fuzzy name matching.
+
+The device's bio names look like 'DELA CRUZ, JUAN' and are cut at 14
+characters. HR names are split into first, middle and last name. Both are
+normalized into tokens (upper case, accents and punctuation dropped, suffixes
+like JR/III ignored) before they are compared.
+
+Blocking: every unmapped Employee is indexed under the Soundex key of each of
+its name tokens. A bio name is only compared with the employees that share at
+least one key with it, instead of with every profile, and each candidate
+pair is scored once. The score is how well the bio tokens are covered by the
+employee's tokens. A token may match by prefix (for the truncated last token)
+or closely enough by spelling (SequenceMatcher). Pairs scoring at least
+HR_MATCH_MIN_SCORE become suggestions. The best pairs are taken first, so
+each payroll ID and each employee appears in at most one suggestion.
+
+Rejected pairs are remembered and never suggested again. Approving a
+suggestion creates the EmployeeMapping and links the payroll summary, in bulk.
+"""
+import re
+import unicodedata
+from difflib import SequenceMatcher
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import attendance_cache, typeahead
+from .models import Employee, EmployeeMapping, MappingSuggestion, PayrollEmployeeSummary
+from .signals import employee_profiles_changed
+from .summaries import link_payroll_summaries
+
+DEFAULT_MIN_SCORE = 0.85
+NAME_SUFFIXES = {'JR', 'SR', 'II', 'III', 'IV'}
+MIN_PREFIX_LENGTH = 2
+SOUNDEX_CODES = {
+    **dict.fromkeys('BFPV', '1'), **dict.fromkeys('CGJKQSXZ', '2'), **dict.fromkeys('DT', '3'),
+    'L': '4', **dict.fromkeys('MN', '5'), 'R': '6',
+}
+
+
+# ----------------------------------------------------------------------
+# NAMES
+# ----------------------------------------------------------------------
+
+def name_tokens(*parts):
+    """Normalized tokens of a name: 'Dela Cruz, Juan Jr.' -> ['DELA', 'CRUZ', 'JUAN']."""
+    text = ' '.join(part for part in parts if part)
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode()
+    tokens = re.sub(r'[^A-Z ]+', ' ', text.upper()).split()
+    return [token for token in tokens if token not in NAME_SUFFIXES]
+
+
+def split_bio_name(bio_name):
+    """(first, middle, last) from a device name: 'DELA CRUZ, JUAN P' -> ('JUAN', 'P', 'DELA CRUZ').
+
+    Names without a comma are read as 'FIRST [MIDDLE...] LAST'.
+    """
+    if ',' in bio_name:
+        last, _, given = bio_name.partition(',')
+        given = given.split()
+        return (given[0] if given else ''), ' '.join(given[1:]), last.strip()
+    parts = bio_name.split()
+    first = parts[0] if parts else ''
+    last = parts[-1] if len(parts) > 1 else ''
+    return first, ' '.join(parts[1:-1]), last
+
+
+def soundex(token):
+    """American Soundex ('ROBERT' -> 'R163')."""
+    if not token:
+        return ''
+    digits = []
+    previous = SOUNDEX_CODES.get(token[0], '')
+    for letter in token[1:]:
+        code = SOUNDEX_CODES.get(letter, '')
+        if code and code != previous:
+            digits.append(code)
+        if letter not in 'HW': # H and W don't separate letters with the same code
+            previous = code
+    return (token[0] + ''.join(digits) + '000')[:4]
+
+
+def _token_score(bio_token, hr_token, is_last):
+    if bio_token == hr_token:
+        return 1.0
+    if is_last and len(bio_token) >= MIN_PREFIX_LENGTH and hr_token.startswith(bio_token):
+        return 0.95 # Cut off by the 14-character device field
+    return SequenceMatcher(None, bio_token, hr_token).ratio()
+
+
+def name_score(bio_tokens, hr_tokens):
+    """0..1: how well every bio token is matched by a distinct HR token (order ignored)."""
+    if not bio_tokens or not hr_tokens:
+        return 0.0
+    remaining = list(hr_tokens)
+    total = 0.0
+    for index, bio_token in enumerate(bio_tokens):
+        is_last = index == len(bio_tokens) - 1
+        best, best_index = 0.0, None
+        for hr_index, hr_token in enumerate(remaining):
+            score = _token_score(bio_token, hr_token, is_last)
+            if score > best:
+                best, best_index = score, hr_index
+        if best_index is not None:
+            remaining.pop(best_index)
+        total += best
+    # A profile with extra names (a middle name) still matches; one with fewer
+    # tokens than the bio name is penalized through the unmatched bio tokens
+    return total / len(bio_tokens)
+
+
+# ----------------------------------------------------------------------
+# SUGGESTIONS
+# ----------------------------------------------------------------------
+
+def _min_score():
+    return float(getattr(settings, 'HR_MATCH_MIN_SCORE', DEFAULT_MIN_SCORE))
+
+
+def unmapped_payroll_ids():
+    mapped = EmployeeMapping.objects.values('payroll_employee_id')
+    return (
+        PayrollEmployeeSummary.objects.filter(record_count__gt=0)
+        .exclude(payroll_employee_id__in=mapped)
+        .exclude(bio_name='')
+    )
+
+
+def find_matches(min_score=None):
+    """[(score, payroll ID, bio name, employee id)] for the best one-to-one pairs, best first.
+
+    Also returns the number of pairs that were scored, which blocking keeps small.
+    """
+    min_score = _min_score() if min_score is None else min_score
+    rejected = set(MappingSuggestion.objects.filter(status='rejected').values_list('payroll_employee_id', 'employee_id'))
+
+    # Blocking index: Soundex key -> ids of unmapped employees with a name token of that key
+    blocks, employee_tokens = {}, {}
+    employees = Employee.objects.filter(mapping__isnull=True).values_list('pk', 'first_name', 'middle_name', 'last_name')
+    for pk, first_name, middle_name, last_name in employees.iterator(chunk_size=2000):
+        tokens = name_tokens(last_name, first_name, middle_name)
+        employee_tokens[pk] = tokens
+        for key in {soundex(token) for token in tokens}:
+            blocks.setdefault(key, set()).add(pk)
+
+    pairs, compared = [], 0
+    for payroll_id, bio_name in unmapped_payroll_ids().values_list('payroll_employee_id', 'bio_name').iterator(chunk_size=2000):
+        bio_tokens = name_tokens(bio_name)
+        candidates = set()
+        for token in bio_tokens[:-1] or bio_tokens: # The last token may be truncated, so its key is unreliable
+            candidates |= blocks.get(soundex(token), set())
+        for pk in candidates:
+            if (payroll_id, pk) in rejected:
+                continue
+            compared += 1
+            score = name_score(bio_tokens, employee_tokens[pk])
+            if score >= min_score:
+                pairs.append((round(score, 3), payroll_id, bio_name, pk))
+
+    # Greedy one-to-one: best scores first, each payroll ID and employee used once
+    pairs.sort(key=lambda pair: (-pair[0], pair[1], pair[3]))
+    used_ids, used_employees, matches = set(), set(), []
+    for score, payroll_id, bio_name, pk in pairs:
+        if payroll_id in used_ids or pk in used_employees:
+            continue
+        used_ids.add(payroll_id)
+        used_employees.add(pk)
+        matches.append((score, payroll_id, bio_name, pk))
+    return matches, compared
+
+
+def suggest_mappings(min_score=None):
+    """Replace the pending suggestions with a fresh run; returns (suggestions, pairs compared)."""
+    matches, compared = find_matches(min_score)
+    with transaction.atomic():
+        MappingSuggestion.objects.filter(status='pending').delete()
+        MappingSuggestion.objects.bulk_create([
+            MappingSuggestion(payroll_employee_id=payroll_id, bio_name=bio_name, employee_id=pk, score=score)
+            for score, payroll_id, bio_name, pk in matches
+        ], batch_size=1000)
+    return len(matches), compared
+
+
+def approve_suggestions(suggestions, decided_by):
+    """Create the mappings of pending suggestions (a queryset); returns how many were approved.
+
+    Suggestions whose payroll ID or employee was mapped in the meantime are skipped.
+    """
+    with transaction.atomic():
+        pending = list(suggestions.filter(status='pending').select_related('employee').select_for_update())
+        taken_ids = set(EmployeeMapping.objects.filter(
+            payroll_employee_id__in=[suggestion.payroll_employee_id for suggestion in pending],
+        ).values_list('payroll_employee_id', flat=True))
+        taken_employees = set(EmployeeMapping.objects.filter(
+            employee_id__in=[suggestion.employee_id for suggestion in pending],
+        ).values_list('employee_id', flat=True))
+
+        approved = []
+        for suggestion in pending:
+            if suggestion.payroll_employee_id in taken_ids or suggestion.employee_id in taken_employees:
+                continue
+            taken_ids.add(suggestion.payroll_employee_id)
+            taken_employees.add(suggestion.employee_id)
+            approved.append(suggestion)
+        if not approved:
+            return 0
+
+        pairs = [(suggestion.payroll_employee_id, suggestion.employee) for suggestion in approved]
+        EmployeeMapping.objects.bulk_create([
+            EmployeeMapping(payroll_employee_id=payroll_id, employee=employee) for payroll_id, employee in pairs
+        ], batch_size=1000)
+        link_payroll_summaries(pairs)
+        MappingSuggestion.objects.filter(pk__in=[suggestion.pk for suggestion in approved]).update(
+            status='approved', decided_by=decided_by, decided_at=timezone.now(),
+        )
+        # Other pending suggestions for the same payroll IDs or employees are now moot
+        MappingSuggestion.objects.filter(status='pending').filter(
+            Q(payroll_employee_id__in=taken_ids) | Q(employee_id__in=taken_employees)
+        ).delete()
+
+    typeahead.invalidate_index()
+    attendance_cache.bump_data_version()
+    employee_profiles_changed.send(sender=Employee, payroll_employee_ids={payroll_id for payroll_id, _ in pairs})
+    return len(approved)
+
+
+def reject_suggestions(suggestions, decided_by):
+    return suggestions.filter(status='pending').update(status='rejected', decided_by=decided_by, decided_at=timezone.now())
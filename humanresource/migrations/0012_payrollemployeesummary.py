@@ -0,0 +1,76 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, OuterRef, Subquery
+
+
+def backfill_summaries(apps, schema_editor):
+    PayrollRecord = apps.get_model('humanresource', 'PayrollRecord')
+    EmployeeMapping = apps.get_model('humanresource', 'EmployeeMapping')
+    PayrollEmployeeSummary = apps.get_model('humanresource', 'PayrollEmployeeSummary')
+
+    latest_name = PayrollRecord.objects.filter(
+        employee_id=OuterRef('employee_id')
+    ).order_by('-log_date', '-log_time').values('employee_name')[:1]
+    mapped = dict(EmployeeMapping.objects.values_list('payroll_employee_id', 'employee_id'))
+
+    summaries = {}
+    for row in PayrollRecord.objects.order_by().values('employee_id').annotate(
+        first_log=Min('log_date'), last_log=Max('log_date'), total=Count('id'), bio_name=Subquery(latest_name),
+    ):
+        summaries[row['employee_id']] = PayrollEmployeeSummary(
+            payroll_employee_id=row['employee_id'],
+            bio_name=(row['bio_name'] or '').strip(),
+            first_log_date=row['first_log'],
+            last_log_date=row['last_log'],
+            record_count=row['total'],
+            employee_id=mapped.get(row['employee_id']),
+        )
+    for payroll_id, employee_id in mapped.items():
+        summaries.setdefault(payroll_id, PayrollEmployeeSummary(payroll_employee_id=payroll_id, employee_id=employee_id))
+
+    PayrollEmployeeSummary.objects.bulk_create(summaries.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('humanresource', '0011_alter_employee_table'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PayrollEmployeeSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payroll_employee_id', models.CharField(max_length=50, unique=True)),
+                ('bio_name', models.CharField(blank=True, default='', max_length=150)),
+                ('first_log_date', models.DateField(blank=True, null=True)),
+                ('last_log_date', models.DateField(blank=True, null=True)),
+                ('record_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'PayrollEmployeeSummary',
+                'ordering': ['payroll_employee_id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='payrollrecord',
+            index=models.Index(fields=['employee_id', 'log_date', 'log_time'], name='payroll_emp_date_time_idx'),
+        ),
+        migrations.AddField(
+            model_name='payrollemployeesummary',
+            name='employee',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='payroll_summary', to='humanresource.employee'),
+        ),
+        migrations.AddIndex(
+            model_name='payrollemployeesummary',
+            index=models.Index(fields=['bio_name'], name='summary_bio_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payrollemployeesummary',
+            index=models.Index(fields=['first_log_date'], name='summary_first_log_idx'),
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
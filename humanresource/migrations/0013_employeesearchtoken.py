@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('humanresource', '0012_payrollemployeesummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=100)),
+                ('field', models.CharField(max_length=30)),
+                ('weight', models.PositiveSmallIntegerField(default=1)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='humanresource.employee')),
+            ],
+            options={
+                'db_table': 'EmployeeSearchToken',
+                'indexes': [models.Index(fields=['token', 'employee'], name='search_token_employee_idx')],
+            },
+        ),
+    ]
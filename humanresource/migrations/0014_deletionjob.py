@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:55
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('humanresource', '0013_employeesearchtoken'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletionJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('upload_history_id', models.BigIntegerField(db_index=True)),
+                ('file_name', models.CharField(max_length=255)),
+                ('requested_by', models.CharField(default='hr', max_length=100)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=10)),
+                ('total_records', models.PositiveIntegerField(default=0)),
+                ('deleted_records', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'DeletionJob',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:55
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min
+
+
+def backfill_stats(apps, schema_editor):
+    CSVUploadHistory = apps.get_model('humanresource', 'CSVUploadHistory')
+    PayrollRecord = apps.get_model('humanresource', 'PayrollRecord')
+
+    stats = PayrollRecord.objects.order_by().values('upload_history_id').annotate(
+        rows=Count('id'), employees=Count('employee_id', distinct=True),
+        first=Min('log_date'), last=Max('log_date'),
+    )
+    for row in stats:
+        CSVUploadHistory.objects.filter(pk=row['upload_history_id']).update(
+            row_count=row['rows'], employee_count=row['employees'],
+            min_log_date=row['first'], max_log_date=row['last'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('humanresource', '0014_deletionjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='csvuploadhistory',
+            name='employee_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='csvuploadhistory',
+            name='file_bytes',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='csvuploadhistory',
+            name='insert_ms',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='csvuploadhistory',
+            name='max_log_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='csvuploadhistory',
+            name='min_log_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='csvuploadhistory',
+            name='parse_ms',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='csvuploadhistory',
+            name='reject_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='csvuploadhistory',
+            name='row_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
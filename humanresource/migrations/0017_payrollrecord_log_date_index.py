@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('humanresource', '0016_dataversion'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payrollrecord',
+            index=models.Index(fields=['log_date'], name='payroll_log_date_idx'),
+        ),
+    ]
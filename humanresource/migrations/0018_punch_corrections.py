@@ -0,0 +1,43 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('humanresource', '0017_payrollrecord_log_date_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payrollemployeesummary',
+            name='revision',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='PunchCorrection',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payroll_employee_id', models.CharField(max_length=50)),
+                ('action', models.CharField(choices=[('add', 'Add punch'), ('void', 'Void punch'), ('adjust', 'Adjust punch')], max_length=10)),
+                ('original_code', models.CharField(blank=True, default='', max_length=10)),
+                ('original_date', models.DateField(blank=True, null=True)),
+                ('original_time', models.CharField(blank=True, default='', max_length=10)),
+                ('log_code', models.CharField(blank=True, default='', max_length=10)),
+                ('log_date', models.DateField(blank=True, null=True)),
+                ('log_time', models.CharField(blank=True, default='', max_length=10)),
+                ('reason', models.CharField(max_length=255)),
+                ('created_by', models.CharField(max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('revoked_by', models.CharField(blank=True, default='', max_length=100)),
+                ('revoked_at', models.DateTimeField(blank=True, null=True)),
+                ('revoke_reason', models.CharField(blank=True, default='', max_length=255)),
+            ],
+            options={
+                'db_table': 'PunchCorrection',
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['payroll_employee_id', 'log_date'], name='correction_emp_date_idx'), models.Index(fields=['payroll_employee_id', 'original_date'], name='correction_emp_orig_date_idx')],
+            },
+        ),
+    ]
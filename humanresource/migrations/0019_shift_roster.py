@@ -0,0 +1,71 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('humanresource', '0018_punch_corrections'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Crew',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+            ],
+            options={
+                'db_table': 'Crew',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ShiftSchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+                ('grace_minutes', models.PositiveSmallIntegerField(default=15)),
+            ],
+            options={
+                'db_table': 'ShiftSchedule',
+                'ordering': ['start_time', 'name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CrewMembership',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payroll_employee_id', models.CharField(max_length=50)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('crew', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='humanresource.crew')),
+            ],
+            options={
+                'db_table': 'CrewMembership',
+                'indexes': [models.Index(fields=['payroll_employee_id', 'start_date'], name='crew_member_emp_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='RosterAssignment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payroll_employee_id', models.CharField(blank=True, default='', max_length=50)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('crew', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='assignments', to='humanresource.crew')),
+                ('schedule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='assignments', to='humanresource.shiftschedule')),
+            ],
+            options={
+                'db_table': 'RosterAssignment',
+                'ordering': ['-start_date', '-id'],
+                'indexes': [models.Index(fields=['payroll_employee_id', 'start_date'], name='roster_emp_start_idx'), models.Index(fields=['crew', 'start_date'], name='roster_crew_start_idx')],
+                'constraints': [models.CheckConstraint(condition=models.Q(models.Q(('crew__isnull', False), ('payroll_employee_id', '')), models.Q(('crew__isnull', True), models.Q(('payroll_employee_id', ''), _negated=True)), _connector='OR'), name='roster_assignment_crew_xor_employee')],
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('humanresource', '0019_shift_roster'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeBulkEdit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('effective_date', models.DateField()),
+                ('status', models.CharField(choices=[('scheduled', 'Scheduled'), ('applied', 'Applied'), ('cancelled', 'Cancelled')], default='scheduled', max_length=10)),
+                ('changes', models.JSONField()),
+                ('employee_ids', models.JSONField()),
+                ('employee_count', models.PositiveIntegerField(default=0)),
+                ('description', models.CharField(blank=True, default='', max_length=255)),
+                ('created_by', models.CharField(max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('applied_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'EmployeeBulkEdit',
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['status', 'effective_date'], name='bulk_edit_due_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='EmployeeBulkEditChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(max_length=30)),
+                ('old_value', models.CharField(blank=True, max_length=255, null=True)),
+                ('new_value', models.CharField(blank=True, max_length=255, null=True)),
+                ('bulk_edit', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='field_changes', to='humanresource.employeebulkedit')),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bulk_edit_changes', to='humanresource.employee')),
+            ],
+            options={
+                'db_table': 'EmployeeBulkEditChange',
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('humanresource', '0020_employee_bulk_edits'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MappingSuggestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payroll_employee_id', models.CharField(max_length=50)),
+                ('bio_name', models.CharField(max_length=150)),
+                ('score', models.DecimalField(decimal_places=3, max_digits=4)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected')], default='pending', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('decided_by', models.CharField(blank=True, default='', max_length=100)),
+                ('decided_at', models.DateTimeField(blank=True, null=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mapping_suggestions', to='humanresource.employee')),
+            ],
+            options={
+                'db_table': 'MappingSuggestion',
+                'ordering': ['-score', 'payroll_employee_id'],
+                'indexes': [models.Index(fields=['status', 'score'], name='mapping_suggestion_status_idx')],
+                'constraints': [models.UniqueConstraint(fields=('payroll_employee_id', 'employee'), name='mapping_suggestion_pair_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('humanresource', '0021_mapping_suggestions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='deletionjob',
+            name='scope',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
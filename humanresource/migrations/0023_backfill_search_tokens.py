@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-19 14:10
+
+from django.db import migrations
+
+from humanresource.search import SEARCH_FIELDS, tokenize
+
+
+def backfill_search_tokens(apps, schema_editor):
+    """Index every profile that has no tokens yet (all of them when the search was added)."""
+    Employee = apps.get_model('humanresource', 'Employee')
+    EmployeeSearchToken = apps.get_model('humanresource', 'EmployeeSearchToken')
+
+    entries = []
+    unindexed = Employee.objects.filter(search_tokens__isnull=True).only('pk', *SEARCH_FIELDS).order_by('pk')
+    for employee in unindexed.iterator(chunk_size=500):
+        tokens = {}
+        for field, weight in SEARCH_FIELDS.items():
+            for token in tokenize(getattr(employee, field)):
+                if weight > tokens.get(token, ('', 0))[1]:
+                    tokens[token] = (field, weight)
+        entries.extend(
+            EmployeeSearchToken(token=token, employee_id=employee.pk, field=field, weight=weight)
+            for token, (field, weight) in tokens.items()
+        )
+        if len(entries) >= 5000:
+            EmployeeSearchToken.objects.bulk_create(entries, batch_size=1000)
+            entries = []
+    EmployeeSearchToken.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('humanresource', '0022_deletionjob_scope'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_tokens, migrations.RunPython.noop),
+    ]
@@ -6,13 +6,23 @@ class CSVUploadHistory(models.Model):
     uploaded_by = models.CharField(max_length=100, default='hr')
     file_name = models.CharField(max_length=255)
     upload_time = models.DateTimeField(default=timezone.now)
+
+    # Ingest statistics, recorded once when the file is processed
+    row_count = models.PositiveIntegerField(default=0) # PayrollRecords created
+    employee_count = models.PositiveIntegerField(default=0) # Distinct payroll IDs in the file
+    min_log_date = models.DateField(null=True, blank=True)
+    max_log_date = models.DateField(null=True, blank=True)
+    reject_count = models.PositiveIntegerField(default=0) # Data rows skipped as malformed
+    parse_ms = models.PositiveIntegerField(default=0)
+    insert_ms = models.PositiveIntegerField(default=0)
+    file_bytes = models.PositiveBigIntegerField(default=0)
     
     class Meta:
         db_table = "CSVUploadHistory" 
         ordering = ['-upload_time'] 
 
     def __str__(self):
-        return f"{self.filename} uploaded by {self.uploaded_by} on {self.upload_time.strftime('%Y-%m-%d %H:%M:%S')}"
+        return f"{self.file_name} uploaded by {self.uploaded_by} on {self.upload_time.strftime('%Y-%m-%d %H:%M:%S')}"
     
 class PayrollRecord(models.Model):
     # Field definitions based on the provided character ranges (fixed-width)
@@ -29,6 +39,12 @@ class PayrollRecord(models.Model):
         db_table = "PayrollRecord"
         # Order by name, then by date/time for chronological display
         ordering = ['employee_name', 'log_date', 'log_time'] 
+        indexes = [
+            # Every per-employee lookup filters on employee_id and walks the logs in time order
+            models.Index(fields=['employee_id', 'log_date', 'log_time'], name='payroll_emp_date_time_idx'),
+            # Period-wide scans over every employee (timekeeper.scanner)
+            models.Index(fields=['log_date'], name='payroll_log_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.employee_name} ({self.employee_id}) - {self.log_date} {self.log_time}"
@@ -144,4 +160,333 @@ class EmployeeMapping(models.Model):
         db_table = 'EmployeeMapping'
 
     def __str__(self):
-        return f"{self.payroll_employee_id} -> {self.employee.get_list_name()}"
\ No newline at end of file
+        return f"{self.payroll_employee_id} -> {self.employee.get_list_name()}"
+
+
+class PayrollEmployeeSummary(models.Model):
+    """One row per payroll ID seen in the biometric logs.
+
+    Refreshed whenever logs are uploaded or deleted so the employee list can be
+    sorted and paginated with a single query instead of aggregating PayrollRecord.
+    `employee` mirrors EmployeeMapping so the HR profile is a plain join.
+    """
+    payroll_employee_id = models.CharField(max_length=50, unique=True)
+    bio_name = models.CharField(max_length=150, blank=True, default='') # Latest name found in the logs
+    first_log_date = models.DateField(null=True, blank=True)
+    last_log_date = models.DateField(null=True, blank=True)
+    record_count = models.PositiveIntegerField(default=0)
+    employee = models.OneToOneField(Employee, null=True, blank=True, on_delete=models.SET_NULL, related_name='payroll_summary')
+    # Bumped by punch corrections; part of this employee's attendance cache keys only
+    revision = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'PayrollEmployeeSummary'
+        ordering = ['payroll_employee_id']
+        indexes = [
+            models.Index(fields=['bio_name'], name='summary_bio_name_idx'),
+            models.Index(fields=['first_log_date'], name='summary_first_log_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.payroll_employee_id} ({self.bio_name}) - {self.record_count} logs"
+
+    @property
+    def display_name(self):
+        """Full HR name when a profile is linked, otherwise the bio name."""
+        if self.employee_id:
+            return self.employee.get_full_name()
+        return self.bio_name
+
+
+class EmployeeSearchToken(models.Model):
+    """Inverted index entry: one normalized token from one Employee profile field.
+
+    Maintained by humanresource.search (on edit_employee saves and by the
+    rebuild_search_index command) so profile search never scans Employee.
+    """
+    token = models.CharField(max_length=100)
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='search_tokens')
+    field = models.CharField(max_length=30) # Employee field the token came from
+    weight = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        db_table = 'EmployeeSearchToken'
+        indexes = [
+            # token is first so prefix (LIKE 'abc%') lookups use the index
+            models.Index(fields=['token', 'employee'], name='search_token_employee_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.token} -> {self.employee_id} ({self.field})"
+
+
+class DeletionJob(models.Model):
+    """Tracks the chunked removal of one upload's PayrollRecords (see humanresource.deletion)."""
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    # Plain ids/names (not a ForeignKey) so the job outlives the history row it deletes
+    upload_history_id = models.BigIntegerField(db_index=True)
+    file_name = models.CharField(max_length=255)
+    requested_by = models.CharField(max_length=100, default='hr')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    total_records = models.PositiveIntegerField(default=0)
+    deleted_records = models.PositiveIntegerField(default=0)
+    # deletion.deletion_scope() saved before the first batch; a resumed job reads it back
+    scope = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'DeletionJob'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Delete {self.file_name} ({self.status}, {self.deleted_records}/{self.total_records})"
+
+    @property
+    def percent_done(self):
+        if not self.total_records:
+            return 100 if self.status == 'done' else 0
+        return int(self.deleted_records * 100 / self.total_records)
+
+
+class DataVersion(models.Model):
+    """Monotonic counter bumped whenever attendance data changes.
+
+    Cache keys embed the current version, so a bump invalidates every cached
+    summary at once (across all processes) without relying on TTLs.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'DataVersion'
+
+    def __str__(self):
+        return f"{self.name} v{self.version} ({self.updated_at:%Y-%m-%d %H:%M:%S})"
+
+
+class PunchCorrection(models.Model):
+    """A manual punch correction overlaid on PayrollRecord at read time (see humanresource.corrections).
+
+    'add' inserts a punch, 'void' hides one, 'adjust' hides one and inserts its
+    replacement. Punches are matched on (payroll ID, code, date, time), so a
+    re-upload of the same device file keeps its corrections. Rows are never
+    edited or deleted: a correction is withdrawn by revoking it, and the table
+    is the audit trail.
+    """
+    ACTION_CHOICES = [
+        ('add', 'Add punch'),
+        ('void', 'Void punch'),
+        ('adjust', 'Adjust punch'),
+    ]
+
+    payroll_employee_id = models.CharField(max_length=50)
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    # The punch being voided or adjusted ('void' and 'adjust')
+    original_code = models.CharField(max_length=10, blank=True, default='')
+    original_date = models.DateField(null=True, blank=True)
+    original_time = models.CharField(max_length=10, blank=True, default='')
+    # The punch that takes effect ('add' and 'adjust')
+    log_code = models.CharField(max_length=10, blank=True, default='')
+    log_date = models.DateField(null=True, blank=True)
+    log_time = models.CharField(max_length=10, blank=True, default='')
+
+    reason = models.CharField(max_length=255)
+    created_by = models.CharField(max_length=100)
+    created_at = models.DateTimeField(auto_now_add=True)
+    revoked_by = models.CharField(max_length=100, blank=True, default='')
+    revoked_at = models.DateTimeField(null=True, blank=True)
+    revoke_reason = models.CharField(max_length=255, blank=True, default='')
+
+    class Meta:
+        db_table = 'PunchCorrection'
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['payroll_employee_id', 'log_date'], name='correction_emp_date_idx'),
+            models.Index(fields=['payroll_employee_id', 'original_date'], name='correction_emp_orig_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_action_display()} for {self.payroll_employee_id} by {self.created_by}"
+
+    @property
+    def is_active(self):
+        return self.revoked_at is None
+
+    @property
+    def effective_date(self):
+        return self.log_date or self.original_date
+
+
+# ----------------------------------------------------------------------
+# SHIFT ROSTER (see humanresource.roster)
+# ----------------------------------------------------------------------
+
+class ShiftSchedule(models.Model):
+    """A shift's expected hours; end_time at or before start_time ends the next day."""
+    name = models.CharField(max_length=50, unique=True)
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    grace_minutes = models.PositiveSmallIntegerField(default=15) # Lateness counts from start + grace
+
+    class Meta:
+        db_table = 'ShiftSchedule'
+        ordering = ['start_time', 'name']
+
+    def __str__(self):
+        return f"{self.name} ({self.start_time:%H:%M}-{self.end_time:%H:%M})"
+
+
+class Crew(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+
+    class Meta:
+        db_table = 'Crew'
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class CrewMembership(models.Model):
+    """A payroll ID belongs to a crew from start_date to end_date (open-ended when null)."""
+    crew = models.ForeignKey(Crew, on_delete=models.CASCADE, related_name='memberships')
+    payroll_employee_id = models.CharField(max_length=50)
+    start_date = models.DateField()
+    end_date = models.DateField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'CrewMembership'
+        indexes = [
+            models.Index(fields=['payroll_employee_id', 'start_date'], name='crew_member_emp_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.payroll_employee_id} in {self.crew.name} from {self.start_date}"
+
+
+class RosterAssignment(models.Model):
+    """A crew or a single payroll ID works a schedule from start_date to end_date (open-ended when null).
+
+    A personal assignment overrides the crew's; among overlapping assignments
+    for the same crew or employee, the one created last wins.
+    """
+    schedule = models.ForeignKey(ShiftSchedule, on_delete=models.CASCADE, related_name='assignments')
+    crew = models.ForeignKey(Crew, null=True, blank=True, on_delete=models.CASCADE, related_name='assignments')
+    payroll_employee_id = models.CharField(max_length=50, blank=True, default='')
+    start_date = models.DateField()
+    end_date = models.DateField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'RosterAssignment'
+        ordering = ['-start_date', '-id']
+        constraints = [
+            models.CheckConstraint(
+                condition=(models.Q(crew__isnull=False) & models.Q(payroll_employee_id='')) | (models.Q(crew__isnull=True) & ~models.Q(payroll_employee_id='')),
+                name='roster_assignment_crew_xor_employee',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['payroll_employee_id', 'start_date'], name='roster_emp_start_idx'),
+            models.Index(fields=['crew', 'start_date'], name='roster_crew_start_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.crew or self.payroll_employee_id}: {self.schedule.name} from {self.start_date}"
+
+
+# ----------------------------------------------------------------------
+# BULK EDITS (see humanresource.bulk_edit)
+# ----------------------------------------------------------------------
+
+class EmployeeBulkEdit(models.Model):
+    """One change set applied to many Employee profiles, effective from a date.
+
+    changes maps a field to {'op': 'set' | 'percent', 'value': str}; employee_ids
+    is the selection, frozen when the edit was made. Edits dated in the future
+    stay 'scheduled' until `manage.py apply_bulk_edits` runs on or after that date.
+    """
+    STATUS_CHOICES = [
+        ('scheduled', 'Scheduled'),
+        ('applied', 'Applied'),
+        ('cancelled', 'Cancelled'),
+    ]
+    effective_date = models.DateField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='scheduled')
+    changes = models.JSONField()
+    employee_ids = models.JSONField() # Employee pks
+    employee_count = models.PositiveIntegerField(default=0)
+    description = models.CharField(max_length=255, blank=True, default='') # How the employees were selected
+    created_by = models.CharField(max_length=100)
+    created_at = models.DateTimeField(auto_now_add=True)
+    applied_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'EmployeeBulkEdit'
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['status', 'effective_date'], name='bulk_edit_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"Bulk edit #{self.pk} ({self.employee_count} employees, {self.status}, effective {self.effective_date})"
+
+
+class EmployeeBulkEditChange(models.Model):
+    """Audit trail: a field value before and after a bulk edit, per employee."""
+    bulk_edit = models.ForeignKey(EmployeeBulkEdit, on_delete=models.CASCADE, related_name='field_changes')
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='bulk_edit_changes')
+    field = models.CharField(max_length=30)
+    old_value = models.CharField(max_length=255, null=True, blank=True)
+    new_value = models.CharField(max_length=255, null=True, blank=True)
+
+    class Meta:
+        db_table = 'EmployeeBulkEditChange'
+
+    def __str__(self):
+        return f"{self.employee_id}.{self.field}: {self.old_value} -> {self.new_value}"
+
+
+# ----------------------------------------------------------------------
+# MAPPING SUGGESTIONS (see humanresource.matching)
+# ----------------------------------------------------------------------
+
+class MappingSuggestion(models.Model):
+    """A proposed EmployeeMapping from fuzzy name matching (see humanresource.matching).
+
+    Rejected pairs are kept so the matcher does not propose them again.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('approved', 'Approved'),
+        ('rejected', 'Rejected'),
+    ]
+    payroll_employee_id = models.CharField(max_length=50)
+    bio_name = models.CharField(max_length=150)
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='mapping_suggestions')
+    score = models.DecimalField(max_digits=4, decimal_places=3)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    created_at = models.DateTimeField(auto_now_add=True)
+    decided_by = models.CharField(max_length=100, blank=True, default='')
+    decided_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'MappingSuggestion'
+        ordering = ['-score', 'payroll_employee_id']
+        constraints = [
+            models.UniqueConstraint(fields=['payroll_employee_id', 'employee'], name='mapping_suggestion_pair_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'score'], name='mapping_suggestion_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.payroll_employee_id} ({self.bio_name}) -> {self.employee_id} [{self.score}, {self.status}]"
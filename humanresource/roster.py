@@ -0,0 +1,232 @@
+"""Shift roster: which ShiftSchedule an employee works on a given day.
+
+Crews rotate weekly, so a payroll ID's schedule comes from its own
+RosterAssignments and those of the crews it belongs to (CrewMembership). For
+each employee, RosterIndex flattens all of them into one sorted list of
+non-overlapping date segments, a Timeline. A lookup is then a bisect: O(log n)
+in the number of roster changes, whatever the length of the period.
+
+Precedence: a personal assignment beats a crew assignment, and among
+assignments of the same kind the one created last (highest id) wins for the
+days they share. Crew assignments only count while the employee is a member.
+
+build_daily_summary takes a schedule_for(day) callable, so lateness and
+undertime are measured against the roster in the same pass that totals the
+hours; one roster query covers a whole batch of employees.
+"""
+from bisect import bisect_right
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from . import attendance_cache
+from .models import CrewMembership, RosterAssignment
+from .signals import roster_changed
+
+OPEN_END = date.max
+
+
+class RosterError(Exception):
+    """The roster change is not valid (bad dates, nothing to assign to...)."""
+
+
+# ----------------------------------------------------------------------
+# INTERVAL INDEX
+# ----------------------------------------------------------------------
+
+class Timeline:
+    """Non-overlapping [start, end] date segments, each with a value, sorted by start."""
+
+    def __init__(self):
+        self.starts = []
+        self.segments = [] # (start, end, value), parallel to starts
+
+    def paint(self, start, end, value):
+        """Set value on [start, end], overriding whatever the segments held there."""
+        if start > end:
+            return
+        kept = []
+        for seg_start, seg_end, seg_value in self.segments:
+            if seg_end < start or seg_start > end:
+                kept.append((seg_start, seg_end, seg_value))
+                continue
+            if seg_start < start:
+                kept.append((seg_start, start - timedelta(days=1), seg_value))
+            if seg_end > end:
+                kept.append((end + timedelta(days=1), seg_end, seg_value))
+        kept.append((start, end, value))
+        kept.sort(key=lambda segment: segment[0])
+        self.segments = kept
+        self.starts = [segment[0] for segment in kept]
+
+    def at(self, day):
+        index = bisect_right(self.starts, day) - 1
+        if index >= 0 and self.segments[index][1] >= day:
+            return self.segments[index][2]
+        return None
+
+    def __bool__(self):
+        return bool(self.segments)
+
+
+class RosterIndex:
+    """Timelines for a set of payroll IDs over a date window, loaded with one query."""
+
+    def __init__(self, timelines=None):
+        self.timelines = timelines or {}
+
+    @classmethod
+    def for_employees(cls, employee_ids, start_date, end_date):
+        employee_ids = list(employee_ids)
+        in_window = Q(start_date__lte=end_date) & (Q(end_date__isnull=True) | Q(end_date__gte=start_date))
+        # Personal assignments, plus one row per (crew assignment, member among employee_ids);
+        # the membership columns come from the same join the filter uses
+        rows = (
+            RosterAssignment.objects.filter(in_window)
+            .filter(
+                Q(payroll_employee_id__in=employee_ids)
+                | Q(
+                    crew__memberships__payroll_employee_id__in=employee_ids,
+                    crew__memberships__start_date__lte=end_date,
+                )
+            )
+            .annotate(
+                member_id=F('crew__memberships__payroll_employee_id'),
+                member_start=F('crew__memberships__start_date'),
+                member_end=F('crew__memberships__end_date'),
+            )
+            .select_related('schedule')
+            .order_by('id')
+        )
+
+        personal, crew = [], []
+        for assignment in rows:
+            if assignment.crew_id is None:
+                personal.append((assignment.payroll_employee_id, assignment.start_date, assignment.end_date or OPEN_END, assignment.schedule))
+            elif assignment.member_id:
+                crew.append((
+                    assignment.member_id,
+                    max(assignment.start_date, assignment.member_start),
+                    min(assignment.end_date or OPEN_END, assignment.member_end or OPEN_END),
+                    assignment.schedule,
+                ))
+
+        timelines = {}
+        for emp_id, start, end, schedule in crew + personal:
+            timelines.setdefault(emp_id, Timeline()).paint(start, end, schedule)
+        return cls(timelines)
+
+    def schedule_on(self, employee_id, day):
+        timeline = self.timelines.get(employee_id)
+        return timeline.at(day) if timeline else None
+
+    def schedule_for(self, employee_id):
+        """A day -> ShiftSchedule callable for build_daily_summary, or None when the employee is not rostered."""
+        timeline = self.timelines.get(employee_id)
+        return timeline.at if timeline else None
+
+
+# ----------------------------------------------------------------------
+# CHANGES
+# ----------------------------------------------------------------------
+
+def _notify(employee_ids, start_date, end_date):
+    """Invalidate cached summaries and let other apps recompute the affected employees and days."""
+    attendance_cache.bump_data_version()
+    employee_ids = set(employee_ids)
+    if employee_ids:
+        roster_changed.send(
+            sender=RosterAssignment, employee_ids=employee_ids,
+            start_date=start_date, end_date=end_date or timezone.localdate(),
+        )
+
+
+def _crew_members(crew, start_date, end_date):
+    members = CrewMembership.objects.filter(crew=crew, start_date__lte=end_date or OPEN_END).filter(
+        Q(end_date__isnull=True) | Q(end_date__gte=start_date)
+    )
+    return set(members.values_list('payroll_employee_id', flat=True))
+
+
+def _check_dates(start_date, end_date):
+    if start_date is None:
+        raise RosterError("Enter a start date.")
+    if end_date is not None and end_date < start_date:
+        raise RosterError("The end date is before the start date.")
+
+
+def assign_schedule(schedule, start_date, end_date=None, crew=None, payroll_employee_id=''):
+    """Put a crew or one payroll ID on a schedule from start_date to end_date (open-ended when None)."""
+    _check_dates(start_date, end_date)
+    if bool(crew) == bool(payroll_employee_id):
+        raise RosterError("Assign the schedule to either a crew or one payroll ID.")
+    assignment = RosterAssignment.objects.create(
+        schedule=schedule, crew=crew, payroll_employee_id=payroll_employee_id or '',
+        start_date=start_date, end_date=end_date,
+    )
+    employees = _crew_members(crew, start_date, end_date) if crew else {payroll_employee_id}
+    _notify(employees, start_date, end_date)
+    return assignment
+
+
+def delete_assignment(assignment_id):
+    assignment = RosterAssignment.objects.select_related('crew').get(pk=assignment_id)
+    employees = (
+        _crew_members(assignment.crew, assignment.start_date, assignment.end_date)
+        if assignment.crew else {assignment.payroll_employee_id}
+    )
+    assignment.delete()
+    _notify(employees, assignment.start_date, assignment.end_date)
+
+
+def add_crew_members(crew, employee_ids, start_date):
+    """Move payroll IDs into a crew from start_date; their open memberships elsewhere end the day before."""
+    employee_ids = sorted({emp_id for emp_id in employee_ids if emp_id})
+    if not employee_ids:
+        raise RosterError("Enter at least one payroll ID.")
+    _check_dates(start_date, None)
+    with transaction.atomic():
+        CrewMembership.objects.filter(
+            payroll_employee_id__in=employee_ids, end_date__isnull=True, start_date__lt=start_date,
+        ).update(end_date=start_date - timedelta(days=1))
+        # Memberships that would start on or after the move are replaced by it
+        CrewMembership.objects.filter(payroll_employee_id__in=employee_ids, start_date__gte=start_date).delete()
+        CrewMembership.objects.bulk_create([
+            CrewMembership(crew=crew, payroll_employee_id=emp_id, start_date=start_date)
+            for emp_id in employee_ids
+        ])
+    _notify(employee_ids, start_date, None)
+    return len(employee_ids)
+
+
+def rotate_crews(crews, schedules, start_date, weeks):
+    """Weekly rotation: in week w, crews[i] works schedules[(i + w) % len(schedules)].
+
+    Returns the number of RosterAssignments created.
+    """
+    if not crews or not schedules:
+        raise RosterError("Pick at least one crew and one schedule.")
+    if weeks < 1:
+        raise RosterError("Rotate for at least one week.")
+    _check_dates(start_date, None)
+
+    assignments = []
+    for week in range(weeks):
+        week_start = start_date + timedelta(weeks=week)
+        for index, crew in enumerate(crews):
+            assignments.append(RosterAssignment(
+                schedule=schedules[(index + week) % len(schedules)], crew=crew,
+                start_date=week_start, end_date=week_start + timedelta(days=6),
+            ))
+    RosterAssignment.objects.bulk_create(assignments)
+
+    end_date = start_date + timedelta(weeks=weeks, days=-1)
+    members = set(
+        CrewMembership.objects.filter(crew__in=crews, start_date__lte=end_date)
+        .filter(Q(end_date__isnull=True) | Q(end_date__gte=start_date))
+        .values_list('payroll_employee_id', flat=True)
+    )
+    _notify(members, start_date, end_date)
+    return len(assignments)
@@ -0,0 +1,164 @@
+"""Tokenized full-text search over Employee master data.
+
+Each indexed profile field is split into lowercase alphanumeric tokens and stored
+in EmployeeSearchToken with a per-field weight. A query matches employees that
+have a token starting with every query term; the score is the sum, per term, of
+the best field weight that matched.
+"""
+import re
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Max, Q, Value, When
+
+from .models import Employee, EmployeeSearchToken
+
+# Employee field -> weight. Government IDs are near-unique, so they rank highest.
+SEARCH_FIELDS = {
+    'tin': 10,
+    'sss_no': 10,
+    'philhealth_no': 10,
+    'pagibig_no': 10,
+    'license_no': 8,
+    'last_name': 5,
+    'first_name': 5,
+    'middle_name': 3,
+    'position': 3,
+    'section': 3,
+    'department': 3,
+    'classification': 2,
+    'spouse_name': 2,
+}
+
+TOKEN_RE = re.compile(r'[0-9a-z]+')
+MAX_TOKEN_LENGTH = 100
+MAX_QUERY_TERMS = 6
+DEFAULT_LIMIT = 50
+REBUILD_BATCH_SIZE = 500
+
+
+def tokenize(text):
+    """Split text into index tokens.
+
+    Numbers written with separators ("123-456-789") also yield their compact form
+    so a search works with or without dashes.
+    """
+    parts = TOKEN_RE.findall((text or '').lower())
+    tokens = set(parts)
+    if len(parts) > 1 and all(part.isdigit() for part in parts):
+        tokens.add(''.join(parts))
+    return {token[:MAX_TOKEN_LENGTH] for token in tokens}
+
+
+def query_terms(query):
+    """Turn a search string into the prefix terms that must all match."""
+    terms = []
+    for word in (query or '').lower().split():
+        parts = TOKEN_RE.findall(word)
+        if len(parts) > 1 and all(part.isdigit() for part in parts):
+            terms.append(''.join(parts))
+        else:
+            terms.extend(parts)
+    return list(dict.fromkeys(terms))[:MAX_QUERY_TERMS]
+
+
+def _tokens_for(employee):
+    tokens = {}
+    for field, weight in SEARCH_FIELDS.items():
+        for token in tokenize(getattr(employee, field)):
+            # Keep the best-weighted field when two fields share a token
+            if weight > tokens.get(token, ('', 0))[1]:
+                tokens[token] = (field, weight)
+    return [
+        EmployeeSearchToken(token=token, employee_id=employee.pk, field=field, weight=weight)
+        for token, (field, weight) in tokens.items()
+    ]
+
+
+def index_employee(employee):
+    """Replace the index entries of one employee (called after each profile save)."""
+    with transaction.atomic():
+        EmployeeSearchToken.objects.filter(employee_id=employee.pk).delete()
+        EmployeeSearchToken.objects.bulk_create(_tokens_for(employee))
+
+
+def index_employees(employees):
+    """Reindex a batch of employees with one delete and one bulk insert."""
+    employees = list(employees)
+    if not employees:
+        return 0
+    entries = [entry for employee in employees for entry in _tokens_for(employee)]
+    with transaction.atomic():
+        EmployeeSearchToken.objects.filter(employee_id__in=[e.pk for e in employees]).delete()
+        EmployeeSearchToken.objects.bulk_create(entries, batch_size=1000)
+    return len(entries)
+
+
+def rebuild_index(batch_size=REBUILD_BATCH_SIZE, progress=None):
+    """Rebuild the whole index, streaming employees in batches.
+
+    One transaction, so searches meanwhile keep seeing the old index instead of
+    an empty or half-built one.
+    """
+    fields = ['pk', *SEARCH_FIELDS]
+    batch, indexed, total_tokens = [], 0, 0
+    with transaction.atomic():
+        EmployeeSearchToken.objects.all().delete()
+        for employee in Employee.objects.only(*fields).order_by('pk').iterator(chunk_size=batch_size):
+            batch.append(employee)
+            if len(batch) >= batch_size:
+                total_tokens += index_employees(batch)
+                indexed += len(batch)
+                batch = []
+                if progress:
+                    progress(indexed)
+        total_tokens += index_employees(batch)
+        indexed += len(batch)
+    return indexed, total_tokens
+
+
+def search_employees(query, limit=DEFAULT_LIMIT):
+    """Return (employee, score, matched_fields) tuples, best match first.
+
+    A fixed three queries regardless of roster size: one aggregate over the token
+    index, one for the fields that matched, one to load the profiles.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return []
+
+    prefix_filter = Q()
+    for term in terms:
+        prefix_filter |= Q(token__startswith=term)
+
+    # term_N = best weight among this employee's tokens starting with term N (0 = no match)
+    term_scores = {
+        f'term_{i}': Max(Case(
+            When(token__startswith=term, then='weight'),
+            default=Value(0),
+            output_field=IntegerField(),
+        ))
+        for i, term in enumerate(terms)
+    }
+    hits = (
+        EmployeeSearchToken.objects.filter(prefix_filter)
+        .values('employee_id')
+        .annotate(**term_scores)
+        .filter(**{f'{name}__gt': 0 for name in term_scores})
+        .annotate(score=sum((F(name) for name in term_scores), Value(0)))
+        .order_by('-score', 'employee_id')[:limit]
+    )
+    ranked = [(hit['employee_id'], hit['score']) for hit in hits]
+    if not ranked:
+        return []
+
+    matched_fields = {}
+    for employee_id, field in EmployeeSearchToken.objects.filter(
+        prefix_filter, employee_id__in=[pk for pk, _ in ranked]
+    ).values_list('employee_id', 'field'):
+        matched_fields.setdefault(employee_id, set()).add(field)
+
+    employees = Employee.objects.select_related('mapping').in_bulk([pk for pk, _ in ranked])
+    return [
+        (employees[pk], score, sorted(matched_fields.get(pk, ())))
+        for pk, score in ranked if pk in employees
+    ]
@@ -0,0 +1,27 @@
+"""Signals other apps use to keep derived data in step with HR data.
+
+Receivers are connected in their app's AppConfig.ready(). All of them get
+keyword arguments only:
+
+payroll_ingested  -- an upload added PayrollRecords.
+                     employee_ids (set of payroll IDs), start_date, end_date (log dates), history_id
+payroll_deleted   -- PayrollRecords were removed.
+                     employee_ids, start_date, end_date, history_id; after a full clear
+                     employee_ids and the dates are None
+employee_profile_changed -- an HR profile was created or edited (department, rates...).
+                     employee (Employee), payroll_employee_id
+employee_profiles_changed -- many HR profiles were created or edited at once (bulk import).
+                     payroll_employee_ids (set)
+attendance_corrected -- a punch correction was added or revoked for one employee.
+                     payroll_employee_id, start_date, end_date (the punch dates involved)
+roster_changed    -- shift schedules changed for some employees (see roster.py).
+                     employee_ids, start_date, end_date
+"""
+from django.dispatch import Signal
+
+payroll_ingested = Signal()
+payroll_deleted = Signal()
+employee_profile_changed = Signal()
+employee_profiles_changed = Signal()
+attendance_corrected = Signal()
+roster_changed = Signal()
@@ -0,0 +1,36 @@
+
+    document.addEventListener('DOMContentLoaded', function() {
+        const searchInput = document.querySelector('.search-input[data-suggest-url]');
+        if (!searchInput) {
+            return;
+        }
+        const suggestions = document.getElementById(searchInput.getAttribute('list'));
+        let debounceTimer = null;
+        let lastQuery = '';
+
+        searchInput.addEventListener('input', function() {
+            const query = searchInput.value.trim();
+            clearTimeout(debounceTimer);
+
+            // Wait for a short pause in typing before asking the server
+            debounceTimer = setTimeout(function() {
+                if (!query || query === lastQuery) {
+                    return;
+                }
+                lastQuery = query;
+
+                const url = searchInput.dataset.suggestUrl + '?q=' + encodeURIComponent(query);
+                fetch(url, { headers: { 'Accept': 'application/json' } })
+                    .then(function(response) { return response.ok ? response.json() : { results: [] }; })
+                    .then(function(data) {
+                        suggestions.innerHTML = '';
+                        data.results.forEach(function(employee) {
+                            const option = document.createElement('option');
+                            option.value = employee.employee_id;
+                            option.label = employee.name + ' (' + employee.department + ')';
+                            suggestions.appendChild(option);
+                        });
+                    });
+            }, 150);
+        });
+    });
@@ -0,0 +1,127 @@
+from django.db.models import Count, Max, Min, OuterRef, Subquery
+
+from .models import EmployeeMapping, PayrollEmployeeSummary, PayrollRecord, PunchCorrection
+
+# Keep IN (...) lists well below the placeholder limits of MySQL/SQLite
+SUMMARY_BATCH_SIZE = 500
+
+
+def _chunks(items, size=SUMMARY_BATCH_SIZE):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _correction_revisions(employee_ids):
+    """{payroll ID: revision} as the corrections left it: one bump per correction made and per correction revoked."""
+    counts = (
+        PunchCorrection.objects.filter(payroll_employee_id__in=employee_ids)
+        .order_by()
+        .values('payroll_employee_id')
+        .annotate(made=Count('id'), revoked=Count('revoked_at'))
+    )
+    return {row['payroll_employee_id']: row['made'] + row['revoked'] for row in counts}
+
+
+def refresh_payroll_summaries(employee_ids):
+    """Recompute PayrollEmployeeSummary rows for the given payroll IDs.
+
+    Called after an upload or a delete with only the IDs that were touched, so the
+    cost grows with the size of the change rather than the size of PayrollRecord.
+    IDs whose logs are all gone lose their summary unless an HR profile is mapped;
+    when their logs come back, the new row gets the revision their punch
+    corrections had given it, so readers keyed on revision still see them.
+    """
+    employee_ids = {emp_id for emp_id in employee_ids if emp_id}
+    if not employee_ids:
+        return 0
+
+    latest_name = PayrollRecord.objects.filter(
+        employee_id=OuterRef('employee_id')
+    ).order_by('-log_date', '-log_time').values('employee_name')[:1]
+
+    refreshed = 0
+    for batch in _chunks(sorted(employee_ids)):
+        stats = {
+            row['employee_id']: row
+            for row in PayrollRecord.objects.filter(employee_id__in=batch)
+            .order_by()
+            .values('employee_id')
+            .annotate(
+                first_log=Min('log_date'),
+                last_log=Max('log_date'),
+                total=Count('id'),
+                bio_name=Subquery(latest_name),
+            )
+        }
+        existing = {s.payroll_employee_id: s for s in PayrollEmployeeSummary.objects.filter(payroll_employee_id__in=batch)}
+        mapped = dict(
+            EmployeeMapping.objects.filter(payroll_employee_id__in=batch).values_list('payroll_employee_id', 'employee_id')
+        )
+
+        to_create, to_update, to_delete = [], [], []
+        for emp_id in batch:
+            row = stats.get(emp_id)
+            summary = existing.get(emp_id)
+
+            if row is None and emp_id not in mapped:
+                if summary:
+                    to_delete.append(summary.pk)
+                continue
+
+            if summary is None:
+                summary = PayrollEmployeeSummary(payroll_employee_id=emp_id)
+                to_create.append(summary)
+            else:
+                to_update.append(summary)
+
+            summary.employee_id = mapped.get(emp_id)
+            if row:
+                summary.bio_name = (row['bio_name'] or '').strip()
+                summary.first_log_date = row['first_log']
+                summary.last_log_date = row['last_log']
+                summary.record_count = row['total']
+            else:
+                summary.first_log_date = summary.last_log_date = None
+                summary.record_count = 0
+
+        if to_create:
+            revisions = _correction_revisions([summary.payroll_employee_id for summary in to_create])
+            for summary in to_create:
+                summary.revision = revisions.get(summary.payroll_employee_id, 0)
+            PayrollEmployeeSummary.objects.bulk_create(to_create)
+        if to_update:
+            PayrollEmployeeSummary.objects.bulk_update(
+                to_update, ['employee', 'bio_name', 'first_log_date', 'last_log_date', 'record_count']
+            )
+        if to_delete:
+            PayrollEmployeeSummary.objects.filter(pk__in=to_delete).delete()
+        refreshed += len(to_create) + len(to_update)
+
+    return refreshed
+
+
+def link_payroll_summary(payroll_employee_id, employee):
+    """Point the summary row of a payroll ID at its (newly) mapped HR profile."""
+    PayrollEmployeeSummary.objects.filter(employee=employee).exclude(
+        payroll_employee_id=payroll_employee_id
+    ).update(employee=None)
+    PayrollEmployeeSummary.objects.update_or_create(
+        payroll_employee_id=payroll_employee_id,
+        defaults={'employee': employee},
+    )
+
+
+def link_payroll_summaries(pairs):
+    """link_payroll_summary for many newly mapped (payroll ID, employee) pairs with bulk writes."""
+    employees = dict(pairs)
+    if not employees:
+        return
+    summaries = list(PayrollEmployeeSummary.objects.filter(payroll_employee_id__in=list(employees)))
+    for summary in summaries:
+        summary.employee = employees.pop(summary.payroll_employee_id)
+    PayrollEmployeeSummary.objects.bulk_update(summaries, ['employee'], batch_size=SUMMARY_BATCH_SIZE)
+    PayrollEmployeeSummary.objects.bulk_create([
+        PayrollEmployeeSummary(payroll_employee_id=payroll_id, employee=employee)
+        for payroll_id, employee in employees.items()
+    ], batch_size=SUMMARY_BATCH_SIZE)
@@ -0,0 +1,126 @@
+"""Synthetic biometric device exports for load testing and benchmarks.
+
+Writes the fixed-width layout PayrollUploadView parses:
+
+    [0:8] sequence  [8:18] payroll ID  [19:33] name  [36] log code
+    [38:48] date (YYYY/MM/DD)  [49:57] time (HH:MM:SS)
+
+The workforce is a deterministic (seeded) mix of day, split-day and night-shift
+crews. Night shifts punch out the next morning (cross-midnight attribution),
+some days carry overtime (codes 5/6), some are absences, and individual punches
+go missing at a configurable rate.
+"""
+import calendar
+import random
+from datetime import date, datetime, timedelta
+
+HEADER = 'No.     EnNo       Name           Md Cd Date       Time'
+
+FIRST_NAMES = (
+    'JUAN', 'JOSE', 'MARIA', 'ANA', 'PEDRO', 'ROSA', 'CARLO', 'LIZA', 'RAMON', 'NORA',
+    'ELMER', 'JOY', 'ARNEL', 'GRACE', 'DANTE', 'MYLENE', 'ROEL', 'CHERRY', 'JUNJUN', 'LORNA',
+)
+LAST_NAMES = (
+    'DELA CRUZ', 'SANTOS', 'REYES', 'GARCIA', 'BAUTISTA', 'OCAMPO', 'MENDOZA', 'TORRES',
+    'VILLANUEVA', 'RAMOS', 'AQUINO', 'CASTILLO', 'FLORES', 'NAVARRO', 'PASCUAL', 'SALAZAR',
+    'GUEVARRA', 'BUGAY', 'LOPEZ', 'MORALES',
+)
+
+# Crew -> share of the workforce
+SHIFT_MIX = (
+    ('day', 0.65),       # 0 AM_IN ~07:50, 3 PM_OUT ~17:05
+    ('split', 0.15),     # 0, 1 lunch out, 2 lunch in, 3
+    ('night', 0.20),     # 2 PM_IN ~21:50, 3 PM_OUT ~06:05 the next day
+)
+
+
+def format_row(sequence, employee_id, name, code, moment):
+    return f"{sequence:<8}{employee_id:<10} {name[:14]:<14}   {code} {moment:%Y/%m/%d} {moment:%H:%M:%S}"
+
+
+def month_ranges(start, months):
+    """(first_day, last_day) of `months` consecutive calendar months beginning with start's month."""
+    year, month = start.year, start.month
+    ranges = []
+    for _ in range(months):
+        ranges.append((date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return ranges
+
+
+class Workforce:
+    """A seeded set of employees; the same seed always yields the same people and punches."""
+
+    def __init__(self, employees, seed=0, first_id=1):
+        rng = random.Random(seed)
+        shifts, weights = zip(*SHIFT_MIX)
+        self.seed = seed
+        self.people = []
+        for number in range(first_id, first_id + employees):
+            self.people.append({
+                'employee_id': f"{number:09d}",
+                'name': f"{rng.choice(LAST_NAMES)}, {rng.choice(FIRST_NAMES)}",
+                'shift': rng.choices(shifts, weights)[0],
+                'rest_weekday': 6 if rng.random() < 0.85 else rng.randrange(7), # Mostly Sundays off
+                'punctuality': rng.uniform(0.0, 1.0), # Higher -> later arrivals
+            })
+
+    def punches(self, day, rng, missing_rate=0.02, absence_rate=0.03, ot_rate=0.15):
+        """(employee_id, name, code, datetime) punches for shifts starting on `day`."""
+        for person in self.people:
+            if day.weekday() == person['rest_weekday'] or rng.random() < absence_rate:
+                continue
+
+            base = datetime.combine(day, datetime.min.time())
+            late = timedelta(minutes=rng.gauss(person['punctuality'] * 20 - 12, 8))
+            jitter = lambda spread: timedelta(minutes=rng.uniform(-spread, spread))
+
+            if person['shift'] == 'night':
+                shift = [('2', base + timedelta(hours=22) + late),
+                         ('3', base + timedelta(days=1, hours=6) + jitter(10))]
+                overtime_start = shift[-1][1] + timedelta(minutes=20)
+            else:
+                shift = [('0', base + timedelta(hours=8) + late)]
+                if person['shift'] == 'split':
+                    shift += [('1', base + timedelta(hours=12) + jitter(5)),
+                              ('2', base + timedelta(hours=13) + jitter(5))]
+                shift.append(('3', base + timedelta(hours=17) + jitter(10)))
+                overtime_start = shift[-1][1] + timedelta(minutes=30)
+
+            if rng.random() < ot_rate:
+                shift += [('5', overtime_start + jitter(5)),
+                          ('6', overtime_start + timedelta(hours=rng.choice((2, 3, 4))) + jitter(10))]
+
+            for code, moment in shift:
+                if rng.random() >= missing_rate:
+                    yield person['employee_id'], person['name'], code, moment.replace(microsecond=0)
+
+
+def generate_biolog(workforce, start_date, end_date, missing_rate=0.02, absence_rate=0.03, ot_rate=0.15):
+    """Yield the lines (header first) of one device export covering [start_date, end_date].
+
+    Night shifts starting on end_date still punch out on the following day, so
+    consecutive periods never leave a shift half-open.
+    """
+    # Seeded per period so any month can be regenerated on its own
+    rng = random.Random(f"{workforce.seed}:{start_date}:{end_date}")
+    yield HEADER
+    sequence = 1
+    day = start_date
+    while day <= end_date:
+        # Punches of the shifts starting on one day, in time order
+        for employee_id, name, code, moment in sorted(
+            workforce.punches(day, rng, missing_rate, absence_rate, ot_rate), key=lambda punch: punch[3]
+        ):
+            yield format_row(sequence, employee_id, name, code, moment)
+            sequence += 1
+        day += timedelta(days=1)
+
+
+def write_biolog(fileobj, workforce, start_date, end_date, **rates):
+    """Write an export to a text file object; returns the number of data rows."""
+    rows = -1 # Header
+    for line in generate_biolog(workforce, start_date, end_date, **rates):
+        fileobj.write(line + '\n')
+        rows += 1
+    return rows
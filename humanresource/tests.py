@@ -1,3 +1,915 @@
-from django.test import TestCase
+import importlib
+import io
+import math
+import time as time_module
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from navigation_app.models import UsersAccount
+
+from . import attendance_cache, typeahead
+from .attendance import build_daily_summary, cutoff_period
+from .corrections import add_correction
+from .deletion import clear_payroll_data, delete_upload_records, run_deletion_job
+from .models import (
+    CSVUploadHistory, Crew, DeletionJob, Employee, EmployeeBulkEdit, EmployeeBulkEditChange, EmployeeMapping, EmployeeSearchToken,
+    MappingSuggestion, PayrollEmployeeSummary, PayrollRecord, PunchCorrection, ShiftSchedule,
+)
+from .bulk_edit import apply_bulk_edit, apply_due_bulk_edits
+from .imports import import_employees
+from .matching import find_matches, split_bio_name
+from .roster import RosterIndex, add_crew_members, assign_schedule, rotate_crews
+from .search import index_employees, rebuild_index
+from .signals import employee_profile_changed, payroll_deleted, payroll_ingested
+from .summaries import refresh_payroll_summaries
+from .synthetic import HEADER, Workforce, format_row, generate_biolog
 
 # Create your tests here.
+
+
+@override_settings(HR_BACKGROUND_WORKER='inline')
+class HRTestCase(TestCase):
+    """Logged-in HR client plus helpers for uploading synthetic device exports."""
+
+    @classmethod
+    def setUpTestData(cls):
+        UsersAccount.objects.create(username='hr_test', password='secret', role='hr')
+
+    def setUp(self):
+        self.client.post('/', {'username': 'hr_test', 'password': 'secret', 'role': 'hr'})
+
+    def upload(self, workforce, start_date, end_date, name='biolog.txt'):
+        content = '\n'.join(generate_biolog(workforce, start_date, end_date)) + '\n'
+        self.client.post('/humanresource/payroll-upload/', {
+            'payroll_file': SimpleUploadedFile(name, content.encode()),
+        })
+        return content.count('\n') - 1
+
+
+class SyntheticBiologTests(HRTestCase):
+    def test_export_is_deterministic(self):
+        first = list(generate_biolog(Workforce(20, seed=7), date(2025, 1, 1), date(2025, 1, 31)))
+        second = list(generate_biolog(Workforce(20, seed=7), date(2025, 1, 1), date(2025, 1, 31)))
+        self.assertEqual(first, second)
+
+    def test_every_generated_row_is_accepted_by_the_upload(self):
+        workforce = Workforce(15, seed=3)
+        rows = self.upload(workforce, date(2025, 1, 1), date(2025, 1, 31))
+
+        self.assertEqual(PayrollRecord.objects.count(), rows)
+        self.assertEqual(PayrollEmployeeSummary.objects.count(), 15)
+        self.assertEqual(set(PayrollRecord.objects.values_list('log_code', flat=True)), {'0', '1', '2', '3', '5', '6'})
+
+    def test_night_shift_out_is_attributed_to_the_start_day(self):
+        workforce = Workforce(40, seed=1)
+        night = next(person for person in workforce.people if person['shift'] == 'night')
+        lines = [line for line in generate_biolog(workforce, date(2025, 1, 6), date(2025, 1, 10)) if line[8:18].strip() == night['employee_id']]
+        logs = sorted(
+            ((line[36:37], date.fromisoformat(line[38:48].replace('/', '-')), line[49:57]) for line in lines),
+            key=lambda log: (log[1], log[2]),
+        )
+
+        days = build_daily_summary(logs, date(2025, 1, 6), date(2025, 1, 10))
+        self.assertTrue(any(day['PM_IN'] and day['PM_OUT'] and day['night_shift_hours'].total_seconds() > 6 * 3600 for day in days))
+
+
+class QueryBudgetTests(HRTestCase):
+    """Each HR view must cost the same number of queries whatever the data size.
+
+    Every view is measured at SIZES employees (one month of logs each, every
+    other payroll ID mapped to an HR profile) with all HR caches cold. A failure
+    here usually means a per-employee query crept back into a loop.
+    """
+    SIZES = (8, 40)
+    MONTH = (date(2025, 3, 1), date(2025, 3, 31))
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # Create the version rows so the first write isn't special
+        attendance_cache.bump_data_version()
+        typeahead.invalidate_index()
+
+    def setUp(self):
+        super().setUp()
+        self.seeded = 0
+        # Only HR's own work is budgeted here; subscribers (accounting rollups) run on
+        # the background worker in production and are tested in their own apps
+        for signal in (payroll_ingested, payroll_deleted, employee_profile_changed):
+            self.enterContext(mock.patch.object(signal, 'receivers', []))
+
+    def seed(self, employees):
+        """Grow the data set to `employees` payroll IDs; returns the new Workforce slice."""
+        workforce = Workforce(employees - self.seeded, seed=employees, first_id=self.seeded + 1)
+        self.upload(workforce, *self.MONTH, name=f"seed_{employees}.txt")
+
+        profiles = Employee.objects.bulk_create([
+            Employee(first_name=person['name'].split(', ')[1], last_name=person['name'].split(', ')[0],
+                     department='Milling', position='Operator', tin=f"{index:09d}")
+            for index, person in enumerate(workforce.people[::2], start=self.seeded)
+        ])
+        EmployeeMapping.objects.bulk_create([
+            EmployeeMapping(payroll_employee_id=person['employee_id'], employee=profile)
+            for person, profile in zip(workforce.people[::2], profiles)
+        ])
+        refresh_payroll_summaries(person['employee_id'] for person in workforce.people)
+        index_employees(Employee.objects.filter(pk__in=[profile.pk for profile in profiles]))
+
+        self.seeded = employees
+        return workforce
+
+    def clear_caches(self):
+        for alias in ('default', settings.HR_ATTENDANCE_CACHE, 'template_fragments'):
+            caches[alias].clear()
+
+    def assertConstantQueries(self, expected, url):
+        for employees in self.SIZES:
+            self.seed(employees)
+            with self.subTest(employees=employees):
+                self.clear_caches()
+                with self.assertNumQueries(expected):
+                    response = self.client.get(url(employees) if callable(url) else url)
+                self.assertEqual(response.status_code, 200)
+
+    def test_employee_list(self):
+        self.assertConstantQueries(5, '/humanresource/employee-list/')
+
+    def test_employee_list_sorted_by_hr_name(self):
+        self.assertConstantQueries(5, '/humanresource/employee-list/?sort=name&dir=desc&page=last')
+
+    def test_search_employee(self):
+        self.assertConstantQueries(5, '/humanresource/search_employee/?query=0000000')
+
+    def test_employee_details(self):
+        # The shift roster adds one query on a cache miss (see roster.RosterIndex)
+        self.assertConstantQueries(6, lambda employees: f"/humanresource/employee-details/{employees:09d}/")
+
+    def test_employee_suggest(self):
+        # The index generation is read from the database on every request
+        self.assertConstantQueries(4, '/humanresource/search_employee/suggest/?q=00')
+
+    def test_employee_profile_search(self):
+        self.assertConstantQueries(5, '/humanresource/search_employee/profile/?query=Operator')
+
+    def test_upload(self):
+        # Only the PayrollRecord INSERT batches may grow with the file (SQLite caps
+        # the rows per INSERT; on MySQL the whole file is one INSERT)
+        fields = [field for field in PayrollRecord._meta.concrete_fields if not field.primary_key]
+        for employees in self.SIZES:
+            workforce = Workforce(employees - self.seeded, seed=employees, first_id=self.seeded + 1)
+            content = '\n'.join(generate_biolog(workforce, *self.MONTH)) + '\n'
+            rows = content.count('\n') - 1
+            insert_batches = math.ceil(rows / max(connection.ops.bulk_batch_size(fields, [None] * rows), 1))
+
+            with self.subTest(employees=employees):
+                self.clear_caches()
+                with self.assertNumQueries(11 + insert_batches):
+                    response = self.client.post('/humanresource/payroll-upload/', {
+                        'payroll_file': SimpleUploadedFile(f"upload_{employees}.txt", content.encode()),
+                    })
+                self.assertEqual(response.status_code, 302)
+                self.assertEqual(PayrollRecord.objects.count(), sum(
+                    CSVUploadHistory.objects.values_list('row_count', flat=True)
+                ))
+            self.seeded = employees
+
+    def test_delete_upload(self):
+        for employees in self.SIZES:
+            self.seed(employees)
+            history = CSVUploadHistory.objects.latest('pk')
+            with self.subTest(employees=employees):
+                self.clear_caches()
+                with self.assertNumQueries(23):
+                    response = self.client.post(f"/humanresource/payroll-upload/delete/{history.pk}/")
+                self.assertEqual(response.status_code, 302)
+                self.assertFalse(PayrollRecord.objects.filter(upload_history_id=history.pk).exists())
+
+
+class PunchCorrectionTests(HRTestCase):
+    DAY = date(2025, 3, 10)
+
+    def setUp(self):
+        super().setUp()
+        self.upload_day()
+
+    def upload_day(self):
+        punches = [
+            ('000000001', '0', '07:55:00'), # No OUT: the worker forgot to punch
+            ('000000002', '0', '07:50:00'), ('000000002', '3', '17:00:00'),
+        ]
+        content = '\n'.join([HEADER] + [
+            format_row(sequence, emp_id, f"WORKER {emp_id[-1]}", code, datetime.combine(self.DAY, time.fromisoformat(log_time)))
+            for sequence, (emp_id, code, log_time) in enumerate(punches, start=1)
+        ]) + '\n'
+        self.client.post('/humanresource/payroll-upload/', {'payroll_file': SimpleUploadedFile('day.txt', content.encode())})
+
+    def day_hours(self, employee_id):
+        response = self.client.get(f'/humanresource/employee-details/{employee_id}/?start=2025-03-10&end=2025-03-10')
+        return response.context['daily_summary'][0]['day_shift_hours']
+
+    def test_added_punch_is_merged_and_only_that_employee_is_invalidated(self):
+        self.assertEqual(self.day_hours('000000001').total_seconds(), 0)
+        self.day_hours('000000002') # Cached
+        version = attendance_cache.get_data_version()
+
+        self.client.post('/humanresource/employee-details/000000001/corrections/?date=2025-03-10', {
+            'action': 'add', 'log_code': '3', 'log_date': '2025-03-10', 'log_time': '17:05', 'reason': 'Forgot to punch out',
+        })
+
+        self.assertEqual(PayrollRecord.objects.count(), 3) # Nothing re-ingested
+        self.assertEqual(attendance_cache.get_data_version(), version)
+        self.assertEqual(PayrollEmployeeSummary.objects.get(payroll_employee_id='000000001').revision, 1)
+        self.assertEqual(PayrollEmployeeSummary.objects.get(payroll_employee_id='000000002').revision, 0)
+        self.assertEqual(self.day_hours('000000001').total_seconds(), (9 * 60 + 10) * 60)
+
+        # Revoking restores the device punches (and is kept in the audit trail)
+        correction = PunchCorrection.objects.get()
+        self.client.post('/humanresource/employee-details/000000001/corrections/?date=2025-03-10', {
+            'action': 'revoke', 'correction_id': correction.id, 'reason': 'Entered twice',
+        })
+        self.assertEqual(self.day_hours('000000001').total_seconds(), 0)
+        correction.refresh_from_db()
+        self.assertEqual((correction.revoked_by, correction.revoke_reason), ('hr_test', 'Entered twice'))
+
+    def test_adjust_and_void_need_an_existing_punch(self):
+        url = '/humanresource/employee-details/000000002/corrections/?date=2025-03-10'
+        self.client.post(url, {
+            'action': 'adjust', 'original_code': '0', 'original_time': '07:50:00',
+            'log_code': '0', 'log_time': '06:50:00', 'reason': 'Device clock was an hour late',
+        })
+        self.assertEqual(self.day_hours('000000002').total_seconds(), (10 * 60 + 10) * 60)
+
+        self.client.post(url, {'action': 'void', 'original_code': '3', 'original_time': '12:00:00', 'reason': 'No such punch'})
+        self.assertEqual(PunchCorrection.objects.count(), 1)
+
+    def test_corrections_survive_deleting_and_reuploading_the_logs(self):
+        add_correction('000000001', 'add', 'Forgot to punch out', 'hr_test', punch=('3', self.DAY, '17:05:00'))
+        history = CSVUploadHistory.objects.get()
+        self.client.post(f'/humanresource/payroll-upload/delete/{history.pk}/')
+        self.assertFalse(PayrollEmployeeSummary.objects.filter(payroll_employee_id='000000001').exists())
+
+        self.upload_day()
+
+        self.assertEqual(PayrollEmployeeSummary.objects.get(payroll_employee_id='000000001').revision, 1)
+        self.assertEqual(self.day_hours('000000001').total_seconds(), (9 * 60 + 10) * 60)
+
+
+class ShiftRosterTests(HRTestCase):
+    MONDAY = date(2025, 3, 10)
+
+    def setUp(self):
+        super().setUp()
+        self.day = ShiftSchedule.objects.create(name='Day', start_time=time(6), end_time=time(14))
+        self.swing = ShiftSchedule.objects.create(name='Swing', start_time=time(14), end_time=time(22))
+        self.night = ShiftSchedule.objects.create(name='Night', start_time=time(22), end_time=time(6), grace_minutes=10)
+        self.crew_a = Crew.objects.create(name='A')
+        self.crew_b = Crew.objects.create(name='B')
+        add_crew_members(self.crew_a, ['000000001', '000000002'], self.MONDAY)
+        add_crew_members(self.crew_b, ['000000003'], self.MONDAY)
+
+    def test_weekly_rotation_with_personal_override(self):
+        rotate_crews([self.crew_a, self.crew_b], [self.day, self.swing, self.night], self.MONDAY, weeks=3)
+        assign_schedule(self.night, date(2025, 3, 12), date(2025, 3, 13), payroll_employee_id='000000002')
+        add_crew_members(self.crew_b, ['000000001'], date(2025, 3, 17)) # Moves crews in week 2
+
+        with self.assertNumQueries(1):
+            roster = RosterIndex.for_employees(['000000001', '000000002', '000000003', '000000009'], self.MONDAY, date(2025, 3, 30))
+        schedule = lambda emp_id, day: getattr(roster.schedule_on(emp_id, day), 'name', None)
+
+        self.assertEqual(schedule('000000001', self.MONDAY), 'Day')
+        self.assertEqual(schedule('000000001', date(2025, 3, 17)), 'Night') # Crew B, week 2
+        self.assertEqual(schedule('000000002', date(2025, 3, 17)), 'Swing') # Crew A, week 2
+        self.assertEqual(schedule('000000002', date(2025, 3, 12)), 'Night') # Personal override
+        self.assertEqual(schedule('000000002', date(2025, 3, 14)), 'Day')
+        self.assertEqual(schedule('000000003', date(2025, 3, 24)), 'Day')
+        self.assertIsNone(schedule('000000003', date(2025, 3, 31))) # Rotation over
+        self.assertIsNone(schedule('000000009', self.MONDAY)) # Not rostered
+        self.assertIsNone(roster.schedule_for('000000009'))
+
+    def test_lateness_and_undertime_follow_the_roster(self):
+        assign_schedule(self.night, self.MONDAY, crew=self.crew_a)
+        logs = [
+            ('2', self.MONDAY, '22:25:00'), ('3', self.MONDAY + timedelta(days=1), '05:30:00'), # Night shift
+            ('0', date(2025, 3, 9), '08:20:00'), ('3', date(2025, 3, 9), '16:00:00'), # Before the roster
+        ]
+        roster = RosterIndex.for_employees(['000000001'], date(2025, 3, 9), date(2025, 3, 11))
+        days = {day['date']: day for day in build_daily_summary(logs, schedule_for=roster.schedule_for('000000001'))}
+
+        self.assertEqual((days[self.MONDAY]['schedule'], days[self.MONDAY]['total_minutes_late'], days[self.MONDAY]['undertime_minutes']), ('Night', 15, 30))
+        self.assertEqual((days[date(2025, 3, 9)]['schedule'], days[date(2025, 3, 9)]['undertime_minutes']), (None, 0))
+
+        # The details page recomputes after a roster change
+        content = '\n'.join([HEADER] + [
+            format_row(sequence, '000000001', 'WORKER 1', code, datetime.combine(log_date, time.fromisoformat(log_time)))
+            for sequence, (code, log_date, log_time) in enumerate(logs, start=1)
+        ]) + '\n'
+        self.client.post('/humanresource/payroll-upload/', {'payroll_file': SimpleUploadedFile('night.txt', content.encode())})
+        url = '/humanresource/employee-details/000000001/?start=2025-03-10&end=2025-03-10'
+        self.assertEqual(self.client.get(url).context['daily_summary'][0]['total_minutes_late'], 15)
+        assign_schedule(ShiftSchedule.objects.create(name='Late Night', start_time=time(23), end_time=time(7)), self.MONDAY, payroll_employee_id='000000001')
+        day = self.client.get(url).context['daily_summary'][0]
+        self.assertEqual((day['schedule'], day['total_minutes_late'], day['undertime_minutes']), ('Late Night', 0, 90))
+
+
+class EmployeeImportTests(HRTestCase):
+    HEADER = 'Payroll ID,First Name,Last Name,Department,Position,Monthly/Daily Rate,Date Hired\n'
+
+    def setUp(self):
+        super().setUp()
+        self.upload(Workforce(2, seed=3), date(2025, 3, 3), date(2025, 3, 4))
+        existing = Employee.objects.create(first_name='Old', last_name='Name', department='Milling', position='Helper')
+        EmployeeMapping.objects.create(payroll_employee_id='000000002', employee=existing)
+
+    def test_import_creates_updates_and_reports_errors(self):
+        content = self.HEADER + (
+            '1,Ana,Reyes,Boiler,Fireman,450.00,2020-06-01\n'   # New profile for a logged payroll ID
+            '2,,,,Operator,520,\n'                             # Update: only the filled cells change
+            '3,Ben,Cruz,,,,\n'                                 # New profile without a department
+            '4,Carl,Dizon,Boiler,,abc,2021-13-01\n'            # Bad rate and date
+            '1,Ana,Reyes,Boiler,Fireman,450.00,2020-06-01\n'   # Repeated
+        )
+        response = self.client.post('/humanresource/employee-list/import/', {
+            'employee_file': SimpleUploadedFile('employees.csv', content.encode()),
+        })
+        result = response.context['result']
+        self.assertEqual((result.rows, result.created, result.updated, result.error_count), (5, 1, 1, 3))
+        self.assertEqual([error[0] for error in result.errors], [4, 5, 6])
+        self.assertIn('department', result.errors[0][2])
+
+        ana = EmployeeMapping.objects.get(payroll_employee_id='000000001').employee
+        self.assertEqual((ana.first_name, ana.position, ana.monthly_daily_rate, ana.date_hired), ('Ana', 'Fireman', Decimal('450.00'), date(2020, 6, 1)))
+        self.assertEqual(PayrollEmployeeSummary.objects.get(payroll_employee_id='000000001').employee, ana)
+        self.assertTrue(EmployeeSearchToken.objects.filter(employee_id=ana.pk, token='fireman').exists())
+
+        updated = EmployeeMapping.objects.get(payroll_employee_id='000000002').employee
+        self.assertEqual((updated.first_name, updated.department, updated.position, updated.monthly_daily_rate), ('Old', 'Milling', 'Operator', Decimal('520.00')))
+        self.assertEqual(Employee.objects.count(), 2)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        def run(first_id, rows):
+            content = self.HEADER + ''.join(f'{first_id + row},First{row},Last{row},Milling,,,\n' for row in range(rows))
+            with CaptureQueriesContext(connection) as queries:
+                result = import_employees(io.BytesIO(content.encode()), 'employees.csv')
+            self.assertEqual(result.created, rows)
+            # SQLite splits each bulk INSERT into a few hundred parameters per statement
+            return len([query for query in queries if not query['sql'].startswith('INSERT')])
+
+        self.assertEqual(run(100, 20), run(1000, 300))
+        self.assertEqual(EmployeeMapping.objects.count(), 321)
+
+
+class BulkEditTests(HRTestCase):
+
+    def make_employees(self, count, department='Milling', first=0):
+        employees = Employee.objects.bulk_create([
+            Employee(first_name=f'Worker{first + n}', last_name='Test', department=department, position='Helper', monthly_daily_rate=Decimal('400.00'))
+            for n in range(count)
+        ])
+        EmployeeMapping.objects.bulk_create([
+            EmployeeMapping(payroll_employee_id=f'{first + n + 1:09d}', employee=employee) for n, employee in enumerate(employees)
+        ])
+        return employees
+
+    def test_form_applies_to_filtered_employees_with_audit(self):
+        self.make_employees(3)
+        other = self.make_employees(1, department='Boiler', first=10)[0]
+        self.assertEqual(self.client.get('/humanresource/employee-list/bulk-edit/?department=Milling').context['match_count'], 3)
+        self.client.post('/humanresource/employee-list/bulk-edit/', {
+            'department': 'Milling', 'scope': 'filter', 'action': 'apply',
+            'new_position': 'Mill Operator', 'new_monthly_daily_rate_op': 'percent', 'new_monthly_daily_rate': '7.5',
+            'effective_date': timezone.localdate().isoformat(),
+        })
+
+        edit = EmployeeBulkEdit.objects.get()
+        self.assertEqual((edit.status, edit.employee_count, edit.description), ('applied', 3, 'department=Milling'))
+        self.assertEqual(set(Employee.objects.filter(department='Milling').values_list('position', 'monthly_daily_rate')), {('Mill Operator', Decimal('430.00'))})
+        other.refresh_from_db()
+        self.assertEqual((other.position, other.monthly_daily_rate), ('Helper', Decimal('400.00')))
+        self.assertEqual(EmployeeBulkEditChange.objects.filter(bulk_edit=edit).count(), 6)
+        self.assertEqual(
+            set(EmployeeBulkEditChange.objects.filter(field='monthly_daily_rate').values_list('old_value', 'new_value')),
+            {('400.00', '430.00')},
+        )
+        self.assertEqual(EmployeeSearchToken.objects.filter(token='operator').count(), 3)
+        self.assertContains(self.client.get(f'/humanresource/employee-list/bulk-edit/{edit.pk}/'), '430.00', count=3)
+
+    def test_query_count_does_not_grow_with_selection(self):
+        def run(count, first):
+            employees = self.make_employees(count, department=f'Dept{first}', first=first)
+            edit = EmployeeBulkEdit.objects.create(
+                effective_date=timezone.localdate(), employee_ids=[employee.pk for employee in employees], created_by='hr_test',
+                changes={'section': {'op': 'set', 'value': 'North'}, 'hourly_rate': {'op': 'set', 'value': '60'}},
+            )
+            with CaptureQueriesContext(connection) as queries:
+                apply_bulk_edit(edit.pk)
+            return len([query for query in queries if not query['sql'].startswith('INSERT')])
+
+        # Create the DataVersion rows
+        attendance_cache.bump_data_version()
+        typeahead.invalidate_index()
+        self.assertEqual(run(5, 0), run(150, 100))
+        self.assertEqual(Employee.objects.filter(section='North', hourly_rate=Decimal('60')).count(), 155)
+
+    def test_api_schedules_future_edits(self):
+        employees = self.make_employees(2)
+        effective = timezone.localdate() + timedelta(days=7)
+        response = self.client.post('/humanresource/employee-list/bulk-edit/api/', {
+            'payroll_employee_ids': ['1'], 'effective_date': effective.isoformat(),
+            'changes': {'department': 'Boiler', 'hourly_rate': {'op': 'set', 'value': '55.5'}},
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.json()['status'], response.json()['employee_count']), ('scheduled', 1))
+        self.assertEqual(Employee.objects.filter(department='Boiler').count(), 0)
+
+        self.assertEqual(apply_due_bulk_edits(effective - timedelta(days=1)), 0)
+        self.assertEqual(apply_due_bulk_edits(effective), 1)
+        employees[0].refresh_from_db()
+        self.assertEqual((employees[0].department, employees[0].hourly_rate), ('Boiler', Decimal('55.50')))
+
+        response = self.client.post('/humanresource/employee-list/bulk-edit/api/', {
+            'changes': {'first_name': 'X'},
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_api_id_lists_are_never_split_into_characters(self):
+        employees = self.make_employees(12)
+        url = '/humanresource/employee-list/bulk-edit/api/'
+        changes = {'section': 'North'}
+        response = self.client.post(url, {'employee_ids': str(employees[11].pk), 'changes': changes}, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(list(Employee.objects.filter(section='North').values_list('pk', flat=True)), [employees[11].pk])
+
+        for selection in ({'employee_ids': {'12': 1}}, {'employee_ids': 12}, {'payroll_employee_ids': [True]}):
+            with self.subTest(selection=selection):
+                response = self.client.post(url, {**selection, 'changes': changes}, content_type='application/json')
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(EmployeeBulkEdit.objects.count(), 1)
+
+    def test_rates_must_be_finite_and_fit_the_column(self):
+        employees = self.make_employees(2)
+        Employee.objects.filter(pk=employees[1].pk).update(monthly_daily_rate=Decimal('60000000.00'))
+        for change, error in (
+            ({'op': 'set', 'value': 'NaN'}, 'is not a number'),
+            ({'op': 'set', 'value': 'Infinity'}, 'is not a number'),
+            ({'op': 'percent', 'value': '-inf'}, 'is not a number'),
+            ({'op': 'set', 'value': '1e15'}, 'is too large'),
+            ({'op': 'set', 'value': '99999999.999'}, 'is too large'), # Rounds up to 100000000.00
+            ({'op': 'percent', 'value': '100'}, 'is too large'), # 60,000,000 doubled
+        ):
+            with self.subTest(change=change):
+                response = self.client.post('/humanresource/employee-list/bulk-edit/api/', {
+                    'department': 'Milling', 'changes': {'monthly_daily_rate': change},
+                }, content_type='application/json')
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(error, response.json()['error'])
+        self.assertFalse(EmployeeBulkEdit.objects.exists())
+
+        # A rate that grew after scheduling fails only its own edit
+        too_big = EmployeeBulkEdit.objects.create(
+            effective_date=timezone.localdate(), employee_ids=[employees[1].pk], created_by='hr_test',
+            changes={'monthly_daily_rate': {'op': 'percent', 'value': '100'}},
+        )
+        later = EmployeeBulkEdit.objects.create(
+            effective_date=timezone.localdate(), employee_ids=[employees[0].pk], created_by='hr_test',
+            changes={'position': {'op': 'set', 'value': 'Operator'}},
+        )
+        with self.assertLogs('humanresource.bulk_edit', 'WARNING'):
+            self.assertEqual(apply_due_bulk_edits(), 1)
+        too_big.refresh_from_db()
+        later.refresh_from_db()
+        self.assertEqual((too_big.status, later.status), ('scheduled', 'applied'))
+
+
+class MappingSuggestionTests(HRTestCase):
+    BIO_NAMES = {
+        '000000001': 'DELA CRUZ, JUA', # Cut at 14 characters by the device
+        '000000002': 'REYES, MARIA',
+        '000000003': 'SANTOS, PEDRO',
+        '000000004': 'GARCIA, ANA',
+    }
+
+    def setUp(self):
+        super().setUp()
+        PayrollEmployeeSummary.objects.bulk_create([
+            PayrollEmployeeSummary(payroll_employee_id=payroll_id, bio_name=name, record_count=10)
+            for payroll_id, name in self.BIO_NAMES.items()
+        ])
+        self.juan = Employee.objects.create(first_name='Juan', middle_name='Perez', last_name='Dela Cruz', department='Milling')
+        self.maria = Employee.objects.create(first_name='María', last_name='Reyes', department='Boiler')
+        Employee.objects.create(first_name='Maria', last_name='Ramos', department='Boiler') # Other surname block
+        Employee.objects.create(first_name='Pablo', last_name='Santos', department='Boiler') # Same surname, other person
+        Employee.objects.bulk_create([
+            Employee(first_name=f'Worker{n}', last_name=f'Zulueta{n}', department='Yard') for n in range(50)
+        ])
+
+    def test_blocking_finds_matches_without_comparing_every_pair(self):
+        matches, compared = find_matches()
+        self.assertEqual({(payroll_id, pk) for _, payroll_id, _, pk in matches}, {('000000001', self.juan.pk), ('000000002', self.maria.pk)})
+        self.assertLess(compared, 10) # Not 4 bio names x 54 profiles
+        self.assertEqual(split_bio_name('DELA CRUZ, JUAN P'), ('JUAN', 'P', 'DELA CRUZ'))
+
+    def test_bulk_approve_and_reject(self):
+        url = '/humanresource/employee-list/mapping-suggestions/'
+        self.client.post(url, {'action': 'suggest'})
+        juan, maria = MappingSuggestion.objects.get(employee=self.juan), MappingSuggestion.objects.get(employee=self.maria)
+        self.assertContains(self.client.get(url), 'DELA CRUZ, JUA')
+
+        self.client.post(url, {'action': 'reject', 'suggestion_ids': [maria.pk]})
+        self.client.post(url, {'action': 'approve_above', 'min_score': '0.9'})
+
+        self.assertEqual(EmployeeMapping.objects.get(payroll_employee_id='000000001').employee, self.juan)
+        self.assertEqual(PayrollEmployeeSummary.objects.get(payroll_employee_id='000000001').employee, self.juan)
+        self.assertFalse(EmployeeMapping.objects.filter(payroll_employee_id='000000002').exists())
+
+        # A rejected pair is not proposed again
+        self.client.post(url, {'action': 'suggest'})
+        self.assertFalse(MappingSuggestion.objects.filter(status='pending').exists())
+        self.assertEqual(set(MappingSuggestion.objects.values_list('status', flat=True)), {'approved', 'rejected'})
+        self.assertEqual(juan.payroll_employee_id, '000000001')
+
+
+class TypeaheadTests(HRTestCase):
+    def make_summaries(self, bio_names):
+        PayrollEmployeeSummary.objects.bulk_create([
+            PayrollEmployeeSummary(payroll_employee_id=f"{number:09d}", bio_name=bio_name, record_count=1)
+            for number, bio_name in enumerate(bio_names, start=1)
+        ])
+        typeahead.invalidate_index()
+
+    def suggest(self, query, limit=10):
+        response = self.client.get('/humanresource/search_employee/suggest/', {'q': query, 'limit': limit})
+        return [result['employee_id'] for result in response.json()['results']]
+
+    def test_ids_rank_before_full_names_before_name_parts(self):
+        self.make_summaries(['CRUZ, JUAN', 'JUAN DELA', 'DELA CRUZ, JUANITO'])
+        self.assertEqual(self.suggest('juan'), ['000000002', '000000001', '000000003'])
+        self.assertEqual(self.suggest('3'), ['000000003'])
+        self.assertEqual(self.suggest('juan', limit=1), ['000000002'])
+
+    def test_one_letter_query_ranks_the_whole_prefix_range(self):
+        # 30 name-part keys ('aaa..') sort before the only full-name match ('azul')
+        self.make_summaries([f"ZED AAA{number:02d}" for number in range(30)] + ['AZUL'])
+        self.assertEqual(self.suggest('a', limit=1), ['000000031'])
+        self.assertEqual(len(self.suggest('a', limit=50)), 31)
+
+    def test_invalidation_is_seen_through_the_database(self):
+        self.make_summaries(['CRUZ, JUAN'])
+        self.assertEqual(self.suggest('pedro'), [])
+        built = typeahead._index
+
+        # What an upload in another process does: new rows plus a bump of the shared generation
+        PayrollEmployeeSummary.objects.create(payroll_employee_id='000000002', bio_name='PEDRO SANTOS', record_count=1)
+        typeahead.invalidate_index()
+        self.assertIs(typeahead._index, built) # Nothing in this process was touched
+        self.assertEqual(self.suggest('pedro'), ['000000002'])
+
+        self.upload(Workforce(3, seed=4, first_id=50), date(2025, 3, 3), date(2025, 3, 7))
+        self.assertEqual(self.suggest('000000051'), ['000000051'])
+
+
+class EmployeeListTests(HRTestCase):
+    WEEK = (date(2025, 3, 3), date(2025, 3, 9))
+
+    def setUp(self):
+        super().setUp()
+        self.upload(Workforce(60, seed=2), *self.WEEK)
+        self.payroll_ids = sorted(set(PayrollRecord.objects.values_list('employee_id', flat=True)))
+
+    def test_summary_rows_match_the_logs(self):
+        self.assertEqual(list(PayrollEmployeeSummary.objects.order_by('payroll_employee_id').values_list(
+            'payroll_employee_id', flat=True)), self.payroll_ids)
+        for summary in PayrollEmployeeSummary.objects.all()[:5]:
+            logs = PayrollRecord.objects.filter(employee_id=summary.payroll_employee_id)
+            latest = logs.order_by('-log_date', '-log_time').first()
+            self.assertEqual(summary.record_count, logs.count())
+            self.assertEqual(summary.first_log_date, logs.order_by('log_date').first().log_date)
+            self.assertEqual(summary.last_log_date, latest.log_date)
+            self.assertEqual(summary.bio_name, latest.employee_name.strip())
+
+    def test_roster_is_paged_and_sorted(self):
+        page = self.client.get('/humanresource/employee-list/').context['page_obj']
+        self.assertEqual(page.paginator.count, len(self.payroll_ids))
+        self.assertEqual([summary.payroll_employee_id for summary in page.object_list], self.payroll_ids[:50])
+
+        page = self.client.get('/humanresource/employee-list/?sort=id&dir=desc&page=2').context['page_obj']
+        self.assertEqual([summary.payroll_employee_id for summary in page.object_list], self.payroll_ids[::-1][50:])
+
+        # Mapped HR names sort before the unmapped IDs when descending
+        employee = Employee.objects.create(first_name='Ana', last_name='Abad', department='Mill')
+        EmployeeMapping.objects.create(payroll_employee_id=self.payroll_ids[6], employee=employee)
+        refresh_payroll_summaries([self.payroll_ids[6]])
+        attendance_cache.bump_data_version()
+        page = self.client.get('/humanresource/employee-list/?sort=name&dir=desc').context['page_obj']
+        self.assertEqual(page.object_list[0].employee, employee)
+
+    def test_deleting_the_upload_keeps_only_mapped_summaries(self):
+        employee = Employee.objects.create(first_name='Ana', last_name='Abad', department='Mill')
+        EmployeeMapping.objects.create(payroll_employee_id=self.payroll_ids[0], employee=employee)
+        self.client.post(f"/humanresource/payroll-upload/delete/{CSVUploadHistory.objects.get().pk}/")
+
+        summary = PayrollEmployeeSummary.objects.get()
+        self.assertEqual((summary.payroll_employee_id, summary.record_count, summary.employee), (self.payroll_ids[0], 0, employee))
+
+
+class ProfileSearchTests(HRTestCase):
+    def make_employee(self, **fields):
+        employee = Employee.objects.create(**{'first_name': 'Juan', 'last_name': 'Cruz', 'department': 'Mill', **fields})
+        index_employees([employee])
+        return employee
+
+    def search(self, query):
+        response = self.client.get('/humanresource/search_employee/profile/', {'query': query})
+        return [(result['employee'].pk, result['score']) for result in response.context['results']]
+
+    def test_dashed_numbers_match_with_or_without_dashes(self):
+        employee = self.make_employee(tin='123-456-789')
+        self.assertEqual(self.search('123456789'), [(employee.pk, 10)])
+        self.assertEqual(self.search('123-456'), [(employee.pk, 10)])
+
+    def test_every_term_must_match_and_weights_rank(self):
+        operator = self.make_employee(position='Boiler Operator')
+        santos = self.make_employee(last_name='Santos', position='Operator')
+        self.make_employee(last_name='Santos', position='Clerk')
+
+        self.assertEqual(self.search('operator'), [(operator.pk, 3), (santos.pk, 3)]) # Ties by pk
+        self.assertEqual(self.search('santos oper'), [(santos.pk, 8)]) # Last name (5) + position (3)
+        self.assertEqual(self.search('santos welder'), [])
+
+    def test_saving_a_profile_reindexes_it(self):
+        content = '\n'.join([HEADER, format_row(1, '000000007', 'CRUZ, JUAN', '0', datetime(2025, 3, 10, 8))]) + '\n'
+        self.client.post('/humanresource/payroll-upload/', {'payroll_file': SimpleUploadedFile('day.txt', content.encode())})
+        profile = {'first_name': 'Juan', 'last_name': 'Cruz', 'department': 'Mill', 'status': 'Active'}
+
+        self.client.post('/humanresource/edit/7/', {**profile, 'sss_no': '34-1234567-8'})
+        employee = Employee.objects.get()
+        self.assertEqual(self.search('3412345678'), [(employee.pk, 10)])
+
+        self.client.post('/humanresource/edit/7/', {**profile, 'sss_no': '34-7654321-0'})
+        self.assertEqual(self.search('3412345678'), [])
+        self.assertEqual(self.search('34-7654321'), [(employee.pk, 10)])
+
+    def test_migration_backfills_profiles_saved_before_the_index(self):
+        backfill = importlib.import_module('humanresource.migrations.0023_backfill_search_tokens').backfill_search_tokens
+        indexed = self.make_employee(last_name='Santos')
+        older = Employee.objects.bulk_create([Employee(first_name='Ana', last_name='Reyes', tin='111-222-333')])[0]
+
+        backfill(django_apps, None)
+        self.assertEqual(self.search('111222333'), [(older.pk, 10)])
+        self.assertEqual(EmployeeSearchToken.objects.filter(employee=indexed, token='santos').count(), 1)
+
+    def test_failed_rebuild_keeps_the_old_index(self):
+        employee = self.make_employee(last_name='Santos')
+        with mock.patch('humanresource.search.index_employees', side_effect=RuntimeError('interrupted')):
+            with self.assertRaises(RuntimeError):
+                rebuild_index()
+        self.assertEqual(self.search('santos'), [(employee.pk, 5)])
+
+
+class DetailsWindowTests(HRTestCase):
+    def setUp(self):
+        super().setUp()
+        punches = [
+            ('0', datetime(2025, 3, 3, 8)), ('3', datetime(2025, 3, 3, 17)),
+            ('2', datetime(2025, 3, 15, 22)), ('3', datetime(2025, 3, 16, 6)), # Night shift across the cut-off
+            ('0', datetime(2025, 3, 20, 8)), ('3', datetime(2025, 3, 20, 16)),
+        ]
+        content = '\n'.join([HEADER] + [
+            format_row(sequence, '000000001', 'CRUZ, JUAN', code, moment) for sequence, (code, moment) in enumerate(punches, start=1)
+        ]) + '\n'
+        self.client.post('/humanresource/payroll-upload/', {'payroll_file': SimpleUploadedFile('march.txt', content.encode())})
+
+    def details(self, query=''):
+        return self.client.get(f'/humanresource/employee-details/000000001/{query}').context
+
+    def test_cutoff_periods(self):
+        self.assertEqual(cutoff_period(date(2025, 3, 15)), (date(2025, 3, 1), date(2025, 3, 15)))
+        self.assertEqual(cutoff_period(date(2025, 3, 16)), (date(2025, 3, 16), date(2025, 3, 31)))
+        self.assertEqual(cutoff_period(date(2024, 2, 20)), (date(2024, 2, 16), date(2024, 2, 29)))
+
+    def test_defaults_to_the_cutoff_of_the_last_log(self):
+        context = self.details()
+        self.assertEqual((context['start_date'], context['end_date']), (date(2025, 3, 16), date(2025, 3, 31)))
+        self.assertEqual([day['date'] for day in context['daily_summary']], [date(2025, 3, 20)])
+        self.assertEqual(context['previous_period'], (date(2025, 3, 1), date(2025, 3, 15)))
+        self.assertIsNone(context['next_period'])
+
+    def test_night_shift_belongs_to_the_day_it_started(self):
+        days = self.details('?start=2025-03-01&end=2025-03-15')['daily_summary']
+        self.assertEqual([day['date'] for day in days], [date(2025, 3, 15), date(2025, 3, 3)])
+        self.assertEqual(days[0]['night_shift_hours'], timedelta(hours=8))
+
+    def test_invalid_and_oversized_ranges(self):
+        response = self.client.get('/humanresource/employee-details/000000001/?start=2025-03-20&end=2025-03-01', follow=True)
+        self.assertEqual(response.context['start_date'], date(2025, 3, 16))
+        self.assertIn('Invalid date range', ' '.join(str(message) for message in response.context['messages']))
+
+        context = self.details('?start=2024-01-01&end=2025-03-31')
+        self.assertEqual((context['end_date'] - context['start_date']).days, 91)
+
+
+class DeletionTests(HRTestCase):
+    WEEK = (date(2025, 3, 3), date(2025, 3, 9))
+
+    def setUp(self):
+        super().setUp()
+        self.upload(Workforce(6, seed=5), *self.WEEK, name='first.txt')
+        self.upload(Workforce(4, seed=6, first_id=7), *self.WEEK, name='second.txt')
+        self.first, self.second = CSVUploadHistory.objects.order_by('pk')
+        self.employee = Employee.objects.create(first_name='Juan', last_name='Cruz', department='Mill', tin='123')
+        EmployeeMapping.objects.create(payroll_employee_id='000000001', employee=self.employee)
+        index_employees([self.employee])
+
+    def test_upload_is_deleted_in_batches(self):
+        total = PayrollRecord.objects.filter(upload_history=self.first).count()
+        calls = []
+        deleted = delete_upload_records(self.first.pk, batch_size=10, progress=lambda done, of: calls.append((done, of)))
+
+        self.assertEqual(deleted, total)
+        self.assertEqual(calls[-1], (total, total))
+        self.assertEqual(len(calls), math.ceil(total / 10))
+        self.assertFalse(CSVUploadHistory.objects.filter(pk=self.first.pk).exists())
+        self.assertEqual(PayrollRecord.objects.count(), PayrollRecord.objects.filter(upload_history=self.second).count())
+        # Unmapped IDs of the deleted file lose their summary; the mapped one keeps it
+        self.assertEqual(set(PayrollEmployeeSummary.objects.values_list('payroll_employee_id', flat=True)),
+                         {'000000001'} | {f"{number:09d}" for number in range(7, 11)})
+
+    def test_delete_view_runs_a_job(self):
+        version = attendance_cache.get_data_version()
+        self.client.post(f"/humanresource/payroll-upload/delete/{self.second.pk}/")
+        job = DeletionJob.objects.get()
+        self.assertEqual((job.status, job.upload_history_id, job.deleted_records), ('done', self.second.pk, job.total_records))
+        self.assertGreater(attendance_cache.get_data_version(), version)
+        self.assertFalse(PayrollRecord.objects.filter(upload_history_id=self.second.pk).exists())
+
+    def test_interrupted_job_resumes_with_the_whole_upload(self):
+        punches = [
+            ('000000021', '0', datetime(2025, 3, 1, 8)), ('000000021', '3', datetime(2025, 3, 1, 17)),
+            ('000000022', '0', datetime(2025, 3, 5, 8)), ('000000022', '3', datetime(2025, 3, 5, 17)),
+        ]
+        content = '\n'.join([HEADER] + [
+            format_row(sequence, emp_id, 'WORKER', code, moment) for sequence, (emp_id, code, moment) in enumerate(punches, start=1)
+        ]) + '\n'
+        self.client.post('/humanresource/payroll-upload/', {'payroll_file': SimpleUploadedFile('short.txt', content.encode())})
+        history = CSVUploadHistory.objects.get(file_name='short.txt')
+        job = DeletionJob.objects.create(upload_history_id=history.pk, file_name=history.file_name)
+
+        def crash(deleted, total):
+            raise KeyboardInterrupt # The worker dies after the first batch
+        with self.assertRaises(KeyboardInterrupt):
+            run_deletion_job(job.pk, batch_size=2, progress=crash)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.deleted_records, job.total_records), ('running', 2, 4))
+        self.assertEqual(set(PayrollRecord.objects.filter(upload_history=history).values_list('employee_id', flat=True)), {'000000022'})
+
+        received = []
+        receiver = lambda **kwargs: received.append(kwargs)
+        payroll_deleted.connect(receiver)
+        self.addCleanup(payroll_deleted.disconnect, receiver)
+        call_command('run_deletion_jobs', batch_size=2, stdout=io.StringIO())
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.deleted_records, job.total_records), ('done', 4, 4))
+        self.assertFalse(PayrollEmployeeSummary.objects.filter(payroll_employee_id__in=['000000021', '000000022']).exists())
+        self.assertEqual(received[0]['employee_ids'], {'000000021', '000000022'})
+        self.assertEqual((received[0]['start_date'], received[0]['end_date']), (date(2025, 3, 1), date(2025, 3, 5)))
+
+    def test_clear_keeps_profiles_and_their_summaries(self):
+        self.assertEqual(clear_payroll_data()[2], 0)
+        self.assertFalse(PayrollRecord.objects.exists() or CSVUploadHistory.objects.exists())
+        summary = PayrollEmployeeSummary.objects.get()
+        self.assertEqual((summary.payroll_employee_id, summary.record_count), ('000000001', 0))
+        self.assertTrue(EmployeeSearchToken.objects.filter(employee=self.employee).exists())
+
+    def test_clear_with_employees_applies_on_delete_rules(self):
+        from accounting.models import EmployeeYearToDate
+
+        MappingSuggestion.objects.create(payroll_employee_id='000000002', bio_name='X', employee=self.employee, score=Decimal('0.9'))
+        edit = EmployeeBulkEdit.objects.create(
+            effective_date=date(2025, 1, 1), changes={}, employee_ids=[self.employee.pk], created_by='hr_test',
+        )
+        EmployeeBulkEditChange.objects.create(bulk_edit=edit, employee=self.employee, field='section', new_value='North')
+        year_to_date = EmployeeYearToDate.objects.create(payroll_employee_id='000000001', year=2025, employee=self.employee)
+
+        self.assertEqual(clear_payroll_data(remove_employees=True)[2], 1)
+        self.assertFalse(Employee.objects.exists())
+        for model in (EmployeeMapping, EmployeeSearchToken, PayrollEmployeeSummary, MappingSuggestion, EmployeeBulkEditChange):
+            self.assertFalse(model.objects.exists(), model.__name__)
+        year_to_date.refresh_from_db()
+        self.assertIsNone(year_to_date.employee_id) # SET_NULL, not a dangling id
+
+
+class IngestStatisticsTests(HRTestCase):
+    def post(self, rows):
+        content = '\n'.join([HEADER] + rows) + '\n'
+        return self.client.post('/humanresource/payroll-upload/', {
+            'payroll_file': SimpleUploadedFile('day.txt', content.encode()),
+        }, follow=True)
+
+    def test_statistics_are_recorded_on_the_history_row(self):
+        good = [
+            format_row(1, '000000001', 'CRUZ, JUAN', '0', datetime(2025, 3, 10, 8)),
+            format_row(2, '000000001', 'CRUZ, JUAN', '3', datetime(2025, 3, 10, 17)),
+            format_row(3, '000000002', 'SANTOS, ANA', '0', datetime(2025, 3, 12, 8)),
+        ]
+        bad = ['too short'] * 6 + [good[0].replace('2025/03/10', '2025/13/10')]
+        response = self.post(good + bad)
+
+        history = CSVUploadHistory.objects.get()
+        self.assertEqual(
+            (history.row_count, history.employee_count, history.min_log_date, history.max_log_date, history.reject_count),
+            (3, 2, date(2025, 3, 10), date(2025, 3, 12), 7),
+        )
+        self.assertGreater(history.file_bytes, 0)
+        warnings = [str(message) for message in response.context['messages'] if message.level_tag == 'warning']
+        self.assertEqual(len(warnings), 6) # Five rows, then a count
+        self.assertIn('2 more row(s) skipped', warnings[-1])
+
+    def test_insert_time_excludes_the_work_after_the_insert(self):
+        def slow_refresh(employee_ids):
+            time_module.sleep(0.3)
+            return refresh_payroll_summaries(employee_ids)
+
+        with mock.patch('humanresource.views.refresh_payroll_summaries', side_effect=slow_refresh):
+            self.post([format_row(1, '000000001', 'CRUZ, JUAN', '0', datetime(2025, 3, 10, 8))])
+        self.assertLess(CSVUploadHistory.objects.get().insert_ms, 300)
+
+
+class AttendanceCacheTests(HRTestCase):
+    URL = '/humanresource/employee-details/000000001/?start=2025-03-03&end=2025-03-09'
+
+    def setUp(self):
+        super().setUp()
+        caches[settings.HR_ATTENDANCE_CACHE].clear()
+        self.upload(Workforce(3, seed=8), date(2025, 3, 3), date(2025, 3, 9))
+
+    def counts(self):
+        stats = attendance_cache.stats()
+        return stats['hits'], stats['misses']
+
+    def test_summaries_are_reused_until_the_data_changes(self):
+        first = self.client.get(self.URL).context['daily_summary']
+        self.assertEqual(self.counts(), (0, 1))
+        self.assertEqual(self.client.get(self.URL).context['daily_summary'], first)
+        self.assertEqual(self.counts(), (1, 1))
+
+        # Another upload bumps the version, so the next read recomputes
+        version = attendance_cache.get_data_version()
+        self.upload(Workforce(1, seed=9, first_id=20), date(2025, 3, 3), date(2025, 3, 9), name='more.txt')
+        self.assertEqual(attendance_cache.get_data_version(), version + 1)
+        self.client.get(self.URL)
+        self.assertEqual(self.counts(), (1, 2))
+
+    def test_profile_edit_bumps_the_version(self):
+        version = attendance_cache.get_data_version()
+        self.client.post('/humanresource/edit/1/', {'first_name': 'Juan', 'last_name': 'Cruz', 'department': 'Mill', 'status': 'Active'})
+        self.assertTrue(EmployeeMapping.objects.filter(payroll_employee_id='000000001').exists())
+        self.assertEqual(attendance_cache.get_data_version(), version + 1)
+
+
+class ConditionalPageTests(HRTestCase):
+    LIST = '/humanresource/employee-list/'
+
+    def setUp(self):
+        super().setUp()
+        self.upload(Workforce(3, seed=10), date(2025, 3, 3), date(2025, 3, 9))
+        self.client.get(self.LIST) # Shows (and consumes) the upload's flash message
+
+    def test_unchanged_pages_answer_304(self):
+        for url in (self.LIST, '/humanresource/search_employee/?query=0000'):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertIn('no-cache', response['Cache-Control'])
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+                self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 304)
+
+    def test_data_changes_and_other_viewers_get_a_fresh_page(self):
+        etag = self.client.get(self.LIST)['ETag']
+        self.upload(Workforce(1, seed=11, first_id=10), date(2025, 3, 3), date(2025, 3, 9), name='more.txt')
+        response = self.client.get(self.LIST, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '000000010') # The cached roster fragment was not reused
+
+        UsersAccount.objects.create(username='hr_other', password='secret', role='hr')
+        etag = self.client.get(self.LIST)['ETag']
+        self.client.post('/', {'username': 'hr_other', 'password': 'secret', 'role': 'hr'})
+        self.assertEqual(self.client.get(self.LIST, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_pending_messages_are_never_answered_with_304(self):
+        etag = self.client.get(self.LIST)['ETag']
+        # Redirects to the list with an error and changes no data
+        self.client.post('/humanresource/edit/999/', {'first_name': 'X'})
+        response = self.client.get(self.LIST, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Employee ID 999 not found')
+        self.assertEqual(self.client.get(self.LIST, HTTP_IF_NONE_MATCH=etag).status_code, 304)
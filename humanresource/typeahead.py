@@ -0,0 +1,111 @@
+"""In-process prefix index backing the employee typeahead endpoint.
+
+The index is a sorted list of (key, rank, payroll_id) tuples built from
+PayrollEmployeeSummary and the mapped Employee names, so a lookup is two
+bisects for the prefix range plus a pass over the entries in it. Uploads,
+deletes and profile edits bump the 'typeahead' DataVersion row. It lives in the
+database, so every process sees the bump and rebuilds its copy lazily. The
+generation is the row's (version, updated_at) stamp, so a truncated and
+recreated row never repeats an old generation.
+"""
+import heapq
+import threading
+from bisect import bisect_left
+
+from . import attendance_cache
+from .models import PayrollEmployeeSummary
+
+TYPEAHEAD_VERSION = 'typeahead'
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+# Lower rank sorts first in the results
+RANK_ID = 0
+RANK_FULL_NAME = 1
+RANK_NAME_PART = 2
+
+_lock = threading.Lock()
+_index = None
+
+
+class PrefixIndex:
+    def __init__(self, rows, generation):
+        self.generation = generation
+        self.entries = []
+        self.records = {}
+
+        for row in rows:
+            payroll_id = row['payroll_employee_id']
+            hr_name = ' '.join(
+                part for part in (row['employee__first_name'], row['employee__last_name']) if part
+            )
+            self.records[payroll_id] = {
+                'employee_id': payroll_id,
+                'bio_name': row['bio_name'],
+                'name': hr_name or row['bio_name'],
+                'department': row['employee__department'] if row['employee__department'] is not None else 'Unclassified',
+            }
+
+            self._add(payroll_id, RANK_ID, payroll_id)
+            self._add(payroll_id.lstrip('0'), RANK_ID, payroll_id)
+            for full_name in (row['bio_name'], hr_name):
+                self._add(full_name, RANK_FULL_NAME, payroll_id)
+                for part in full_name.split()[1:]:
+                    self._add(part, RANK_NAME_PART, payroll_id)
+
+        self.entries.sort()
+        self.keys = [entry[0] for entry in self.entries]
+
+    def _add(self, text, rank, payroll_id):
+        key = normalize(text)
+        if key:
+            self.entries.append((key, rank, payroll_id))
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        prefix = normalize(query)
+        if not prefix:
+            return []
+
+        # Every key starting with prefix sorts between these two positions. The whole
+        # range is ranked, so a one-letter query costs a pass over its matches
+        start = bisect_left(self.keys, prefix)
+        end = bisect_left(self.keys, prefix + '\U0010ffff', start)
+        best = {}
+        for _, rank, payroll_id in self.entries[start:end]:
+            if rank < best.get(payroll_id, RANK_NAME_PART + 1):
+                best[payroll_id] = rank
+
+        ranked = heapq.nsmallest(limit, best.items(), key=lambda item: (item[1], item[0]))
+        return [self.records[payroll_id] for payroll_id, _ in ranked]
+
+
+def normalize(text):
+    return ' '.join((text or '').lower().split())
+
+
+def get_index():
+    """Return this process's index, rebuilding it if the data changed."""
+    global _index
+    generation = attendance_cache.get_data_stamp(TYPEAHEAD_VERSION)
+    index = _index
+    if index is not None and index.generation == generation:
+        return index
+
+    with _lock:
+        if _index is None or _index.generation != generation:
+            rows = PayrollEmployeeSummary.objects.values(
+                'payroll_employee_id', 'bio_name',
+                'employee__first_name', 'employee__last_name', 'employee__department',
+            ).order_by()
+            _index = PrefixIndex(rows.iterator(chunk_size=2000), generation)
+        return _index
+
+
+def invalidate_index():
+    """Mark every process's index stale; called after uploads, deletes and edits."""
+    attendance_cache.bump_data_version(TYPEAHEAD_VERSION)
+
+
+def search(query, limit=DEFAULT_LIMIT):
+    limit = max(1, min(limit, MAX_LIMIT))
+    return get_index().search(query, limit)
@@ -9,8 +9,17 @@ urlpatterns = [
     path('payroll-upload/', views.PayrollUploadView, name='payroll_upload'),
     path('payroll-upload/delete/<int:history_id>/', views.DeleteHistoryView, name='delete_history'), 
     path('employee-details/<str:employee_id>/', views.EmployeeDetailsView, name='view_employee_details'),
+    path('employee-details/<str:employee_id>/corrections/', views.punch_corrections, name='punch_corrections'),
+    path('shift-roster/', views.shift_roster, name='shift_roster'),
     path('search_employee/', views.search_employee, name='search_employee'),
+    path('search_employee/suggest/', views.employee_suggest, name='employee_suggest'),
+    path('search_employee/profile/', views.employee_profile_search, name='employee_profile_search'),
     path('employee-list/', views.EmployeeListView, name='employee_list'),
+    path('employee-list/import/', views.employee_import, name='employee_import'),
+    path('employee-list/bulk-edit/', views.bulk_edit, name='bulk_edit'),
+    path('employee-list/bulk-edit/<int:bulk_edit_id>/', views.bulk_edit_detail, name='bulk_edit_detail'),
+    path('employee-list/bulk-edit/api/', views.bulk_edit_api, name='bulk_edit_api'),
+    path('employee-list/mapping-suggestions/', views.mapping_suggestions, name='mapping_suggestions'),
     path('edit/<str:employee_id>/', views.edit_employee, name='edit_employee'),
 
 ]
\ No newline at end of file
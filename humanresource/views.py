@@ -1,24 +1,109 @@
 from django.shortcuts import render,redirect,get_object_or_404
 from django.contrib import messages
+from django.core.paginator import Paginator
 from django.db.models import Q,Min, F 
-from .models import CSVUploadHistory, PayrollRecord, Employee, EmployeeMapping # Import the new model
+from .models import CSVUploadHistory, PayrollRecord, Employee, EmployeeMapping, PayrollEmployeeSummary, DeletionJob, PunchCorrection, ShiftSchedule, Crew, RosterAssignment, EmployeeBulkEdit, MappingSuggestion # Import the new model
+from .summaries import refresh_payroll_summaries, link_payroll_summary
+from . import typeahead
+from .search import index_employee, search_employees, SEARCH_FIELDS
+from .deletion import pending_deletion_history_ids, run_deletion_job
+from . import jobs
+from . import attendance_cache
+from .signals import employee_profile_changed, payroll_ingested
+from .corrections import CorrectionError, add_correction, corrected_logs, revoke_correction
+from .imports import IMPORT_FIELDS, REQUIRED_FOR_NEW, EmployeeImportError, import_employees, normalize_payroll_id
+from .bulk_edit import (
+    ORGANIZATION_FIELDS, RATE_FIELDS, SELECTION_FILTERS, BulkEditError,
+    cancel_bulk_edit, create_bulk_edit, describe_selection, select_employees,
+)
+from .matching import approve_suggestions, reject_suggestions, split_bio_name, suggest_mappings, unmapped_payroll_ids
+from .roster import RosterError, RosterIndex, add_crew_members, assign_schedule, delete_assignment, rotate_crews
+from .attendance import CODE_MAP, build_daily_summary, calculate_hours, calculate_minutes_late, cutoff_period, log_window
 from io import TextIOWrapper
+from time import perf_counter
 from django.db.models import Count 
-from django.db import models
+from django.db import IntegrityError, models
+from django.core.exceptions import ValidationError
 from datetime import datetime, time, timedelta
 from django.http import JsonResponse
+from django.utils import timezone
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+import csv
+import hashlib
+import json
+from decimal import Decimal, InvalidOperation
+
+# Every view in this module requires the 'hr' role; that is enforced for the whole
+# 'humanresource' URL namespace by navigation_app.middleware.AccountMiddleware.
+
+# ----------------------------------------------------------------------
+# 0. CONDITIONAL GET (ETag / Last-Modified for HR list pages)
+# ----------------------------------------------------------------------
+
+def _data_stamp(request):
+    # One DataVersion read per request, shared by the ETag and Last-Modified callbacks
+    if not hasattr(request, '_hr_data_stamp'):
+        request._hr_data_stamp = attendance_cache.get_data_stamp()
+    return request._hr_data_stamp
+
+
+def _has_pending_messages(request):
+    # Queued flash messages must be rendered (and consumed), so never answer 304 while any are pending
+    return bool(len(messages.get_messages(request)))
+
+
+def _page_is_stable(request):
+    return request.method in ('GET', 'HEAD') and not _has_pending_messages(request)
+
+
+def hr_page_etag(request, *args, **kwargs):
+    """Data version plus the viewer, since the navigation bar is rendered per user."""
+    if not _page_is_stable(request):
+        return None
+    version, _ = _data_stamp(request)
+    viewer = f"{request.session.get('username', '')}:{request.session.get('role', '')}"
+    return f"{version}-{hashlib.md5(viewer.encode()).hexdigest()[:12]}"
+
+
+def hr_page_last_modified(request, *args, **kwargs):
+    if not _page_is_stable(request):
+        return None
+    return _data_stamp(request)[1]
+
+
+def _upload_page_is_stable(request):
+    # The upload page also shows deletion progress, which does not bump the version
+    return _page_is_stable(request) and not pending_deletion_history_ids()
+
+
+def upload_page_etag(request, *args, **kwargs):
+    if not _upload_page_is_stable(request):
+        return None
+    return hr_page_etag(request, *args, **kwargs)
+
+
+def upload_page_last_modified(request, *args, **kwargs):
+    if not _upload_page_is_stable(request):
+        return None
+    return hr_page_last_modified(request, *args, **kwargs)
+
+
+hr_conditional_page = condition(etag_func=hr_page_etag, last_modified_func=hr_page_last_modified)
+# Browsers must revalidate every time (and only they may store the page)
+hr_revalidate = cache_control(private=True, no_cache=True)
+
 
 # ----------------------------------------------------------------------
 # 1. UPLOAD & HISTORY MANAGEMENT
 # ----------------------------------------------------------------------
 
+# Per-row "Skipped row" messages shown before they are summarised as a count
+MAX_ROW_WARNINGS = 5
+
+@hr_revalidate
+@condition(etag_func=upload_page_etag, last_modified_func=upload_page_last_modified)
 def PayrollUploadView(request):
-    current_role = request.session.get('role')
-    
-    if current_role != 'hr':
-        messages.error(request, "Access denied. HR role required.")
-        return redirect('homepage')
-        
     uploader_username = request.session.get('username', 'HR User')
 
     if request.method == 'POST':
@@ -33,6 +118,7 @@ def PayrollUploadView(request):
             return redirect('humanresource:payroll_upload')
         
         try:
+            parse_started = perf_counter()
             file_wrapper = TextIOWrapper(uploaded_file.file, encoding='utf-8')
             lines = file_wrapper.read().splitlines() 
             
@@ -44,11 +130,13 @@ def PayrollUploadView(request):
             history_record = CSVUploadHistory.objects.create(
                 uploaded_by = uploader_username,
                 file_name = uploaded_file.name,
+                file_bytes = uploaded_file.size or 0,
             )
 
             # Skip header (lines[0])
             data_rows = lines[1:]
             processed_rows = 0
+            reject_count = 0
             
             records_to_create = []
 
@@ -73,17 +161,55 @@ def PayrollUploadView(request):
                             upload_history=history_record
                         ))
                           processed_rows += 1
+                    else:
+                        reject_count += 1
 
                 except ValueError as ve:
-                    messages.warning(request, f"Skipped row due to data format error: {str(ve)}")
+                    if not row.strip():
+                        continue # Blank line (e.g. trailing newline)
+                    reject_count += 1
+                    if reject_count <= MAX_ROW_WARNINGS:
+                        messages.warning(request, f"Skipped row due to data format error: {str(ve)}")
                     continue
                 except IndexError:
-                    messages.warning(request, f"Skipped row due to incorrect fixed-width format (row too short).")
+                    reject_count += 1
+                    if reject_count <= MAX_ROW_WARNINGS:
+                        messages.warning(request, f"Skipped row due to incorrect fixed-width format (row too short).")
                     continue
 
-            # Bulk create records for efficiency
+            if reject_count > MAX_ROW_WARNINGS:
+                messages.warning(request, f"...and {reject_count - MAX_ROW_WARNINGS} more row(s) skipped.")
+            parse_ms = int((perf_counter() - parse_started) * 1000)
+
+            # Bulk create records for efficiency; insert_ms times this INSERT alone
+            insert_started = perf_counter()
             if records_to_create:
                 PayrollRecord.objects.bulk_create(records_to_create)
+            insert_ms = int((perf_counter() - insert_started) * 1000)
+            if records_to_create:
+                refresh_payroll_summaries({r.employee_id for r in records_to_create})
+                typeahead.invalidate_index()
+                attendance_cache.bump_data_version()
+
+            # 2. Record ingest statistics on the history row (read by the history table, no aggregates needed)
+            log_dates = [r.log_date for r in records_to_create]
+            if records_to_create:
+                payroll_ingested.send(
+                    sender=CSVUploadHistory, history_id=history_record.id,
+                    employee_ids={r.employee_id for r in records_to_create},
+                    start_date=min(log_dates), end_date=max(log_dates),
+                )
+            history_record.row_count = processed_rows
+            history_record.employee_count = len({r.employee_id for r in records_to_create})
+            history_record.min_log_date = min(log_dates) if log_dates else None
+            history_record.max_log_date = max(log_dates) if log_dates else None
+            history_record.reject_count = reject_count
+            history_record.parse_ms = parse_ms
+            history_record.insert_ms = insert_ms
+            history_record.save(update_fields=[
+                'row_count', 'employee_count', 'min_log_date', 'max_log_date',
+                'reject_count', 'parse_ms', 'insert_ms',
+            ])
 
             messages.success(request, f'File "{uploaded_file.name}" uploaded successfully. Processed {processed_rows} data entries.')
 
@@ -95,30 +221,35 @@ def PayrollUploadView(request):
         return redirect('humanresource:payroll_upload')
     
     # GET Request: Display upload history
-    history = CSVUploadHistory.objects.order_by('-upload_time')[:20]
+    # Uploads being deleted in the background are listed separately with their progress
+    deletion_jobs = list(DeletionJob.objects.filter(status__in=['queued', 'running', 'failed'])[:10])
+    history = CSVUploadHistory.objects.exclude(
+        id__in=[job.upload_history_id for job in deletion_jobs if job.status != 'failed']
+    ).order_by('-upload_time')[:20]
 
-    
-    
     context = {
         'history': history,
+        'deletion_jobs': deletion_jobs,
     }
     return render(request, 'upload_txt.html', context)
 
 
 def DeleteHistoryView(request, history_id):
-    current_role = request.session.get('role')
-    if current_role != 'hr':
-        messages.error(request, "Access denied. HR role required for deletion.")
-        return redirect('homepage')
-        
-    # Deleting history record cascades to PayrollRecords.
     history_record = get_object_or_404(CSVUploadHistory, id=history_id)
     
-    # Perform deletion
+    # Perform deletion: the PayrollRecords are removed in batches by the background worker
     if request.method == 'POST':
-        file_name = history_record.file_name
-        history_record.delete()
-        messages.success(request, f'History record for file "{file_name}" deleted successfully.')
+        if history_record.id in pending_deletion_history_ids():
+            messages.info(request, f'File "{history_record.file_name}" is already being deleted.')
+            return redirect('humanresource:payroll_upload')
+
+        job = DeletionJob.objects.create(
+            upload_history_id=history_record.id,
+            file_name=history_record.file_name,
+            requested_by=request.session.get('username', 'HR User'),
+        )
+        jobs.submit(run_deletion_job, job.id)
+        messages.success(request, f'Deletion of "{history_record.file_name}" and its payroll data has started.')
     else:
         messages.error(request, 'Invalid request method for deletion.')
 
@@ -126,379 +257,530 @@ def DeleteHistoryView(request, history_id):
 
 
 # ----------------------------------------------------------------------
-# 2. CALCULATION HELPERS
+# 2. CALCULATION HELPERS (see attendance.py)
 # ----------------------------------------------------------------------
 
-def calculate_hours(time_in_str, time_out_str):
-    """
-    Calculates the time difference (timedelta) between two time strings ('HH:MM:SS').
-    Handles shifts that cross over midnight (time_out < time_in).
-    """
-    if not time_in_str or not time_out_str:
-        return timedelta(0)
-    
-    TIME_FORMAT = '%H:%M:%S'
-    try:
-        # Convert time strings to datetime objects (using a dummy date)
-        dt_in = datetime.strptime(time_in_str, TIME_FORMAT)
-        dt_out = datetime.strptime(time_out_str, TIME_FORMAT)
-        
-        # Check for Midnight Crossover (Graveyard Shift)
-        if dt_out < dt_in:
-            dt_out += timedelta(days=1)   # Add 24 hours to the OUT time
-            
-        return dt_out - dt_in
-    except ValueError:
-        # Handles malformed time strings
-        return timedelta(0)
-    
+# Longest range the details page will compute in one request
+MAX_DETAILS_WINDOW_DAYS = 92
 
-def calculate_minutes_late(log_time_str, log_type):
-    if not log_time_str:
-        return 0
 
-    TIME_FORMAT = '%H:%M:%S'
+def _parse_date(value):
     try:
-        logged_dt = datetime.strptime(log_time_str, TIME_FORMAT)
-        
-        # Define the grace period cut-off time (15 mins past standard)
-        if log_type == 'AM_IN':
-            grace_cut_off = time(8, 15, 0)
-        elif log_type == 'PM_IN':
-            grace_cut_off = time(16, 15, 0)
-        elif log_type == 'OT_IN':
-            grace_cut_off = time(0, 15, 0)
-        else:
-            return 0 # Only check IN logs
-
-        # Compare the time part of the log with the cut-off time
-        if logged_dt.time() > grace_cut_off:
-            # For simplicity and robust time arithmetic, convert the logged time
-            # and the cut-off time into full datetime objects (using a dummy date).
-            dummy_date = datetime(2000, 1, 1)
-            cut_off_dt = datetime.combine(dummy_date, grace_cut_off)
-            
-            # The logged time is already a datetime object from the strptime call above
-            
-            # Calculate the difference and convert to total minutes
-            late_delta = logged_dt - cut_off_dt
-            
-            if late_delta > timedelta(0):
-                return int(late_delta.total_seconds() / 60)
-            
-        return 0 # Not late
-        
+        return datetime.strptime(value, '%Y-%m-%d').date() if value else None
     except ValueError:
-        return 0
-    
+        return None
+
 
 # ----------------------------------------------------------------------
 # 3. DETAILS & SEARCH VIEWS
 # ----------------------------------------------------------------------
 
 def EmployeeDetailsView(request, employee_id):
-    current_role = request.session.get('role')
-    if current_role != 'hr':
-        messages.error(request, "Access denied. HR role required.")
-        return redirect('homepage')
-
-    # 1. Fetch all records for the employee, ordered by date and time
-    raw_logs = PayrollRecord.objects.filter(employee_id=employee_id).order_by('log_date', 'log_time')
-    
-    if not raw_logs:
+    # 1. One summary row gives the bio name and the latest log date without touching the logs
+    summary = PayrollEmployeeSummary.objects.filter(payroll_employee_id=employee_id, record_count__gt=0).first()
+    if summary is None:
         messages.warning(request, f"No payroll records found for Employee ID: {employee_id}")
         return redirect('humanresource:payroll_upload')
 
-    employee_name = raw_logs.first().employee_name
-    daily_summary = {}
+    # 2. Resolve the date window: ?start=&end= or the current cut-off
+    #    (falls back to the cut-off of the last log when nothing was logged this period)
+    start_date = _parse_date(request.GET.get('start'))
+    end_date = _parse_date(request.GET.get('end'))
+    if start_date is None or end_date is None or start_date > end_date:
+        if request.GET.get('start') or request.GET.get('end'):
+            messages.warning(request, "Invalid date range; showing the current cut-off instead.")
+        start_date, end_date = cutoff_period(timezone.localdate())
+        if summary.last_log_date and summary.last_log_date < start_date:
+            start_date, end_date = cutoff_period(summary.last_log_date)
+    if (end_date - start_date).days >= MAX_DETAILS_WINDOW_DAYS:
+        start_date = end_date - timedelta(days=MAX_DETAILS_WINDOW_DAYS - 1)
+        messages.warning(request, f"Date range limited to {MAX_DETAILS_WINDOW_DAYS} days.")
+
+    # 3. Fetch only the window (plus crossover days), ordered by date and time
+    fetch_start, fetch_end = log_window(start_date, end_date)
+    raw_logs = PayrollRecord.objects.filter(
+        employee_id=employee_id, log_date__range=(fetch_start, fetch_end)
+    ).order_by('log_date', 'log_time').values_list('log_code', 'log_date', 'log_time')
+
+    # Punch corrections and the shift roster are read on a cache miss only; the summary
+    # revision keys the cache, and roster changes bump the data version
+    summary_list = attendance_cache.get_daily_summary(
+        employee_id, start_date, end_date,
+        lambda: build_daily_summary(
+            corrected_logs(employee_id, raw_logs, fetch_start, fetch_end, summary.revision), start_date, end_date,
+            schedule_for=RosterIndex.for_employees([employee_id], fetch_start, fetch_end).schedule_for(employee_id),
+        ),
+        revision=summary.revision,
+    )
+
+    previous_start, previous_end = cutoff_period(start_date - timedelta(days=1))
+    next_start, next_end = cutoff_period(end_date + timedelta(days=1))
 
-    CODE_MAP = {
-        '0': 'AM_IN', '1': 'AM_OUT',
-        '2': 'PM_IN', '3': 'PM_OUT',
-        '5': 'OT_IN', '6': 'OT_OUT',
+    context = {
+        'employee_id': employee_id,
+        'employee_name': summary.bio_name,
+        'daily_summary': summary_list,
+        'start_date': start_date,
+        'end_date': end_date,
+        'first_log_date': summary.first_log_date,
+        'last_log_date': summary.last_log_date,
+        'previous_period': (previous_start, previous_end) if summary.first_log_date and previous_end >= summary.first_log_date else None,
+        'next_period': (next_start, next_end) if summary.last_log_date and next_start <= summary.last_log_date else None,
     }
-    
-    # --- Step 2: Initialize, Group, and Handle Cross-Midnight Attribution ---
-    for log in raw_logs:
-        log_type = CODE_MAP.get(log.log_code)
-        
-        current_date_key = log.log_date.strftime('%Y-%m-%d')
-        log_date_obj = log.log_date
-
-        # --- A. Cross-Midnight Attribution Logic --- 
-        is_out_log = log.log_code in ['1', '3', '6']
-
-        if is_out_log:
-            previous_day = log_date_obj - timedelta(days=1)
-            previous_day_key = previous_day.strftime('%Y-%m-%d')
-            
-            if previous_day_key in daily_summary:
-                prev_data = daily_summary[previous_day_key]
-                
-                # Check for open AM shift
-                if (log.log_code == '1' or log.log_code == '3') and prev_data.get('AM_IN') and not prev_data.get(CODE_MAP.get(log.log_code)):
-                    current_date_key = previous_day_key
-                
-                # Check for open PM shift
-                elif (log.log_code == '3' or log.log_code == '1') and prev_data.get('PM_IN') and not prev_data.get(CODE_MAP.get(log.log_code)):
-                    current_date_key = previous_day_key
-                    
-                # Check for open OT shift 
-                elif log.log_code == '6' and prev_data.get('OT_IN') and not prev_data.get('OT_OUT'):
-                    current_date_key = previous_day_key
 
-        # --- B. Initialize Daily Summary Entry ---
-        if current_date_key not in daily_summary:
-            entry_date = datetime.strptime(current_date_key, '%Y-%m-%d').date()
-            
-            daily_summary[current_date_key] = {
-                'date': entry_date,
-                'AM_IN': None, 'AM_OUT': None,
-                'PM_IN': None, 'PM_OUT': None,
-                'OT_IN': None, 'OT_OUT': None,
-                'total_hours': timedelta(0), 
-                'day_shift_hours': timedelta(0), 
-                'night_shift_hours': timedelta(0), 
-                'graveyard_shift_hours': timedelta(0), 
-                'total_minutes_late': 0,
-                'raw_logs': [] 
-            }
-        
-        # --- C. Store Log Time ---
-        if log_type and not daily_summary[current_date_key][log_type]:
-            daily_summary[current_date_key][log_type] = log.log_time
-        
-        daily_summary[current_date_key]['raw_logs'].append(log)
-
-    for key, data in daily_summary.items():
-        total_delta = timedelta(0)
-        
-        day_shift_delta = timedelta(0)
-        night_shift_delta = timedelta(0)
-        graveyard_shift_delta = timedelta(0)
-        ot_delta = timedelta(0) 
+    return render(request, 'employee_details.html', context)
 
-        used_logs = set()
-        
-        # 1. Day Shift: AM_IN (0) to PM_OUT (3)
-        if data.get('AM_IN') and data.get('PM_OUT'):
-             day_shift_delta = calculate_hours(data.get('AM_IN'), data.get('PM_OUT'))
-             used_logs.add('AM_IN')
-             used_logs.add('PM_OUT')
-        
-        # 2. Night Shift: PM_IN (2) to PM_OUT (3)
-        elif data.get('PM_IN') and data.get('PM_OUT'):
-            night_shift_delta = calculate_hours(data.get('PM_IN'), data.get('PM_OUT'))
-            used_logs.add('PM_IN')
-            used_logs.add('PM_OUT')
-        
-        # 3. Graveyard Shift (AM portion): AM_IN (0) to AM_OUT (1)
-        elif data.get('AM_IN') and data.get('AM_OUT'):
-            graveyard_shift_delta = calculate_hours(data.get('AM_IN'), data.get('AM_OUT'))
-            used_logs.add('AM_IN')
-            used_logs.add('AM_OUT')
-        
-        # --- Overtime (5 -> 6) ---
-        ot_delta = calculate_hours(data.get('OT_IN'), data.get('OT_OUT'))
 
-        # Store the breakdown in the dictionary
-        data['day_shift_hours'] = day_shift_delta
-        data['night_shift_hours'] = night_shift_delta
-        data['graveyard_shift_hours'] = graveyard_shift_delta
-        
-        # Calculate the GRAND TOTAL (Day + Night + Graveyard + OT)
-        total_delta = day_shift_delta + night_shift_delta + graveyard_shift_delta + ot_delta
-        data['total_hours'] = total_delta
-
-        # --- LATE CALCULATION ---
-        am_late = calculate_minutes_late(data.get('AM_IN'), 'AM_IN')
-        pm_late = calculate_minutes_late(data.get('PM_IN'), 'PM_IN')
-        ot_late = calculate_minutes_late(data.get('OT_IN'), 'OT_IN')
-        
-        data['total_minutes_late'] = am_late + pm_late + ot_late
+def punch_corrections(request, employee_id):
+    """Add, void or adjust one employee's punches for a day, and revoke earlier corrections."""
+    summary = PayrollEmployeeSummary.objects.filter(payroll_employee_id=employee_id).first()
+    if summary is None:
+        messages.warning(request, f"No payroll records found for Employee ID: {employee_id}")
+        return redirect('humanresource:payroll_upload')
 
-    # Convert the dictionary to a list and sort by date descending for display
-    summary_list = sorted(daily_summary.values(), key=lambda x: x['date'], reverse=True)
+    day = _parse_date(request.GET.get('date')) or summary.last_log_date or timezone.localdate()
+    username = request.session.get('username', 'hr')
 
+    if request.method == 'POST':
+        action = request.POST.get('action')
+        reason = request.POST.get('reason', '').strip()
+        try:
+            if action == 'revoke':
+                revoke_correction(int(request.POST.get('correction_id', 0)), username, reason)
+                messages.success(request, "Correction revoked.")
+            else:
+                original = None
+                if action in ('void', 'adjust'):
+                    original = (request.POST.get('original_code'), day, request.POST.get('original_time'))
+                punch = None
+                if action in ('add', 'adjust'):
+                    punch = (request.POST.get('log_code'), _parse_date(request.POST.get('log_date')) or day, request.POST.get('log_time', '').strip())
+                    if len(punch[2]) == 5:
+                        punch = punch[:2] + (punch[2] + ':00',) # <input type="time"> sends HH:MM
+                add_correction(employee_id, action, reason, username, original=original, punch=punch)
+                messages.success(request, "Correction saved.")
+        except (CorrectionError, PunchCorrection.DoesNotExist, ValueError) as e:
+            messages.error(request, str(e) or "Correction not found.")
+        return redirect(f"{request.path}?date={day:%Y-%m-%d}")
+
+    raw = list(
+        PayrollRecord.objects.filter(employee_id=employee_id, log_date=day)
+        .order_by('log_time').values_list('log_code', 'log_date', 'log_time')
+    )
+    effective = corrected_logs(employee_id, raw, day, day, summary.revision)
     context = {
         'employee_id': employee_id,
-        'employee_name': employee_name,
-        'daily_summary': summary_list,
+        'employee_name': summary.bio_name,
+        'day': day,
+        'raw_punches': [{'code': code, 'label': CODE_MAP.get(code, code), 'time': log_time} for code, _, log_time in raw],
+        'effective_punches': [
+            {'code': code, 'label': CODE_MAP.get(code, code), 'date': log_date, 'time': log_time}
+            for code, log_date, log_time in effective if log_date == day
+        ],
+        'corrections': PunchCorrection.objects.filter(payroll_employee_id=employee_id)[:200],
+        'codes': sorted(CODE_MAP.items()),
     }
+    return render(request, 'punch_corrections.html', context)
 
-    return render(request, 'employee_details.html', context)
+
+def shift_roster(request):
+    """Shift schedules, crews and their weekly rotation; lateness and undertime follow this roster."""
+    if request.method == 'POST':
+        action = request.POST.get('action')
+        start_date = _parse_date(request.POST.get('start_date'))
+        end_date = _parse_date(request.POST.get('end_date'))
+        try:
+            name = request.POST.get('name', '').strip()
+            if action in ('add_schedule', 'add_crew') and not name:
+                raise RosterError("Enter a name.")
+            if action == 'add_schedule':
+                ShiftSchedule.objects.create(
+                    name=name,
+                    start_time=request.POST.get('start_time'),
+                    end_time=request.POST.get('end_time'),
+                    grace_minutes=int(request.POST.get('grace_minutes') or 15),
+                )
+                messages.success(request, "Shift schedule added.")
+            elif action == 'add_crew':
+                Crew.objects.create(name=name)
+                messages.success(request, "Crew added.")
+            elif action == 'add_members':
+                crew = Crew.objects.get(pk=request.POST.get('crew'))
+                employee_ids = request.POST.get('employee_ids', '').replace(',', ' ').split()
+                count = add_crew_members(crew, employee_ids, start_date)
+                messages.success(request, f"{count} payroll ID(s) moved to {crew.name}.")
+            elif action == 'assign':
+                crew_id = request.POST.get('crew')
+                assign_schedule(
+                    ShiftSchedule.objects.get(pk=request.POST.get('schedule')), start_date, end_date,
+                    crew=Crew.objects.get(pk=crew_id) if crew_id else None,
+                    payroll_employee_id=request.POST.get('payroll_employee_id', '').strip(),
+                )
+                messages.success(request, "Schedule assigned.")
+            elif action == 'rotate':
+                crews = list(Crew.objects.filter(pk__in=request.POST.getlist('crews')))
+                schedules = list(ShiftSchedule.objects.filter(pk__in=request.POST.getlist('schedules')))
+                created = rotate_crews(crews, schedules, start_date, int(request.POST.get('weeks') or 1))
+                messages.success(request, f"{created} weekly crew assignment(s) created.")
+            elif action == 'delete_assignment':
+                delete_assignment(int(request.POST.get('assignment_id', 0)))
+                messages.success(request, "Assignment removed.")
+        except (RosterError, Crew.DoesNotExist, ShiftSchedule.DoesNotExist, RosterAssignment.DoesNotExist, ValueError, ValidationError) as e:
+            messages.error(request, str(e) or "Not found.")
+        except IntegrityError:
+            messages.error(request, "That name is already in use.")
+        return redirect('humanresource:shift_roster')
+
+    today = timezone.localdate()
+    context = {
+        'schedules': ShiftSchedule.objects.all(),
+        'crews': Crew.objects.annotate(
+            member_count=Count('memberships', filter=Q(memberships__end_date__isnull=True) | Q(memberships__end_date__gte=today)),
+        ),
+        'assignments': RosterAssignment.objects.filter(
+            Q(end_date__isnull=True) | Q(end_date__gte=today - timedelta(days=31))
+        ).select_related('schedule', 'crew')[:300],
+        'today': today,
+    }
+    return render(request, 'shift_roster.html', context)
 
 
+@hr_revalidate
+@hr_conditional_page
 def search_employee(request):
     query = request.GET.get('query')
-    unique_employees = [] # Initialize list for safety
+    page_obj = None
     
     if query:
         cleaned_query = query.strip() 
         
-        # Filter PayrollRecord model to find matching logs
-        matching_record_ids = PayrollRecord.objects.filter(
-            Q(employee_id__istartswith=cleaned_query) | Q(employee_name__istartswith=cleaned_query)
-        ).values_list('employee_id', flat=True).distinct()
-        
-        # 1. Fetch structured Employee records that match via EmployeeMapping (if they exist)
-        mappings = EmployeeMapping.objects.filter(payroll_employee_id__in=matching_record_ids).select_related('employee')
-        employee_cache = {m.payroll_employee_id: m.employee for m in mappings}
-
-        # 2. Get the latest bio name for each matched ID
-        bio_name_cache = {}
-        for emp_id_str in matching_record_ids:
-             payroll_record = PayrollRecord.objects.filter(employee_id=emp_id_str).order_by('-log_date', '-log_time').first()
-             if payroll_record:
-                 bio_name_cache[emp_id_str] = payroll_record.employee_name
-        
-        # 3. Build the final list (similar to EmployeeListView, but using search results)
-        for emp_id_str in matching_record_ids:
-            payroll_name = bio_name_cache.get(emp_id_str, "N/A")
-
-            if emp_id_str in employee_cache:
-                employee_obj = employee_cache[emp_id_str]
-                setattr(employee_obj, 'employee_name', payroll_name)
-                unique_employees.append(employee_obj)
-            else:
-                # Create a pseudo-object for unclassified employees
-                def get_list_name_func(self):
-                    return self.employee_name 
-                def get_full_name_func(self):
-                    return self.employee_name
-                    
-                pseudo_employee = type('PseudoEmployee', (object,), {
-                    'employee_id': emp_id_str,
-                    'employee_name': payroll_name,       
-                    'department': 'Unclassified',
-                    'get_list_name': get_list_name_func, 
-                    'get_full_name': get_full_name_func,
-                })()
-                
-                unique_employees.append(pseudo_employee)
+        # Prefix match against the per-ID summary (one row per payroll ID, indexed)
+        roster = PayrollEmployeeSummary.objects.filter(
+            Q(payroll_employee_id__istartswith=cleaned_query) | Q(bio_name__istartswith=cleaned_query)
+        )
+        page_obj = _paginate_roster(request, roster)
 
     context = {
         'query': query,
-        'unique_employees': unique_employees 
+        'page_obj': page_obj,
+        'unique_employees': page_obj.object_list if page_obj else [],
+        'sort': request.GET.get('sort', 'id'),
+        'direction': request.GET.get('dir', 'asc'),
+        'roster_cache_key': _roster_cache_key(request, page_obj),
     }
     
     return render(request, 'employee_list.html', context) # Use the same list template
 
 
+def employee_suggest(request):
+    """JSON typeahead: top-N employees whose payroll ID, bio name or HR name starts with ?q=."""
+    query = request.GET.get('q', '').strip()
+    try:
+        limit = int(request.GET.get('limit', typeahead.DEFAULT_LIMIT))
+    except ValueError:
+        limit = typeahead.DEFAULT_LIMIT
+
+    results = typeahead.search(query, limit) if query else []
+    return JsonResponse({'query': query, 'results': results})
+
+
+def employee_profile_search(request):
+    """Ranked search over Employee master data (TIN, SSS, PhilHealth, Pag-IBIG, position, section, spouse...)."""
+    query = request.GET.get('query', '').strip()
+    results = []
+    for employee, score, matched_fields in search_employees(query):
+        results.append({
+            'employee': employee,
+            'score': score,
+            'matched_on': [Employee._meta.get_field(field).verbose_name for field in matched_fields],
+        })
+
+    context = {
+        'query': query,
+        'results': results,
+        'searchable_fields': [Employee._meta.get_field(field).verbose_name for field in SEARCH_FIELDS],
+    }
+    return render(request, 'search_employee.html', context)
+
+
 # ----------------------------------------------------------------------
 # 4. EMPLOYEE LIST & EDIT/CREATE LOGIC (CORE FIXES)
 # ----------------------------------------------------------------------
 
-# --- CORRECTED & STRENGTHENED: EmployeeListView ---
+EMPLOYEE_LIST_PAGE_SIZE = 50
+
+# ?sort= keys accepted by the roster pages -> ORDER BY columns
+ROSTER_SORT_FIELDS = {
+    'id': ['payroll_employee_id'],
+    'bio_name': ['bio_name', 'payroll_employee_id'],
+    'name': ['employee__last_name', 'employee__first_name', 'payroll_employee_id'],
+    'department': ['employee__department', 'payroll_employee_id'],
+    'first_log': ['first_log_date', 'payroll_employee_id'],
+}
+
+
+def _paginate_roster(request, roster):
+    """Sort and slice a PayrollEmployeeSummary queryset for one page.
+
+    Costs a COUNT plus a single joined SELECT no matter how many employees exist.
+    """
+    sort_key = request.GET.get('sort', 'id')
+    order_by = ROSTER_SORT_FIELDS.get(sort_key, ROSTER_SORT_FIELDS['id'])
+    if request.GET.get('dir') == 'desc':
+        order_by = ['-' + field for field in order_by]
+
+    roster = roster.select_related('employee').order_by(*order_by)
+    paginator = Paginator(roster, EMPLOYEE_LIST_PAGE_SIZE)
+    return paginator.get_page(request.GET.get('page'))
+
+
+def _roster_cache_key(request, page_obj):
+    """Fragment cache key for the roster table: data version + what is shown on this page."""
+    if page_obj is None:
+        return None
+    version, _ = _data_stamp(request)
+    return ':'.join([
+        str(version),
+        request.GET.get('query', '').strip().lower(),
+        request.GET.get('sort', 'id'),
+        request.GET.get('dir', 'asc'),
+        str(page_obj.number),
+    ])
+
+
+@hr_revalidate
+@hr_conditional_page
 def EmployeeListView(request):
-    current_role = request.session.get('role')
-    # Add security check here if necessary
-        
-    # 1. Get chronological order and unique employee IDs (all as strings) from PayrollRecord
-    employee_payroll_data = PayrollRecord.objects.values(
-        'employee_id' 
-    ).annotate(
-        first_log=Min('log_date')
-    ).order_by('first_log')
-    
-    # 2. Cache all structured Employee objects for fast lookup via EmployeeMapping
-    all_employees = Employee.objects.all()
-    mappings = EmployeeMapping.objects.select_related('employee').all()
-    employee_cache = {m.payroll_employee_id: m.employee for m in mappings}
-    
-    # 3. Cache the latest original bio name for each ID efficiently
-    employee_ids = [d['employee_id'] for d in employee_payroll_data]
-    bio_name_cache = {}
-    
-    for emp_id_str in employee_ids:
-         payroll_record = PayrollRecord.objects.filter(employee_id=emp_id_str).order_by('-log_date', '-log_time').first()
-         if payroll_record:
-             bio_name_cache[emp_id_str] = payroll_record.employee_name
-             
-    unique_employees_data = []
-    processed_ids = set() 
-    
-    # Process payroll records first (chronological)
-    for record_data in employee_payroll_data:
-        emp_id_str = record_data['employee_id']
-        
-        if emp_id_str in processed_ids:
-            continue
-            
-        processed_ids.add(emp_id_str)
-        payroll_name = bio_name_cache.get(emp_id_str, "N/A") 
-        
-        # Scenario A: Employee profile exists in the Employee table
-        if emp_id_str in employee_cache:
-            employee_obj = employee_cache[emp_id_str]
-            
-            # Dynamically attach the raw 'Bio Name' for the template column.
-            setattr(employee_obj, 'employee_name', payroll_name)
-            # Ensure the payroll-formatted employee_id is present on the object for templates/sorting
-            setattr(employee_obj, 'employee_id', emp_id_str)
-            
-            unique_employees_data.append(employee_obj)
-            
-        # Scenario B: No Employee profile, logs exist (Fallback to Pseudo-object)
-        else:
-            # Define methods for the pseudo-object
-            def get_list_name_func(self):
-                # Pseudo-employee's list name is just the bio name
-                return self.employee_name 
-            def get_full_name_func(self):
-                # Used by the title/heading in edit_employee
-                return self.employee_name
-                
-            # FIX: Define the class attributes directly and instantiate the class immediately 
-            # without passing arguments to the class constructor.
-            pseudo_employee = type('PseudoEmployee', (object,), {
-                'employee_id': emp_id_str,  # Keep as string for consistency
-                'employee_name': payroll_name,       # Payroll Bio Name
-                'department': 'Unclassified',
-                'get_list_name': get_list_name_func, 
-                'get_full_name': get_full_name_func,
-            })() # <--- Crucial change: Call the class with no arguments ()
-            
-            unique_employees_data.append(pseudo_employee)
-    
-    # Now add any Employee records that don't have PayrollRecords (newly created employees)
-    # Track which employee IDs were already processed from payroll
-    processed_employee_ids = set()
-    for record_data in employee_payroll_data:
-        emp_id_str = record_data['employee_id']
-        processed_employee_ids.add(emp_id_str)
-
-    # Add Employee profiles that do not have payroll records (mapped to payroll IDs)
-    # We will attach the payroll_employee_id attribute to Employee objects for template use
-    mapped_employee_ids = {m.employee.id: m.payroll_employee_id for m in mappings}
-    for employee_obj in all_employees:
-        payroll_id = mapped_employee_ids.get(employee_obj.id)
-        if payroll_id and payroll_id not in processed_employee_ids:
-            setattr(employee_obj, 'employee_name', employee_obj.get_full_name())
-            # Provide an `employee_id` attribute for templates (payroll format)
-            setattr(employee_obj, 'employee_id', payroll_id)
-            unique_employees_data.append(employee_obj)
-            processed_employee_ids.add(payroll_id)
-        elif not payroll_id:
-            # No mapping exists; include the HR-only employee but mark employee_id as empty
-            setattr(employee_obj, 'employee_name', employee_obj.get_full_name())
-            setattr(employee_obj, 'employee_id', '')
-            unique_employees_data.append(employee_obj)
-
-    # Sort final list by employee ID for consistency
-    unique_employees_data.sort(key=lambda x: str(x.employee_id))
+    # Every payroll ID (and every mapped HR profile) has exactly one summary row
+    page_obj = _paginate_roster(request, PayrollEmployeeSummary.objects.all())
 
     context = {
-        'unique_employees': unique_employees_data
+        'page_obj': page_obj,
+        'unique_employees': page_obj.object_list,
+        'sort': request.GET.get('sort', 'id'),
+        'direction': request.GET.get('dir', 'asc'),
+        'roster_cache_key': _roster_cache_key(request, page_obj),
     }
     return render(request, 'employee_list.html', context)
+
+
+# ----------------------------------------------------------------------
+# IMPORT (see imports.py)
+# ----------------------------------------------------------------------
+
+def employee_import(request):
+    """Upload a CSV or XLSX of Employee profiles; valid rows are imported and the rest reported by line."""
+    result = None
+    if request.method == 'POST':
+        uploaded_file = request.FILES.get('employee_file')
+        if uploaded_file is None:
+            messages.error(request, "Choose a .csv or .xlsx file to import.")
+            return redirect('humanresource:employee_import')
+
+        dry_run = bool(request.POST.get('dry_run'))
+        started = perf_counter()
+        try:
+            result = import_employees(uploaded_file.file, uploaded_file.name, dry_run=dry_run)
+        except EmployeeImportError as e:
+            messages.error(request, str(e))
+            return redirect('humanresource:employee_import')
+        except (UnicodeDecodeError, csv.Error) as e:
+            messages.error(request, f"The file could not be read: {e}")
+            return redirect('humanresource:employee_import')
+
+        verb = "Validated" if dry_run else "Imported"
+        messages.success(request, (
+            f"{verb} {result.rows} row(s) in {perf_counter() - started:.1f}s: "
+            f"{result.created} new and {result.updated} updated profile(s)."
+        ))
+        if result.error_count:
+            messages.warning(request, f"{result.error_count} row(s) were skipped; see the report below.")
+
+    context = {
+        'result': result,
+        'fields': [(model_field.name, model_field.verbose_name) for model_field in IMPORT_FIELDS],
+        'required': REQUIRED_FOR_NEW,
+    }
+    return render(request, 'employee_import.html', context)
+
+
+# ----------------------------------------------------------------------
+# BULK EDIT (see bulk_edit.py)
+# ----------------------------------------------------------------------
+
+BULK_EDIT_PREVIEW = 200
+
+
+def _id_list(data, name):
+    """A list of IDs, or a string of them separated by commas or spaces (never its characters)."""
+    value = data.get(name) or []
+    if isinstance(value, str):
+        return value.replace(',', ' ').split()
+    if not isinstance(value, list) or not all(isinstance(item, (str, int)) and not isinstance(item, bool) for item in value):
+        raise BulkEditError(f"{name} must be a list of IDs.")
+    return value
+
+
+def _bulk_selection(data):
+    """Selection arguments from a form or API payload (filters, payroll IDs, checked employees)."""
+    return {
+        'filters': {name: str(data.get(name) or '').strip() for name in SELECTION_FILTERS},
+        'payroll_employee_ids': [normalize_payroll_id(payroll_id) for payroll_id in _id_list(data, 'payroll_employee_ids')],
+        'employee_ids': [int(pk) for pk in _id_list(data, 'employee_ids')],
+    }
+
+
+def bulk_edit(request):
+    """Change department, section, position or rates of a filtered or checked set of employees."""
+    if request.method == 'POST':
+        action = request.POST.get('action')
+        try:
+            if action == 'cancel':
+                cancel_bulk_edit(int(request.POST.get('bulk_edit_id', 0)))
+                messages.success(request, "Scheduled bulk edit cancelled.")
+            else:
+                data = {name: request.POST.get(name) for name in SELECTION_FILTERS + ('payroll_employee_ids',)}
+                if request.POST.get('scope') == 'selected':
+                    data['employee_ids'] = request.POST.getlist('employee_ids')
+                    if not data['employee_ids']:
+                        raise BulkEditError("Tick at least one employee, or apply to every match.")
+                selection = _bulk_selection(data)
+                # Change inputs are prefixed so they don't clash with the selection filters
+                changes = {name: request.POST.get(f'new_{name}') for name in ORGANIZATION_FIELDS}
+                changes.update({
+                    name: {'op': request.POST.get(f'new_{name}_op', 'set'), 'value': request.POST.get(f'new_{name}')}
+                    for name in RATE_FIELDS
+                })
+                edit = create_bulk_edit(
+                    select_employees(**selection), changes, _parse_date(request.POST.get('effective_date')),
+                    created_by=request.session.get('username', 'hr'), description=describe_selection(**selection),
+                )
+                if edit.status == 'applied':
+                    messages.success(request, f"Bulk edit applied to {edit.employee_count} employee(s).")
+                else:
+                    messages.success(request, f"Bulk edit for {edit.employee_count} employee(s) scheduled for {edit.effective_date:%Y-%m-%d}.")
+        except (BulkEditError, ValueError) as e:
+            messages.error(request, str(e))
+        return redirect('humanresource:bulk_edit')
+
+    selection = _bulk_selection({name: request.GET.get(name) for name in SELECTION_FILTERS + ('payroll_employee_ids',)})
+    employees = select_employees(**selection).select_related('mapping')
+    choices = Employee.objects.order_by()
+    context = {
+        'filters': selection['filters'],
+        'payroll_employee_ids': request.GET.get('payroll_employee_ids', ''),
+        'match_count': employees.count(),
+        'preview': employees[:BULK_EDIT_PREVIEW],
+        'preview_size': BULK_EDIT_PREVIEW,
+        'departments': choices.exclude(department='').values_list('department', flat=True).distinct().order_by('department'),
+        'statuses': Employee.STATUS_CHOICES,
+        'rate_fields': [(name, Employee._meta.get_field(name).verbose_name) for name in RATE_FIELDS],
+        'recent_edits': EmployeeBulkEdit.objects.all()[:25],
+        'today': timezone.localdate(),
+    }
+    return render(request, 'bulk_edit.html', context)
+
+
+def bulk_edit_detail(request, bulk_edit_id):
+    """Audit trail of one bulk edit: every value before and after, per employee."""
+    edit = get_object_or_404(EmployeeBulkEdit, pk=bulk_edit_id)
+    changes = edit.field_changes.select_related('employee', 'employee__mapping').order_by('employee__last_name', 'employee__first_name', 'field')
+    context = {
+        'edit': edit,
+        'page_obj': Paginator(changes, 100).get_page(request.GET.get('page')),
+    }
+    return render(request, 'bulk_edit_detail.html', context)
+
+
+def _bulk_edit_json(edit):
+    return {
+        'id': edit.pk,
+        'status': edit.status,
+        'effective_date': edit.effective_date.isoformat(),
+        'employee_count': edit.employee_count,
+        'changes': edit.changes,
+        'description': edit.description,
+        'created_by': edit.created_by,
+        'created_at': edit.created_at.isoformat(),
+        'applied_at': edit.applied_at.isoformat() if edit.applied_at else None,
+    }
+
+
+def bulk_edit_api(request):
+    """JSON API for bulk edits.
+
+    GET lists the latest edits. POST takes {"department": ..., "section": ...,
+    "position": ..., "payroll_employee_ids": [...], "employee_ids": [...],
+    "changes": {"position": "Operator", "monthly_daily_rate": {"op": "percent", "value": "5"}},
+    "effective_date": "YYYY-MM-DD"}, where the first five select the employees.
+    Like every HR POST it needs the session login and an X-CSRFToken header.
+    """
+    if request.method == 'GET':
+        return JsonResponse({'results': [_bulk_edit_json(edit) for edit in EmployeeBulkEdit.objects.all()[:50]]})
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Use GET or POST.'}, status=405)
+
+    try:
+        payload = json.loads(request.body or b'{}')
+        if not isinstance(payload, dict) or not isinstance(payload.get('changes'), dict):
+            raise BulkEditError('Send a JSON object with a "changes" object.')
+        effective_date = _parse_date(payload.get('effective_date'))
+        if payload.get('effective_date') and effective_date is None:
+            raise BulkEditError("effective_date must be YYYY-MM-DD.")
+        selection = _bulk_selection(payload)
+        edit = create_bulk_edit(
+            select_employees(**selection), payload['changes'], effective_date,
+            created_by=request.session.get('username', 'hr'), description=describe_selection(**selection),
+        )
+    except (BulkEditError, ValueError, TypeError) as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    return JsonResponse(_bulk_edit_json(edit), status=201)
+
+
+# ----------------------------------------------------------------------
+# MAPPING SUGGESTIONS (see matching.py)
+# ----------------------------------------------------------------------
+
+MAPPING_SUGGESTIONS_PAGE_SIZE = 100
+
+
+def mapping_suggestions(request):
+    """Review fuzzy-matched payroll ID -> Employee links and approve or reject them in bulk."""
+    username = request.session.get('username', 'hr')
+    pending = MappingSuggestion.objects.filter(status='pending')
+
+    if request.method == 'POST':
+        action = request.POST.get('action')
+        if action == 'suggest':
+            started = perf_counter()
+            created, compared = suggest_mappings()
+            messages.success(request, f"{created} suggestion(s) from {compared} compared name pair(s) in {perf_counter() - started:.1f}s.")
+        elif action in ('approve', 'reject', 'approve_above'):
+            if action == 'approve_above':
+                try:
+                    selected = pending.filter(score__gte=Decimal(request.POST.get('min_score') or '1'))
+                except InvalidOperation:
+                    messages.error(request, "Enter a score between 0 and 1.")
+                    return redirect('humanresource:mapping_suggestions')
+            else:
+                selected = pending.filter(pk__in=[int(pk) for pk in request.POST.getlist('suggestion_ids') if pk.isdigit()])
+            if action == 'reject':
+                messages.success(request, f"{reject_suggestions(selected, username)} suggestion(s) rejected.")
+            else:
+                messages.success(request, f"{approve_suggestions(selected, username)} payroll ID(s) mapped.")
+        return redirect('humanresource:mapping_suggestions')
+
+    context = {
+        'page_obj': Paginator(pending.select_related('employee'), MAPPING_SUGGESTIONS_PAGE_SIZE).get_page(request.GET.get('page')),
+        'unmapped_count': unmapped_payroll_ids().count(),
+        'approved_count': MappingSuggestion.objects.filter(status='approved').count(),
+        'rejected_count': MappingSuggestion.objects.filter(status='rejected').count(),
+    }
+    return render(request, 'mapping_suggestions.html', context)
+
+
 # --- CORRECTED & STRENGTHENED: edit_employee ---
 def edit_employee(request, employee_id):
-    current_role = request.session.get('role')
-    if current_role != 'hr':
-        messages.error(request, "Access denied. HR role required.")
-        return redirect('homepage')
-    
     # Normalize employee_id to match PayrollRecord format (zero-padded to 9 digits)
     try:
         emp_id_int = int(employee_id.strip().lstrip('0') or '0')
@@ -522,10 +804,7 @@ def edit_employee(request, employee_id):
     except EmployeeMapping.DoesNotExist:
         # Scenario B: Employee profile does NOT exist (transient Employee shown in form)
         is_existing = False
-        name_parts = original_bio_name.split()
-        first_name = name_parts[0] if name_parts else ''
-        last_name = name_parts[-1] if len(name_parts) > 1 else ''
-        middle_name = ' '.join(name_parts[1:-1]) if len(name_parts) > 2 else ''
+        first_name, middle_name, last_name = split_bio_name(original_bio_name)
         employee = Employee(
             first_name=first_name,
             last_name=last_name,
@@ -646,6 +925,7 @@ def edit_employee(request, employee_id):
                 )
                 # Create mapping to payroll ID
                 EmployeeMapping.objects.create(payroll_employee_id=normalized_employee_id, employee=employee_instance)
+                link_payroll_summary(normalized_employee_id, employee_instance)
                 action_msg = "created"
             else:
                 # Update logic (employee is already loaded and modified in the object)
@@ -655,8 +935,16 @@ def edit_employee(request, employee_id):
                     payroll_employee_id=normalized_employee_id,
                     defaults={'employee': employee}
                 )
+                link_payroll_summary(normalized_employee_id, employee)
                 action_msg = "updated"
             
+            index_employee(employee_instance if not is_existing else employee)
+            typeahead.invalidate_index()
+            attendance_cache.bump_data_version()
+            employee_profile_changed.send(
+                sender=Employee, employee=employee_instance if not is_existing else employee,
+                payroll_employee_id=normalized_employee_id,
+            )
             messages.success(request, f"Employee details for {employee.get_full_name()} successfully {action_msg}.")
             return redirect('humanresource:employee_list')
 
@@ -0,0 +1,120 @@
+"""Per-view request metrics collected by RequestMetricsMiddleware.
+
+Each worker process keeps the last PERF_METRICS_SAMPLES requests of every view
+in a ring buffer (collections.deque), so memory stays bounded and recording is
+a lock plus an append. The report is per process; with several workers each
+one shows its own recent traffic.
+"""
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.template.backends.django import DjangoTemplates, Template
+
+DEFAULT_SAMPLES = 200
+
+# Counters of the request being handled (None when metrics are off)
+current_request = ContextVar('navigation_app_request_metrics', default=None)
+
+_lock = threading.Lock()
+_buffers = {}
+
+
+def new_collector():
+    return {'queries': 0, 'db_ms': 0.0, 'template_ms': 0.0, 'template_depth': 0}
+
+
+def query_timer(execute, sql, params, many, context):
+    """connection.execute_wrapper hook: counts queries and their wall time."""
+    collector = current_request.get()
+    if collector is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        collector['queries'] += 1
+        collector['db_ms'] += (time.perf_counter() - started) * 1000
+
+
+class InstrumentedTemplate(Template):
+    def render(self, context=None, request=None):
+        collector = current_request.get()
+        if collector is None:
+            return super().render(context, request)
+
+        # Nested renders (a template rendered while another is rendering) count once
+        collector['template_depth'] += 1
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            collector['template_depth'] -= 1
+            if collector['template_depth'] == 0:
+                collector['template_ms'] += (time.perf_counter() - started) * 1000
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """DjangoTemplates backend whose templates report their render time to the metrics collector."""
+
+    def from_string(self, template_code):
+        return InstrumentedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return InstrumentedTemplate(template.template, self)
+
+
+def record(view_name, sample):
+    maxlen = getattr(settings, 'PERF_METRICS_SAMPLES', DEFAULT_SAMPLES)
+    with _lock:
+        buffer = _buffers.get(view_name)
+        if buffer is None or buffer.maxlen != maxlen:
+            buffer = _buffers[view_name] = deque(buffer or (), maxlen=maxlen)
+        buffer.append(sample)
+
+
+def reset():
+    with _lock:
+        _buffers.clear()
+
+
+def query_budget(view_name):
+    """Allowed queries for a view: PERF_QUERY_BUDGETS[view_name], else the namespace, else the default."""
+    budgets = getattr(settings, 'PERF_QUERY_BUDGETS', {})
+    if view_name in budgets:
+        return budgets[view_name]
+    namespace = view_name.rpartition(':')[0]
+    if namespace and namespace in budgets:
+        return budgets[namespace]
+    return getattr(settings, 'PERF_DEFAULT_QUERY_BUDGET', None)
+
+
+def _percentile(ordered, pct):
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def report():
+    """Rows of p50/p95/max per view and metric, slowest p95 total time first."""
+    with _lock:
+        snapshot = {view_name: list(buffer) for view_name, buffer in _buffers.items()}
+
+    rows = []
+    for view_name, samples in snapshot.items():
+        row = {'view_name': view_name, 'count': len(samples), 'budget': query_budget(view_name)}
+        for metric in ('queries', 'db_ms', 'template_ms', 'total_ms'):
+            ordered = sorted(sample[metric] for sample in samples)
+            row[metric] = {
+                'p50': _percentile(ordered, 50),
+                'p95': _percentile(ordered, 95),
+                'max': ordered[-1],
+            }
+        row['over_budget'] = sum(1 for sample in samples if sample['over_budget'])
+        row['last_seen'] = samples[-1]['at']
+        rows.append(row)
+
+    rows.sort(key=lambda row: row['total_ms']['p95'], reverse=True)
+    return rows
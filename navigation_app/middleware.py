@@ -0,0 +1,199 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import JsonResponse
+from django.shortcuts import redirect
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
+
+from . import metrics, profiling
+from .models import UsersAccount
+
+logger = logging.getLogger(__name__)
+
+ACCOUNT_CACHE_PREFIX = 'navigation_app:account:'
+
+
+def account_cache_key(account_id):
+    return f'{ACCOUNT_CACHE_PREFIX}{account_id}'
+
+
+def cache_account(account):
+    """Share a loaded account across requests for ACCOUNT_CACHE_SECONDS."""
+    cache.set(account_cache_key(account.pk), account, getattr(settings, 'ACCOUNT_CACHE_SECONDS', 30))
+
+
+def forget_account(account_id):
+    """Drop a cached account (after it is deleted, deactivated or changes role)."""
+    cache.delete(account_cache_key(account_id))
+
+
+def load_account(account_id):
+    """Return the active UsersAccount for account_id, using the short-lived cache first."""
+    if not account_id:
+        return None
+    account = cache.get(account_cache_key(account_id))
+    if account is None:
+        account = UsersAccount.objects.filter(id=account_id, is_active=True).first()
+        if account is not None:
+            cache_account(account)
+    return account
+
+
+def find_role_rule(resolver_match, rules):
+    """Most specific rule for a resolved URL: 'ns:name' first, then each enclosing namespace.
+
+    Returns (found, allowed_roles).
+    """
+    namespaces = list(resolver_match.namespaces)
+    candidates = []
+    if resolver_match.url_name:
+        candidates.append(':'.join(namespaces + [resolver_match.url_name]))
+    for depth in range(len(namespaces), 0, -1):
+        candidates.append(':'.join(namespaces[:depth]))
+
+    for candidate in candidates:
+        if candidate in rules:
+            return True, rules[candidate]
+    return False, None
+
+
+class AccountMiddleware:
+    """Loads the logged-in UsersAccount at most once per request and enforces ROLE_ACCESS_RULES.
+
+    `request.account` is lazy, so public pages never touch the database, and the
+    account itself is cached for a few seconds so protected pages usually don't
+    either.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.account = SimpleLazyObject(lambda: load_account(request.session.get('account_id')))
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        found, allowed_roles = find_role_rule(request.resolver_match, getattr(settings, 'ROLE_ACCESS_RULES', {}))
+        if not found or allowed_roles is None:
+            return None # Public (or not governed by the rules)
+
+        # API clients always get JSON errors, never a redirect to the login page
+        wants_json = 'application/json' in request.headers.get('Accept', '') or 'api' in request.resolver_match.namespaces
+
+        if not request.session.get('account_id') or not request.account:
+            if request.session.get('account_id'):
+                # Account was deleted or deactivated since login
+                request.session.flush()
+            if wants_json:
+                return JsonResponse({'error': 'Login required.'}, status=401)
+            messages.error(request, "Please log in to access this page.")
+            return redirect('navigation_app:login')
+
+        if allowed_roles != '*' and request.account.role not in allowed_roles:
+            if wants_json:
+                return JsonResponse({'error': 'Access denied.'}, status=403)
+            role_names = dict(UsersAccount.ROLE_CHOICES)
+            messages.error(request, f"Access denied. {' or '.join(role_names.get(role, role) for role in allowed_roles)} role required.")
+            return redirect('navigation_app:user_home')
+
+        return None
+
+
+class RequestMetricsMiddleware:
+    """Records query count, DB time, template render time and total time per view name.
+
+    Opt-in with PERF_METRICS_ENABLED; otherwise Django drops it at startup. Template
+    time needs TEMPLATES to use navigation_app.metrics.InstrumentedDjangoTemplates.
+    Views over their PERF_QUERY_BUDGETS entry are logged as warnings.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PERF_METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        collector = metrics.new_collector()
+        token = metrics.current_request.set(collector)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(metrics.query_timer))
+                response = self.get_response(request)
+        finally:
+            metrics.current_request.reset(token)
+
+        match = request.resolver_match
+        if match is None:
+            return response # 404s and other unresolved URLs
+
+        total_ms = (time.perf_counter() - started) * 1000
+        budget = metrics.query_budget(match.view_name)
+        over_budget = budget is not None and collector['queries'] > budget
+        if over_budget:
+            logger.warning(
+                "%s ran %d queries (budget %d) for %s %s",
+                match.view_name, collector['queries'], budget, request.method, request.get_full_path(),
+            )
+
+        metrics.record(match.view_name, {
+            'queries': collector['queries'],
+            'db_ms': round(collector['db_ms'], 2),
+            'template_ms': round(collector['template_ms'], 2),
+            'total_ms': round(total_ms, 2),
+            'status': response.status_code,
+            'over_budget': over_budget,
+            'at': timezone.now(),
+        })
+        return response
+
+
+class ProfilerMiddleware:
+    """Runs the view under cProfile (and optionally tracemalloc) when profiling was asked for.
+
+    Admins profile their own requests with ?profile=1 / ?profile=mem or the session
+    switch; any account can be profiled by setting its profile_mode from the
+    Profiler page. Must be last in MIDDLEWARE so the role rules have already been
+    applied. Requests without a logged-in session are skipped before
+    request.account is touched; for the rest the role check (or the account
+    cache) has normally loaded it already.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PERF_PROFILER_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not request.session.get('account_id'):
+            return None # Nobody is logged in; leave request.account unevaluated
+        account = request.account
+        if not account: # Account deleted or deactivated since login
+            return None
+        mode = account.profile_mode or None
+        if account.role == 'admin':
+            mode = profiling.requested_mode(request) or mode
+        if mode is None:
+            return None
+
+        try:
+            response, capture = profiling.run_profiled(mode, view_func, request, *view_args, **view_kwargs)
+        except ValueError:
+            # Another profiler is already active in this thread (e.g. a debugger); run normally
+            logger.warning("Profiling skipped for %s: profiler already active", request.resolver_match.view_name)
+            return None
+
+        summary = profiling.save_profile(capture, request, request.resolver_match.view_name, response.status_code)
+        response['X-Profile'] = summary['name']
+        return response
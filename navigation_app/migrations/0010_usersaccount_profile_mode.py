@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('navigation_app', '0009_usersaccount_created_at_usersaccount_is_active_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usersaccount',
+            name='profile_mode',
+            field=models.CharField(blank=True, choices=[('', 'Off'), ('cpu', 'CPU'), ('mem', 'CPU + Memory')], default='', max_length=3),
+        ),
+    ]
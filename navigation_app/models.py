@@ -18,6 +18,14 @@ class UsersAccount(models.Model):
     password = models.CharField(max_length=100) # Storing plain text password
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+
+    # Set by an admin on the Profiler page: this account's requests are captured by ProfilerMiddleware
+    PROFILE_MODE_CHOICES = [
+        ('', 'Off'),
+        ('cpu', 'CPU'),
+        ('mem', 'CPU + Memory'),
+    ]
+    profile_mode = models.CharField(max_length=3, choices=PROFILE_MODE_CHOICES, blank=True, default='')
     
     class Meta:
         db_table = "Users"
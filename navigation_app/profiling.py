@@ -0,0 +1,159 @@
+"""On-demand cProfile / tracemalloc capture of single requests (admins only).
+
+ProfilerMiddleware runs a view under cProfile when an admin asks for it, either
+with ?profile=1 (?profile=mem adds tracemalloc) or by switching profiling on for
+their session from the Profiles admin page. Each capture is written to
+PERF_PROFILE_DIR as a .prof file (open it with pstats or snakeviz) plus a .json
+summary that the admin page lists. The directory is kept out of MEDIA_ROOT,
+which is served to anyone when DEBUG is on; the .prof files are only
+downloadable from the admin page.
+"""
+import cProfile
+import json
+import pstats
+import re
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+SESSION_KEY = 'profiling' # None/absent, 'cpu' or 'mem'
+TOP_FUNCTIONS = 25
+TOP_ALLOCATIONS = 10
+DEFAULT_KEEP = 50
+
+
+def profile_dir():
+    return Path(getattr(settings, 'PERF_PROFILE_DIR', Path(settings.BASE_DIR) / 'profiles'))
+
+
+def requested_mode(request):
+    """'cpu', 'mem' or None. Cheap: only looks at the query string and the already-loaded session."""
+    flag = request.GET.get('profile')
+    if flag is not None:
+        if flag in ('', '0', 'off'):
+            return None
+        return 'mem' if flag == 'mem' else 'cpu'
+    return request.session.get(SESSION_KEY)
+
+
+def _short_path(filename):
+    for marker in ('site-packages/', str(settings.BASE_DIR) + '/'):
+        if marker in filename:
+            return filename.split(marker, 1)[1]
+    return filename
+
+
+def top_functions(profiler, limit=TOP_FUNCTIONS):
+    stats = pstats.Stats(profiler)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE)
+    rows = []
+    for func in stats.fcn_list[:limit]:
+        primitive_calls, total_calls, own_time, cumulative_time, _ = stats.stats[func]
+        filename, line, name = func
+        rows.append({
+            'function': f"{_short_path(filename)}:{line}({name})" if line else name,
+            'calls': total_calls if total_calls == primitive_calls else f"{total_calls}/{primitive_calls}",
+            'own_ms': round(own_time * 1000, 2),
+            'cumulative_ms': round(cumulative_time * 1000, 2),
+        })
+    return rows
+
+
+def run_profiled(mode, func, *args, **kwargs):
+    """Call func under cProfile (and tracemalloc for mode 'mem'); returns (result, capture)."""
+    trace_memory = mode == 'mem' and not tracemalloc.is_tracing()
+    if trace_memory:
+        tracemalloc.start()
+
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    try:
+        result = profiler.runcall(func, *args, **kwargs)
+    finally:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        memory = None
+        if trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            memory = {
+                'peak_kb': round(peak / 1024, 1),
+                'top_allocations': [
+                    {'location': f"{_short_path(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                     'size_kb': round(stat.size / 1024, 1), 'count': stat.count}
+                    for stat in snapshot.statistics('lineno')[:TOP_ALLOCATIONS]
+                ],
+            }
+
+    return result, {'profiler': profiler, 'elapsed_ms': round(elapsed_ms, 2), 'memory': memory}
+
+
+def save_profile(capture, request, view_name, status_code):
+    """Write <stamp>_<view>_<ms>ms.prof and its .json summary; prunes old captures."""
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+
+    now = timezone.now()
+    stem = f"{now:%Y%m%d-%H%M%S-%f}_{re.sub(r'[^A-Za-z0-9_.-]', '.', view_name)}_{int(capture['elapsed_ms'])}ms"
+    capture['profiler'].dump_stats(directory / f"{stem}.prof")
+
+    summary = {
+        'name': stem,
+        'view_name': view_name,
+        'path': request.get_full_path(),
+        'method': request.method,
+        'status': status_code,
+        'user': request.session.get('username'),
+        'created_at': now.isoformat(),
+        'elapsed_ms': capture['elapsed_ms'],
+        'memory': capture['memory'],
+        'top_functions': top_functions(capture['profiler']),
+    }
+    (directory / f"{stem}.json").write_text(json.dumps(summary, indent=1))
+
+    prune(getattr(settings, 'PERF_PROFILE_KEEP', DEFAULT_KEEP))
+    return summary
+
+
+def list_profiles(limit=None):
+    """Saved capture summaries, newest first."""
+    directory = profile_dir()
+    if not directory.is_dir():
+        return []
+    summaries = []
+    for path in sorted(directory.glob('*.json'), reverse=True)[:limit]:
+        try:
+            summaries.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue # Half-written or pruned meanwhile
+    return summaries
+
+
+def profile_file(name):
+    """Path of a saved .prof by capture name, or None (never escapes the profile directory)."""
+    if not re.fullmatch(r'[A-Za-z0-9_.-]+', name or ''):
+        return None
+    path = profile_dir() / f"{name}.prof"
+    return path if path.is_file() else None
+
+
+def prune(keep):
+    directory = profile_dir()
+    for summary_path in sorted(directory.glob('*.json'), reverse=True)[keep:]:
+        summary_path.unlink(missing_ok=True)
+        summary_path.with_suffix('.prof').unlink(missing_ok=True)
+
+
+def delete_all():
+    directory = profile_dir()
+    if not directory.is_dir():
+        return 0
+    removed = 0
+    for path in directory.glob('*.prof'):
+        path.unlink(missing_ok=True)
+        path.with_suffix('.json').unlink(missing_ok=True)
+        removed += 1
+    return removed
@@ -1,3 +1,152 @@
-from django.test import TestCase
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.test import Client, TestCase, override_settings
+
+from . import metrics, profiling
+from .middleware import forget_account
+from .models import UsersAccount
 
 # Create your tests here.
+
+
+class AccountAccessTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = UsersAccount.objects.create(username='admin_access', password='secret', role='admin')
+        cls.hr = UsersAccount.objects.create(username='hr_access', password='secret', role='hr')
+        UsersAccount.objects.create(username='tk_access', password='secret', role='timekeeper')
+
+    def login(self, username, role, client=None):
+        (client or self.client).post('/', {'username': username, 'password': 'secret', 'role': role})
+
+    def test_role_rules(self):
+        self.assertRedirects(self.client.get('/humanresource/employee-list/'), '/')
+
+        self.login('tk_access', 'timekeeper')
+        self.assertEqual(self.client.get('/user-home/').status_code, 200)
+        self.assertRedirects(self.client.get('/humanresource/employee-list/'), '/user-home/')
+        self.assertRedirects(self.client.get('/admin-home/'), '/user-home/', fetch_redirect_response=False)
+        response = self.client.get('/humanresource/employee-list/', HTTP_ACCEPT='application/json')
+        self.assertEqual((response.status_code, response.json()), (403, {'error': 'Access denied.'}))
+
+        self.login('hr_access', 'hr')
+        self.assertEqual(self.client.get('/humanresource/employee-list/').status_code, 200)
+
+    def test_deleted_account_is_logged_out(self):
+        self.login('hr_access', 'hr')
+        self.assertEqual(self.client.get('/humanresource/employee-list/').status_code, 200)
+
+        admin = Client()
+        self.login('admin_access', 'admin', admin)
+        admin.post('/add-user/', {'delete_username': 'hr_access'})
+        self.assertFalse(UsersAccount.objects.filter(username='hr_access').exists())
+
+        self.assertRedirects(self.client.get('/humanresource/employee-list/'), '/')
+        self.assertNotIn('account_id', self.client.session)
+
+    def test_inactive_account_is_logged_out(self):
+        self.login('admin_access', 'admin')
+        UsersAccount.objects.filter(pk=self.admin.pk).update(is_active=False)
+        forget_account(self.admin.pk)
+
+        response = self.client.get('/api/v1/employees/')
+        self.assertEqual((response.status_code, response.json()), (401, {'error': 'Login required.'}))
+        self.assertNotIn('account_id', self.client.session)
+
+
+@override_settings(PERF_METRICS_ENABLED=True, PERF_QUERY_BUDGETS={'humanresource:employee_list': 0})
+class RequestMetricsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        UsersAccount.objects.create(username='hr_metrics', password='secret', role='hr')
+
+    def setUp(self):
+        metrics.reset()
+        self.client.post('/', {'username': 'hr_metrics', 'password': 'secret', 'role': 'hr'})
+
+    def test_records_queries_and_render_time_per_view(self):
+        with self.assertLogs('navigation_app.middleware', 'WARNING') as logs:
+            self.client.get('/humanresource/employee-list/')
+
+        rows = {row['view_name']: row for row in metrics.report()}
+        row = rows['humanresource:employee_list']
+        self.assertEqual(row['count'], 1)
+        self.assertGreater(row['queries']['max'], 0)
+        self.assertGreater(row['template_ms']['max'], 0)
+        self.assertEqual(row['over_budget'], 1)
+        self.assertIn('humanresource:employee_list ran', logs.output[0])
+
+    @override_settings(PERF_METRICS_SAMPLES=3)
+    def test_ring_buffer_keeps_only_recent_requests(self):
+        for _ in range(5):
+            self.client.get('/humanresource/search_employee/')
+
+        rows = {row['view_name']: row for row in metrics.report()}
+        self.assertEqual(rows['humanresource:search_employee']['count'], 3)
+
+
+class ProfilerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = UsersAccount.objects.create(username='admin_profiler', password='secret', role='admin')
+        cls.hr = UsersAccount.objects.create(username='hr_profiled', password='secret', role='hr')
+
+    def setUp(self):
+        captures = tempfile.TemporaryDirectory()
+        self.addCleanup(captures.cleanup)
+        self.enterContext(override_settings(PERF_PROFILE_DIR=captures.name))
+
+    def login(self, account):
+        self.client.post('/', {'username': account.username, 'password': 'secret', 'role': account.role})
+
+    def test_admin_profiles_a_page_with_the_query_parameter(self):
+        self.login(self.admin)
+        response = self.client.get('/admin-home/?profile=mem')
+
+        saved = profiling.list_profiles()
+        self.assertEqual(len(saved), 1)
+        self.assertEqual(response['X-Profile'], saved[0]['name'])
+        self.assertEqual(saved[0]['view_name'], 'navigation_app:admin_home')
+        self.assertTrue(saved[0]['top_functions'])
+        self.assertIsNotNone(saved[0]['memory'])
+        self.assertContains(self.client.get('/admin-home/profiles/'), 'navigation_app:admin_home')
+
+    def test_other_roles_cannot_profile_themselves(self):
+        self.login(self.hr)
+        response = self.client.get('/humanresource/employee-list/?profile=1')
+
+        self.assertNotIn('X-Profile', response)
+        self.assertEqual(profiling.list_profiles(), [])
+
+    def test_admin_can_profile_another_account(self):
+        self.login(self.admin)
+        self.client.post('/admin-home/profiles/', {'action': 'account', 'account_id': self.hr.pk, 'mode': 'cpu'})
+        self.client.get('/logout/')
+
+        self.login(self.hr)
+        response = self.client.get('/humanresource/employee-list/')
+
+        self.assertIn('X-Profile', response)
+        self.assertEqual(profiling.list_profiles()[0]['user'], 'hr_profiled')
+
+    def test_captures_are_only_served_to_admins(self):
+        self.assertFalse(Path(settings.PERF_PROFILE_DIR).is_relative_to(settings.MEDIA_ROOT))
+
+        self.login(self.admin)
+        name = self.client.get('/admin-home/?profile=1')['X-Profile']
+        self.assertTrue((Path(profiling.profile_dir()) / f'{name}.prof').is_file())
+        self.assertEqual(self.client.get(f'/admin-home/profiles/{name}.prof').status_code, 200)
+
+        self.login(self.hr)
+        self.assertRedirects(
+            self.client.get(f'/admin-home/profiles/{name}.prof'), '/user-home/', fetch_redirect_response=False,
+        )
+
+    def test_anonymous_requests_never_load_an_account(self):
+        with mock.patch('navigation_app.middleware.load_account') as load_account:
+            response = self.client.get('/?profile=1')
+        self.assertEqual(response.status_code, 200)
+        load_account.assert_not_called()
@@ -15,5 +15,8 @@ urlpatterns = [
 
 #Admin Urls
     path('admin-home/', views.admin_home, name='admin_home'),
+    path('admin-home/performance/', views.performance_metrics, name='performance_metrics'),
+    path('admin-home/profiles/', views.profiles, name='profiles'),
+    path('admin-home/profiles/<str:name>.prof', views.profile_download, name='profile_download'),
     path('add-user/', views.AddUser, name="AddUser"),
 ]
\ No newline at end of file
@@ -1,9 +1,13 @@
 from django.shortcuts import render, redirect
-from django.http import HttpResponse
+from django.http import FileResponse, Http404, HttpResponse
 from .models import UsersAccount
 from django.contrib import messages
 from django.db.models import Q # Import for more complex queries if needed
 from humanresource import views
+from humanresource import attendance_cache
+from django.conf import settings
+from . import metrics, profiling
+from .middleware import cache_account, forget_account
 
 def login_view(request):
     """Handle login page display and plain text authentication."""
@@ -23,6 +27,7 @@ def login_view(request):
                 request.session['account_id'] = account.id
                 request.session['role'] = account.role
                 request.session['username'] = account.username
+                cache_account(account)
                 
                 if account.role == 'admin':
                     return redirect('navigation_app:admin_home')
@@ -52,9 +57,13 @@ def logout_view(request):
 # --- Decorator for Authentication Check ---
 
 def auth_required(func):
-    """Decorator to check for session-based authentication."""
+    """Decorator to check for session-based authentication.
+
+    Role rules live in settings.ROLE_ACCESS_RULES (enforced by AccountMiddleware);
+    this only guards views that sit outside those rules.
+    """
     def wrapper(request, *args, **kwargs):
-        if not request.session.get('account_id'):
+        if not request.session.get('account_id') or not request.account:
             messages.error(request, "Please log in to access this page.")
             return redirect('navigation_app:login')
         return func(request, *args, **kwargs)
@@ -66,27 +75,76 @@ def auth_required(func):
 @auth_required
 def admin_home(request):
     """Display admin dashboard."""
-    account_id = request.session.get('account_id')
-    try:
-        account = UsersAccount.objects.get(id=account_id)
-        if account.role != 'admin':
-            messages.error(request, "Access denied. Admin role required.")
-            return redirect('navigation_app:user_home')
-        return render(request, 'admin_nav/admin_home.html', {'account': account})
-    except UsersAccount.DoesNotExist:
-        request.session.clear()
-        return redirect('navigation_app:login')
+    # Admin role is enforced by AccountMiddleware; request.account is already loaded
+    context = {
+        'account': request.account,
+        'attendance_cache': attendance_cache.stats(),
+    }
+    return render(request, 'admin_nav/admin_home.html', context)
+
+
+def performance_metrics(request):
+    """Per-view query count / DB / template / total time (p50, p95, max) from RequestMetricsMiddleware."""
+    if request.method == 'POST':
+        metrics.reset()
+        messages.success(request, "Performance samples cleared.")
+        return redirect('navigation_app:performance_metrics')
+
+    context = {
+        'account': request.account,
+        'enabled': getattr(settings, 'PERF_METRICS_ENABLED', False),
+        'sample_size': getattr(settings, 'PERF_METRICS_SAMPLES', metrics.DEFAULT_SAMPLES),
+        'rows': metrics.report(),
+    }
+    return render(request, 'admin_nav/performance_metrics.html', context)
+
+
+def profiles(request):
+    """Recent cProfile captures; switch session-wide profiling on/off or delete captures."""
+    if request.method == 'POST':
+        action = request.POST.get('action')
+        if action in ('cpu', 'mem'):
+            request.session[profiling.SESSION_KEY] = action
+            messages.success(request, "Profiling is on for every page you open in this session.")
+        elif action == 'off':
+            request.session.pop(profiling.SESSION_KEY, None)
+            messages.success(request, "Profiling is off.")
+        elif action == 'clear':
+            messages.success(request, f"Deleted {profiling.delete_all()} profile(s).")
+        elif action == 'account':
+            mode = request.POST.get('mode', '')
+            account = UsersAccount.objects.filter(pk=request.POST.get('account_id')).first()
+            if account is None or mode not in dict(UsersAccount.PROFILE_MODE_CHOICES):
+                messages.error(request, "Select an account and a profiling mode.")
+            else:
+                account.profile_mode = mode
+                account.save(update_fields=['profile_mode'])
+                forget_account(account.pk) # Cached copies would keep the old mode for ACCOUNT_CACHE_SECONDS
+                messages.success(request, f"Profiling for {account.username}: {account.get_profile_mode_display()}.")
+        return redirect('navigation_app:profiles')
+
+    context = {
+        'account': request.account,
+        'enabled': getattr(settings, 'PERF_PROFILER_ENABLED', True),
+        'session_mode': request.session.get(profiling.SESSION_KEY),
+        'accounts': UsersAccount.objects.filter(is_active=True).order_by('username'),
+        'profiled_accounts': UsersAccount.objects.exclude(profile_mode='').order_by('username'),
+        'profile_modes': UsersAccount.PROFILE_MODE_CHOICES[1:],
+        'profiles': profiling.list_profiles(getattr(settings, 'PERF_PROFILE_KEEP', profiling.DEFAULT_KEEP)),
+    }
+    return render(request, 'admin_nav/profiles.html', context)
+
+
+def profile_download(request, name):
+    path = profiling.profile_file(name)
+    if path is None:
+        raise Http404("Profile not found.")
+    return FileResponse(path.open('rb'), as_attachment=True, filename=path.name)
 
 @auth_required
 def UserHome(request):
     """Display non-admin user home page."""
-    account_id = request.session.get('account_id')
-    try:
-        account = UsersAccount.objects.get(id=account_id)
-        return render(request, 'user_nav/user_home.html', {'account': account})
-    except UsersAccount.DoesNotExist:
-        request.session.clear()
-        return redirect('navigation_app:login')
+    return render(request, 'user_nav/user_home.html', {'account': request.account})
 
 
 def Base(request):
@@ -102,12 +160,7 @@ def Base(request):
 
 @auth_required
 def AddUser(request):
-    """Handle create/delete actions for users by an Admin."""
-    # Enforce admin role
-    if request.session.get('role') != 'admin':
-        messages.error(request, "Admin privileges are required for user management.")
-        return redirect('navigation_app:user_home')
-
+    """Handle create/delete actions for users by an Admin (admin role enforced by AccountMiddleware)."""
     if request.method == 'POST':
         # --- Delete action ---
         delete_username = request.POST.get('delete_username')
@@ -119,6 +172,7 @@ def AddUser(request):
                     return redirect('navigation_app:AddUser')
                     
                 acct = UsersAccount.objects.get(username=delete_username)
+                forget_account(acct.id)
                 acct.delete()
                 messages.success(request, f'User "{delete_username}" deleted.')
             except UsersAccount.DoesNotExist:
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class TimekeeperConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'timekeeper'
+
+    def ready(self):
+        from humanresource import signals
+        from . import receivers
+
+        signals.payroll_ingested.connect(receivers.payroll_ingested, dispatch_uid='timekeeper_latest_punch_ingested')
+        signals.payroll_deleted.connect(receivers.payroll_deleted, dispatch_uid='timekeeper_latest_punch_deleted')
+        signals.attendance_corrected.connect(receivers.attendance_corrected, dispatch_uid='timekeeper_attendance_corrected')
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from timekeeper.punches import rebuild_latest_punches
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the latest-punch index (LatestPunch) behind the on-site board from the payroll records.'
+
+    def handle(self, *args, **options):
+        rows = rebuild_latest_punches()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt latest punch for {rows} employee(s)."))
@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from humanresource.attendance import cutoff_period
+from timekeeper.scanner import scan_period
+
+
+class Command(BaseCommand):
+    help = 'Scan the payroll logs of a period for missing, duplicate and unpaired punches (AttendanceException).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='First day (YYYY-MM-DD); defaults to the current cut-off')
+        parser.add_argument('--end', help='Last day (YYYY-MM-DD); defaults to the current cut-off')
+
+    def handle(self, *args, **options):
+        start_date, end_date = cutoff_period(timezone.localdate())
+        try:
+            if options['start']:
+                start_date = datetime.strptime(options['start'], '%Y-%m-%d').date()
+            if options['end']:
+                end_date = datetime.strptime(options['end'], '%Y-%m-%d').date()
+        except ValueError as e:
+            raise CommandError(f"Invalid date: {e}")
+
+        found = scan_period(start_date, end_date)
+        self.stdout.write(self.style.SUCCESS(f"{start_date} to {end_date}: {found} exception(s) found."))
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LatestPunch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payroll_employee_id', models.CharField(max_length=50, unique=True)),
+                ('employee_name', models.CharField(blank=True, default='', max_length=150)),
+                ('log_code', models.CharField(max_length=10)),
+                ('punched_at', models.DateTimeField()),
+                ('is_in', models.BooleanField(default=False)),
+            ],
+            options={
+                'db_table': 'LatestPunch',
+                'indexes': [models.Index(fields=['is_in', 'punched_at'], name='latest_punch_in_idx')],
+            },
+        ),
+    ]
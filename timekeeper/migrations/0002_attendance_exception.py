@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timekeeper', '0001_latest_punch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceException',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payroll_employee_id', models.CharField(max_length=50)),
+                ('employee_name', models.CharField(blank=True, default='', max_length=150)),
+                ('kind', models.CharField(choices=[('missing_out', 'Missing OUT'), ('missing_in', 'Missing IN'), ('duplicate', 'Duplicate punch'), ('unknown_code', 'Unknown log code'), ('long_shift', 'Implausibly long shift')], max_length=20)),
+                ('log_date', models.DateField()),
+                ('log_time', models.CharField(max_length=10)),
+                ('log_code', models.CharField(max_length=10)),
+                ('detail', models.CharField(blank=True, default='', max_length=255)),
+                ('status', models.CharField(choices=[('open', 'Open'), ('resolved', 'Resolved'), ('ignored', 'Ignored')], default='open', max_length=10)),
+                ('note', models.CharField(blank=True, default='', max_length=255)),
+                ('resolved_by', models.CharField(blank=True, default='', max_length=100)),
+                ('resolved_at', models.DateTimeField(blank=True, null=True)),
+                ('detected_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'AttendanceException',
+                'ordering': ['log_date', 'payroll_employee_id', 'log_time'],
+                'indexes': [models.Index(fields=['status', 'log_date'], name='attendance_exc_status_idx')],
+                'constraints': [models.UniqueConstraint(fields=('payroll_employee_id', 'kind', 'log_date', 'log_time'), name='attendance_exception_unique')],
+            },
+        ),
+    ]
@@ -1,3 +1,71 @@
 from django.db import models
 
 # Create your models here.
+
+
+class LatestPunch(models.Model):
+    """The most recent biometric punch of each payroll ID (maintained by timekeeper.punches).
+
+    Keeps "who is clocked in" to one indexed lookup instead of a
+    latest-row-per-employee query over PayrollRecord.
+    """
+    payroll_employee_id = models.CharField(max_length=50, unique=True)
+    employee_name = models.CharField(max_length=150, blank=True, default='')
+    log_code = models.CharField(max_length=10)
+    punched_at = models.DateTimeField()
+    is_in = models.BooleanField(default=False) # log_code is an IN code (0, 2, 5)
+
+    class Meta:
+        db_table = 'LatestPunch'
+        indexes = [
+            # On-site board: is_in = true AND punched_at >= now - TIMEKEEPER_ON_SITE_HOURS
+            models.Index(fields=['is_in', 'punched_at'], name='latest_punch_in_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.payroll_employee_id} {self.log_code} @ {self.punched_at}"
+
+
+class AttendanceException(models.Model):
+    """A punch the attendance scanner (timekeeper.scanner) could not pair cleanly, for triage."""
+    KIND_CHOICES = [
+        ('missing_out', 'Missing OUT'),
+        ('missing_in', 'Missing IN'),
+        ('duplicate', 'Duplicate punch'),
+        ('unknown_code', 'Unknown log code'),
+        ('long_shift', 'Implausibly long shift'),
+    ]
+    STATUS_CHOICES = [
+        ('open', 'Open'),
+        ('resolved', 'Resolved'),
+        ('ignored', 'Ignored'),
+    ]
+
+    payroll_employee_id = models.CharField(max_length=50)
+    employee_name = models.CharField(max_length=150, blank=True, default='')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    # The punch the exception is about
+    log_date = models.DateField()
+    log_time = models.CharField(max_length=10)
+    log_code = models.CharField(max_length=10)
+    detail = models.CharField(max_length=255, blank=True, default='')
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='open')
+    note = models.CharField(max_length=255, blank=True, default='')
+    resolved_by = models.CharField(max_length=100, blank=True, default='')
+    resolved_at = models.DateTimeField(null=True, blank=True)
+    detected_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'AttendanceException'
+        ordering = ['log_date', 'payroll_employee_id', 'log_time']
+        constraints = [
+            # Rescans never duplicate an exception (and keep its triage status)
+            models.UniqueConstraint(fields=['payroll_employee_id', 'kind', 'log_date', 'log_time'], name='attendance_exception_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'log_date'], name='attendance_exc_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.payroll_employee_id} {self.get_kind_display()} {self.log_date} {self.log_time}"
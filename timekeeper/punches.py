@@ -0,0 +1,166 @@
+"""Maintenance of LatestPunch, the latest-punch-per-employee index.
+
+An upload only adds punches, so the upload's own rows are read once (by
+upload_history, O(new rows)) and each employee's row is replaced when the
+upload holds a later punch. Deletes and punch corrections can change an
+employee's latest punch; those employees are re-read from their last log date
+only (PayrollEmployeeSummary.last_log_date, already refreshed by a delete) with
+the corrections from that day on overlaid.
+"""
+import operator
+from datetime import date, datetime, timedelta
+from functools import reduce
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import OuterRef, Q, Subquery
+from django.utils import timezone
+
+from humanresource.corrections import apply_corrections, load_corrections
+from humanresource.deletion import truncate_models
+from humanresource.models import EmployeeMapping, PayrollEmployeeSummary, PayrollRecord
+
+from .models import LatestPunch
+
+IN_CODES = ('0', '2', '5')
+PUNCH_BATCH_SIZE = 200
+DEFAULT_ON_SITE_HOURS = 16
+UNASSIGNED = 'Unassigned'
+
+
+def punch_datetime(log_date, log_time):
+    try:
+        moment = datetime.combine(log_date, datetime.strptime(log_time, '%H:%M:%S').time())
+    except ValueError:
+        moment = datetime.combine(log_date, datetime.min.time())
+    return timezone.make_aware(moment)
+
+
+def _latest_by_employee(rows):
+    """(employee_id, name, code, log_date, log_time) rows -> {employee_id: latest row}."""
+    latest = {}
+    for row in rows:
+        current = latest.get(row[0])
+        if current is None or (row[3], row[4]) >= (current[3], current[4]):
+            latest[row[0]] = row
+    return latest
+
+
+def _save_latest(latest, replace=False):
+    """Upsert LatestPunch rows. Unless replace, an existing later punch is kept."""
+    ids = list(latest)
+    for offset in range(0, len(ids), PUNCH_BATCH_SIZE):
+        batch = ids[offset:offset + PUNCH_BATCH_SIZE]
+        existing = {row.payroll_employee_id: row for row in LatestPunch.objects.filter(payroll_employee_id__in=batch)}
+        to_create, to_update = [], []
+        for emp_id in batch:
+            _, name, code, log_date, log_time = latest[emp_id]
+            punched_at = punch_datetime(log_date, log_time)
+            row = existing.get(emp_id)
+            if row is None:
+                row = LatestPunch(payroll_employee_id=emp_id)
+                to_create.append(row)
+            elif replace or punched_at >= row.punched_at:
+                to_update.append(row)
+            else:
+                continue
+            row.employee_name = name
+            row.log_code = code
+            row.punched_at = punched_at
+            row.is_in = code in IN_CODES
+        with transaction.atomic():
+            LatestPunch.objects.bulk_create(to_create)
+            LatestPunch.objects.bulk_update(to_update, ['employee_name', 'log_code', 'punched_at', 'is_in'])
+
+
+def record_upload(history_id):
+    """Fold one upload's punches into LatestPunch."""
+    rows = (
+        PayrollRecord.objects.filter(upload_history_id=history_id)
+        .order_by()
+        .values_list('employee_id', 'employee_name', 'log_code', 'log_date', 'log_time')
+    )
+    _save_latest(_latest_by_employee(rows.iterator(chunk_size=5000)))
+
+
+def refresh_employees(employee_ids):
+    """Re-read the latest punch of the given payroll IDs (after a delete)."""
+    employee_ids = sorted(set(employee_ids))
+    for offset in range(0, len(employee_ids), PUNCH_BATCH_SIZE):
+        batch = employee_ids[offset:offset + PUNCH_BATCH_SIZE]
+        last_dates = dict(
+            PayrollEmployeeSummary.objects.filter(payroll_employee_id__in=batch, last_log_date__isnull=False)
+            .values_list('payroll_employee_id', 'last_log_date')
+        )
+        latest = {}
+        if last_dates:
+            # Only each employee's last log day: (employee_id, log_date) index seeks
+            last_day = reduce(operator.or_, (Q(employee_id=emp_id, log_date=day) for emp_id, day in last_dates.items()))
+            rows = list(
+                PayrollRecord.objects.filter(last_day).order_by()
+                .values_list('employee_id', 'employee_name', 'log_code', 'log_date', 'log_time')
+            )
+            # Punch corrections from the last log day on can add a later punch or void the latest
+            for emp_id, corrections in load_corrections(batch, min(last_dates.values()), date.max).items():
+                if emp_id not in last_dates:
+                    continue
+                own = [row for row in rows if row[0] == emp_id]
+                name = own[0][1] if own else ''
+                rows = [row for row in rows if row[0] != emp_id] + [
+                    (emp_id, name) + tuple(punch) for punch in apply_corrections([row[2:] for row in own], corrections)
+                ]
+            latest = _latest_by_employee(rows)
+        LatestPunch.objects.filter(payroll_employee_id__in=[emp_id for emp_id in batch if emp_id not in latest]).delete()
+        _save_latest(latest, replace=True)
+
+
+def clear_latest_punches():
+    truncate_models(LatestPunch)
+
+
+def rebuild_latest_punches():
+    clear_latest_punches()
+    refresh_employees(PayrollEmployeeSummary.objects.values_list('payroll_employee_id', flat=True))
+    return LatestPunch.objects.count()
+
+
+# ----------------------------------------------------------------------
+# ON-SITE BOARD
+# ----------------------------------------------------------------------
+
+def on_site(now=None):
+    """Payroll IDs whose latest punch is an IN within the last TIMEKEEPER_ON_SITE_HOURS.
+
+    One query on latest_punch_in_idx; the department comes from the HR profile
+    through a correlated subquery on EmployeeMapping. Older open punches are
+    taken as a forgotten OUT and left off the board.
+    """
+    now = now or timezone.now()
+    hours = getattr(settings, 'TIMEKEEPER_ON_SITE_HOURS', DEFAULT_ON_SITE_HOURS)
+    profile = EmployeeMapping.objects.filter(payroll_employee_id=OuterRef('payroll_employee_id'))
+    return (
+        LatestPunch.objects.filter(is_in=True, punched_at__gte=now - timedelta(hours=hours), punched_at__lte=now)
+        .annotate(
+            department=Subquery(profile.values('employee__department')[:1]),
+            section=Subquery(profile.values('employee__section')[:1]),
+        )
+        .order_by('punched_at')
+    )
+
+
+def board(now=None):
+    """{'total', 'departments': [{'name', 'count', 'employees': [...]}, ...]} for the page and its JSON."""
+    departments = {}
+    for punch in on_site(now):
+        departments.setdefault(punch.department or UNASSIGNED, []).append({
+            'payroll_employee_id': punch.payroll_employee_id,
+            'name': punch.employee_name,
+            'section': punch.section or '',
+            'log_code': punch.log_code,
+            'since': timezone.localtime(punch.punched_at).strftime('%Y-%m-%d %H:%M'),
+        })
+    rows = [
+        {'name': name, 'count': len(employees), 'employees': employees}
+        for name, employees in sorted(departments.items(), key=lambda item: (-len(item[1]), item[0]))
+    ]
+    return {'total': sum(row['count'] for row in rows), 'departments': rows}
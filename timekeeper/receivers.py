@@ -0,0 +1,27 @@
+"""Keeps LatestPunch and the attendance exceptions in step with the payroll logs.
+
+Connected in TimekeeperConfig.ready; the work runs on the HR background worker.
+"""
+from humanresource import jobs
+
+from . import punches, scanner
+
+
+def payroll_ingested(sender, history_id, start_date, end_date, **kwargs):
+    jobs.submit(punches.record_upload, history_id)
+    jobs.submit(scanner.scan_period, start_date, end_date)
+
+
+def payroll_deleted(sender, employee_ids, start_date, end_date, **kwargs):
+    if employee_ids is None:
+        # Full clear
+        jobs.submit(punches.clear_latest_punches)
+        jobs.submit(scanner.clear_exceptions)
+    else:
+        jobs.submit(punches.refresh_employees, set(employee_ids))
+        jobs.submit(scanner.scan_period, start_date, end_date)
+
+
+def attendance_corrected(sender, payroll_employee_id, start_date, end_date, **kwargs):
+    jobs.submit(punches.refresh_employees, [payroll_employee_id])
+    jobs.submit(scanner.scan_period, start_date, end_date, [payroll_employee_id])
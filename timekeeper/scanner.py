@@ -0,0 +1,169 @@
+"""Single-pass attendance exception scanner.
+
+Streams a period's PayrollRecords in (employee_id, log_date, log_time) order,
+which is the payroll_emp_date_time_idx order, and keeps a few values of state
+per employee. Nothing is loaded per employee, so a month of mill-wide logs scans
+in seconds. Flags:
+
+    unknown_code -- log_code outside CODE_MAP
+    duplicate    -- same code as the employee's previous punch within TIMEKEEPER_DUPLICATE_MINUTES
+    missing_out  -- an IN (0/2, or 5 for overtime) followed by another IN, or by nothing
+    missing_in   -- an OUT (1/3, or 6) with no open IN
+    long_shift   -- IN to OUT longer than TIMEKEEPER_MAX_SHIFT_HOURS
+
+Punch corrections are overlaid before pairing, so a corrected day scans clean.
+Regular (0/2 -> 1/3) and overtime (5 -> 6) punches pair independently. A gap of
+more than UNPAIRED_HOURS is never one shift: it is reported as a missing OUT
+plus a missing IN.
+"""
+from itertools import groupby
+
+from django.conf import settings
+from django.db import transaction
+
+from humanresource.attendance import CODE_MAP, log_window
+from humanresource.corrections import apply_corrections, load_corrections
+from humanresource.deletion import truncate_models
+from humanresource.models import PayrollRecord
+
+from .models import AttendanceException
+
+DEFAULT_DUPLICATE_MINUTES = 5
+DEFAULT_MAX_SHIFT_HOURS = 16
+UNPAIRED_HOURS = 24
+INSERT_BATCH_SIZE = 1000
+
+# log_code -> (slot, is_in)
+PAIRING = {
+    '0': ('regular', True), '2': ('regular', True), '1': ('regular', False), '3': ('regular', False),
+    '5': ('overtime', True), '6': ('overtime', False),
+}
+
+
+def _seconds(log_date, log_time):
+    """Seconds since 0001-01-01 for a date and 'HH:MM:SS' string; None when the time is malformed."""
+    try:
+        hours, minutes, seconds = int(log_time[0:2]), int(log_time[3:5]), int(log_time[6:8] or 0)
+    except (TypeError, ValueError):
+        return None
+    return log_date.toordinal() * 86400 + hours * 3600 + minutes * 60 + seconds
+
+
+def scan_logs(rows, start_date, end_date):
+    """Yield (employee_id, name, kind, log_date, log_time, log_code, detail) from sorted log rows.
+
+    rows are (employee_id, employee_name, log_code, log_date, log_time) tuples.
+    Rows outside [start_date, end_date] are used for pairing only; their own
+    exceptions are not reported.
+    """
+    return (exception for exception in _scan(rows, start_date, end_date) if exception is not None)
+
+
+def _scan(rows, start_date, end_date):
+    duplicate_seconds = getattr(settings, 'TIMEKEEPER_DUPLICATE_MINUTES', DEFAULT_DUPLICATE_MINUTES) * 60
+    max_shift_seconds = getattr(settings, 'TIMEKEEPER_MAX_SHIFT_HOURS', DEFAULT_MAX_SHIFT_HOURS) * 3600
+    unpaired_seconds = UNPAIRED_HOURS * 3600
+
+    current_id = None
+    open_in = {} # slot -> (seconds, row) of the unmatched IN
+    previous = None # (code, seconds) of the employee's previous punch
+
+    def report(row, kind, detail=''):
+        if start_date <= row[3] <= end_date:
+            return (row[0], row[1], kind, row[3], row[4], row[2], detail)
+        return None
+
+    def close_employee():
+        for _, row in open_in.values():
+            yield report(row, 'missing_out', 'No OUT punch after this IN')
+
+    for row in rows:
+        emp_id, _, code, log_date, log_time = row
+        if emp_id != current_id:
+            yield from close_employee()
+            current_id, open_in, previous = emp_id, {}, None
+
+        if code not in CODE_MAP:
+            yield report(row, 'unknown_code', f"Log code {code!r} is not one of {', '.join(sorted(CODE_MAP))}")
+            continue
+        moment = _seconds(log_date, log_time)
+        if moment is None:
+            yield report(row, 'unknown_code', f"Unreadable time {log_time!r}")
+            continue
+
+        if previous and previous[0] == code and moment - previous[1] <= duplicate_seconds:
+            yield report(row, 'duplicate', f"Repeats the {CODE_MAP[code]} punch {(moment - previous[1]) // 60} min earlier")
+            continue
+        previous = (code, moment)
+
+        slot, is_in = PAIRING[code]
+        pending = open_in.pop(slot, None)
+        if is_in:
+            if pending:
+                yield report(pending[1], 'missing_out', f"Followed by {CODE_MAP[code]} at {log_date} {log_time}")
+            open_in[slot] = (moment, row)
+        elif pending is None:
+            yield report(row, 'missing_in', f"No open IN before this {CODE_MAP[code]}")
+        else:
+            length = moment - pending[0]
+            if length > unpaired_seconds:
+                yield report(pending[1], 'missing_out', f"No OUT within {UNPAIRED_HOURS} hours")
+                yield report(row, 'missing_in', f"No IN within {UNPAIRED_HOURS} hours")
+            elif length > max_shift_seconds:
+                yield report(row, 'long_shift', f"{length / 3600:.1f} hours since {pending[1][3]} {pending[1][4]}")
+
+    yield from close_employee()
+
+
+def _with_corrections(rows, corrections):
+    """Overlay punch corrections on the streamed rows of the employees that have any."""
+    for emp_id, employee_rows in groupby(rows, key=lambda row: row[0]):
+        if emp_id not in corrections:
+            yield from employee_rows
+            continue
+        employee_rows = list(employee_rows)
+        name = employee_rows[0][1]
+        for log_code, log_date, log_time in apply_corrections([row[2:] for row in employee_rows], corrections[emp_id]):
+            yield (emp_id, name, log_code, log_date, log_time)
+
+
+def scan_period(start_date, end_date, employee_ids=None):
+    """Rescan [start_date, end_date] (optionally for some payroll IDs only) and replace its open exceptions.
+
+    Resolved and ignored exceptions are kept; a rescan that finds them again
+    leaves them as they are. Returns the number of exceptions found.
+    """
+    fetch_start, fetch_end = log_window(start_date, end_date)
+    rows = (
+        PayrollRecord.objects.filter(log_date__range=(fetch_start, fetch_end))
+        .order_by('employee_id', 'log_date', 'log_time')
+        .values_list('employee_id', 'employee_name', 'log_code', 'log_date', 'log_time')
+    )
+    stale = AttendanceException.objects.filter(status='open', log_date__range=(start_date, end_date))
+    if employee_ids is not None:
+        employee_ids = list(employee_ids)
+        rows = rows.filter(employee_id__in=employee_ids)
+        stale = stale.filter(payroll_employee_id__in=employee_ids)
+    corrections = load_corrections(employee_ids, fetch_start, fetch_end)
+
+    found = 0
+    with transaction.atomic():
+        stale.delete()
+        batch = []
+        for exception in scan_logs(_with_corrections(rows.iterator(chunk_size=5000), corrections), start_date, end_date):
+            emp_id, name, kind, log_date, log_time, log_code, detail = exception
+            batch.append(AttendanceException(
+                payroll_employee_id=emp_id, employee_name=name, kind=kind,
+                log_date=log_date, log_time=log_time, log_code=log_code, detail=detail[:255],
+            ))
+            if len(batch) >= INSERT_BATCH_SIZE:
+                AttendanceException.objects.bulk_create(batch, ignore_conflicts=True)
+                found += len(batch)
+                batch = []
+        AttendanceException.objects.bulk_create(batch, ignore_conflicts=True)
+        found += len(batch)
+    return found
+
+
+def clear_exceptions():
+    truncate_models(AttendanceException)
@@ -0,0 +1,49 @@
+
+    document.addEventListener('DOMContentLoaded', function() {
+        const boardElement = document.querySelector('.on-site-board[data-poll-url]');
+        if (!boardElement) {
+            return;
+        }
+        const container = boardElement.querySelector('.on-site-departments');
+        const pollMs = (parseInt(boardElement.dataset.pollSeconds, 10) || 30) * 1000;
+
+        function render(data) {
+            boardElement.querySelector('.on-site-total').textContent = data.total;
+            boardElement.querySelector('.on-site-generated').textContent = data.generated_at;
+            container.innerHTML = '';
+            if (!data.departments.length) {
+                const empty = document.createElement('p');
+                empty.textContent = 'Nobody is clocked in.';
+                container.appendChild(empty);
+                return;
+            }
+            data.departments.forEach(function(department) {
+                const card = document.createElement('div');
+                card.className = 'on-site-department';
+                const heading = document.createElement('h2');
+                heading.textContent = department.name + ' (' + department.count + ')';
+                const list = document.createElement('ul');
+                department.employees.forEach(function(employee) {
+                    const item = document.createElement('li');
+                    item.textContent = employee.name + ' (' + employee.payroll_employee_id + ')'
+                        + (employee.section ? ' - ' + employee.section : '') + ', in since ' + employee.since;
+                    list.appendChild(item);
+                });
+                card.appendChild(heading);
+                card.appendChild(list);
+                container.appendChild(card);
+            });
+        }
+
+        function poll() {
+            // Skip while the tab is hidden; the next visible tick catches up
+            if (document.hidden) {
+                return;
+            }
+            fetch(boardElement.dataset.pollUrl, { headers: { 'Accept': 'application/json' } })
+                .then(function(response) { return response.ok ? response.json() : null; })
+                .then(function(data) { if (data) { render(data); } });
+        }
+
+        setInterval(poll, pollMs);
+    });
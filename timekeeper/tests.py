@@ -1,3 +1,113 @@
-from django.test import TestCase
+from datetime import date, datetime
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from humanresource.models import CSVUploadHistory, Employee, EmployeeMapping
+from humanresource.synthetic import HEADER, Workforce, format_row, generate_biolog
+from navigation_app.models import UsersAccount
+
+from .models import AttendanceException, LatestPunch
+from .punches import board, on_site
+from .scanner import scan_logs, scan_period
 
 # Create your tests here.
+
+
+@override_settings(HR_BACKGROUND_WORKER='inline', TIMEKEEPER_ON_SITE_HOURS=16)
+class OnSiteBoardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        UsersAccount.objects.create(username='hr_board', password='secret', role='hr')
+        UsersAccount.objects.create(username='tk_board', password='secret', role='timekeeper')
+        employee = Employee.objects.create(first_name='Ana', last_name='Reyes', department='Milling', section='Boiler')
+        EmployeeMapping.objects.create(payroll_employee_id='000000001', employee=employee)
+
+    def upload(self, name, punches):
+        self.client.post('/', {'username': 'hr_board', 'password': 'secret', 'role': 'hr'})
+        lines = [HEADER] + [
+            format_row(sequence, emp_id, f"WORKER {emp_id[-1]}", code, datetime.strptime(moment, '%Y-%m-%d %H:%M'))
+            for sequence, (emp_id, code, moment) in enumerate(punches, start=1)
+        ]
+        self.client.post('/humanresource/payroll-upload/', {
+            'payroll_file': SimpleUploadedFile(name, ('\n'.join(lines) + '\n').encode()),
+        })
+
+    def test_ingest_and_delete_keep_the_board_current(self):
+        now = timezone.make_aware(datetime(2025, 3, 10, 12, 0))
+        self.upload('day1.txt', [
+            ('000000001', '0', '2025-03-10 07:50'),                                     # On site (Milling)
+            ('000000002', '0', '2025-03-10 07:45'), ('000000002', '3', '2025-03-10 11:00'), # Went home
+            ('000000003', '2', '2025-03-08 22:00'),                                     # Forgotten OUT
+        ])
+        self.assertEqual(LatestPunch.objects.count(), 3)
+
+        with self.assertNumQueries(1):
+            punches = list(on_site(now))
+        self.assertEqual([(p.payroll_employee_id, p.department) for p in punches], [('000000001', 'Milling')])
+
+        # A later upload brings employee 2 back in; deleting it restores the OUT
+        self.upload('day1_ot.txt', [('000000002', '5', '2025-03-10 11:30')])
+        self.assertEqual(board(now)['total'], 2)
+        self.assertEqual(board(now)['departments'][-1]['name'], 'Unassigned')
+
+        history = CSVUploadHistory.objects.get(file_name='day1_ot.txt')
+        self.client.post(f'/humanresource/payroll-upload/delete/{history.pk}/')
+        self.assertEqual(LatestPunch.objects.get(payroll_employee_id='000000002').log_code, '3')
+        self.assertEqual(board(now)['total'], 1)
+
+    def test_board_page_and_json(self):
+        self.client.post('/', {'username': 'tk_board', 'password': 'secret', 'role': 'timekeeper'})
+        self.assertEqual(self.client.get('/timekeeper/on-site/').status_code, 200)
+        data = self.client.get('/timekeeper/on-site/data/').json()
+        self.assertEqual((data['total'], data['departments']), (0, []))
+
+
+@override_settings(HR_BACKGROUND_WORKER='inline', TIMEKEEPER_DUPLICATE_MINUTES=5, TIMEKEEPER_MAX_SHIFT_HOURS=16)
+class AttendanceScannerTests(TestCase):
+    def test_scan_flags_each_kind(self):
+        day, next_day = date(2025, 3, 10), date(2025, 3, 11)
+        rows = [
+            ('A', 'WORKER A', '0', day, '07:50:00'),
+            ('A', 'WORKER A', '0', day, '07:52:00'), # Duplicate
+            ('A', 'WORKER A', '3', day, '17:00:00'),
+            ('A', 'WORKER A', '6', day, '20:00:00'), # OT_OUT without OT_IN
+            ('B', 'WORKER B', '2', day, '06:00:00'),
+            ('B', 'WORKER B', '3', next_day, '02:00:00'), # 20 hours
+            ('C', 'WORKER C', '9', day, '08:00:00'), # Unknown code
+            ('C', 'WORKER C', '0', day, '08:01:00'),
+            ('C', 'WORKER C', '2', day, '22:00:00'), # AM_IN never closed
+            ('C', 'WORKER C', '3', next_day, '06:00:00'),
+            ('D', 'WORKER D', '0', next_day, '08:00:00'), # Never closed
+        ]
+        found = {(emp_id, kind, log_time) for emp_id, _, kind, _, log_time, _, _ in scan_logs(rows, day, next_day)}
+        self.assertEqual(found, {
+            ('A', 'duplicate', '07:52:00'), ('A', 'missing_in', '20:00:00'),
+            ('B', 'long_shift', '02:00:00'),
+            ('C', 'unknown_code', '08:00:00'), ('C', 'missing_out', '08:01:00'),
+            ('D', 'missing_out', '08:00:00'),
+        })
+
+    def test_clean_logs_have_no_exceptions_and_triage_survives_rescans(self):
+        UsersAccount.objects.create(username='hr_scan', password='secret', role='hr')
+        UsersAccount.objects.create(username='tk_scan', password='secret', role='timekeeper')
+        self.client.post('/', {'username': 'hr_scan', 'password': 'secret', 'role': 'hr'})
+        workforce = Workforce(30, seed=2)
+        content = '\n'.join(generate_biolog(workforce, date(2025, 3, 1), date(2025, 3, 31), missing_rate=0)) + '\n'
+        self.client.post('/humanresource/payroll-upload/', {'payroll_file': SimpleUploadedFile('march.txt', content.encode())})
+        # Scanned on ingest; the only open shifts are the night shifts still running on the last day
+        self.assertFalse(AttendanceException.objects.exclude(kind='missing_out', log_date=date(2025, 3, 31)).exists())
+
+        content = '\n'.join(generate_biolog(workforce, date(2025, 4, 1), date(2025, 4, 30), missing_rate=0.05)) + '\n'
+        self.client.post('/humanresource/payroll-upload/', {'payroll_file': SimpleUploadedFile('april.txt', content.encode())})
+        found = AttendanceException.objects.filter(log_date__month=4).count()
+        self.assertGreater(found, 0)
+
+        self.client.post('/', {'username': 'tk_scan', 'password': 'secret', 'role': 'timekeeper'})
+        first = AttendanceException.objects.filter(log_date__month=4).first()
+        self.client.post('/timekeeper/exceptions/', {'action': 'resolve', 'exception_ids': [first.id], 'note': 'Called in'})
+        self.assertEqual(scan_period(date(2025, 4, 1), date(2025, 4, 30)), found)
+        first = AttendanceException.objects.get(pk=first.pk)
+        self.assertEqual((first.status, first.resolved_by, first.note), ('resolved', 'tk_scan', 'Called in'))
+        self.assertEqual(self.client.get('/timekeeper/exceptions/?kind=missing_in').status_code, 200)
@@ -6,4 +6,7 @@ app_name = 'timekeeper'
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-]
\ No newline at end of file
+    path('on-site/', views.on_site_board, name='on_site_board'),
+    path('on-site/data/', views.on_site_data, name='on_site_data'),
+    path('exceptions/', views.attendance_exceptions, name='attendance_exceptions'),
+]
@@ -1,3 +1,113 @@
-from django.shortcuts import render
+from datetime import datetime
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.paginator import Paginator
+from django.db.models import Count, Q
+from django.http import JsonResponse
+from django.shortcuts import redirect, render
+from django.utils import timezone
+
+from humanresource.attendance import cutoff_period
+
+from .models import AttendanceException
+from .punches import board
+from .scanner import scan_period
 
 # Create your views here.
+
+# Every view in this module requires the 'timekeeper' role (see ROLE_ACCESS_RULES).
+
+
+def on_site_board(request):
+    """Who is clocked in right now, by department; the page polls on_site_data to refresh."""
+    context = {
+        'board': board(),
+        'generated_at': timezone.localtime(),
+        'poll_seconds': getattr(settings, 'TIMEKEEPER_POLL_SECONDS', 30),
+    }
+    return render(request, 'on_site_board.html', context)
+
+
+def on_site_data(request):
+    data = board()
+    data['generated_at'] = timezone.localtime().strftime('%Y-%m-%d %H:%M:%S')
+    return JsonResponse(data)
+
+
+# ----------------------------------------------------------------------
+# ATTENDANCE EXCEPTIONS
+# ----------------------------------------------------------------------
+
+EXCEPTIONS_PAGE_SIZE = 100
+
+# POST action -> new status
+TRIAGE_ACTIONS = {'resolve': 'resolved', 'ignore': 'ignored', 'reopen': 'open'}
+
+
+def _parse_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+    except ValueError:
+        return None
+
+
+def attendance_exceptions(request):
+    """Triage queue of the scanner's exceptions; also runs a scan for a period."""
+    if request.method == 'POST':
+        action = request.POST.get('action')
+        if action == 'scan':
+            start_date = _parse_date(request.POST.get('start_date'))
+            end_date = _parse_date(request.POST.get('end_date'))
+            if start_date is None or end_date is None or start_date > end_date:
+                messages.error(request, "Enter a valid period to scan.")
+            else:
+                found = scan_period(start_date, end_date)
+                messages.success(request, f"Scanned {start_date} to {end_date}: {found} exception(s) found.")
+        elif action in TRIAGE_ACTIONS:
+            selected = AttendanceException.objects.filter(id__in=request.POST.getlist('exception_ids'))
+            status = TRIAGE_ACTIONS[action]
+            updated = selected.update(
+                status=status,
+                note=request.POST.get('note', '').strip()[:255],
+                resolved_by='' if status == 'open' else request.session.get('username', ''),
+                resolved_at=None if status == 'open' else timezone.now(),
+            )
+            messages.success(request, f"{updated} exception(s) marked {status}.")
+        return redirect(request.get_full_path())
+
+    status = request.GET.get('status', 'open')
+    kind = request.GET.get('kind', '')
+    query = request.GET.get('q', '').strip()
+    start_date = _parse_date(request.GET.get('start'))
+    end_date = _parse_date(request.GET.get('end'))
+
+    exceptions = AttendanceException.objects.all()
+    if status:
+        exceptions = exceptions.filter(status=status)
+    if start_date:
+        exceptions = exceptions.filter(log_date__gte=start_date)
+    if end_date:
+        exceptions = exceptions.filter(log_date__lte=end_date)
+    if query:
+        exceptions = exceptions.filter(Q(payroll_employee_id__startswith=query) | Q(employee_name__icontains=query))
+
+    # Counts per kind for the filter tabs (one grouped query), then the selected kind
+    kind_counts = dict(exceptions.values_list('kind').annotate(total=Count('id')).order_by())
+    if kind:
+        exceptions = exceptions.filter(kind=kind)
+
+    default_start, default_end = cutoff_period(timezone.localdate())
+    context = {
+        'page_obj': Paginator(exceptions, EXCEPTIONS_PAGE_SIZE).get_page(request.GET.get('page')),
+        'kinds': [(value, label, kind_counts.get(value, 0)) for value, label in AttendanceException.KIND_CHOICES],
+        'statuses': AttendanceException.STATUS_CHOICES,
+        'status': status,
+        'kind': kind,
+        'query': query,
+        'start': start_date,
+        'end': end_date,
+        'default_start': default_start,
+        'default_end': default_end,
+    }
+    return render(request, 'attendance_exceptions.html', context)